@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+列表页解析基准测试
+从 --record 模式记录的WARC文件中读取真实列表页，测量_parse_news_links的耗时，
+用于比较解析逻辑修改前后的性能（页面指纹缓存在测试中关闭）
+"""
+
+import os
+import sys
+
+from benchmark import benchmark_main, measure
+from config import WEBSITES, CRAWLER_CONFIG
+from warc_store import find_warc_files, load_responses
+
+DEFAULT_OUTPUT = os.path.join('benchmarks', 'parser_latest.json')
+DEFAULT_BASELINE = os.path.join('benchmarks', 'parser_baseline.json')
+
+
+def load_pages(path: str):
+    """读取WARC文件中各站点首页的HTML，返回[(站点名称, URL, HTML)]"""
+    from crawler import SZCrawler
+    crawler = SZCrawler()
+    names = {url: name for name, url in WEBSITES.items()}
+    pages = []
+    for warc_file in find_warc_files(path):
+        for url, result in load_responses(warc_file).items():
+            if url in names and result.body and result.status_code < 400:
+                pages.append((names[url], url, crawler._decode_body(result.body, result.encoding)))
+    return pages
+
+
+def run_benchmarks(path: str, repeat: int = 15, warmup: int = 3):
+    """运行解析基准测试
+
+    Args:
+        path: WARC文件或目录
+        repeat: 采样轮数
+        warmup: 预热轮数
+
+    Returns:
+        dict: 场景名称到统计结果的映射
+    """
+    from crawler import SZCrawler
+    pages = load_pages(path)
+    if not pages:
+        raise ValueError(f"WARC中没有可用的列表页: {path}")
+
+    crawler = SZCrawler()
+    crawler.fingerprints = None
+
+    def parse_all():
+        for name, url, html in pages:
+            crawler._parse_news_links(html, name, url)
+
+    results = {f'parse_all_{len(pages)}_pages': measure(parse_all, repeat=repeat, warmup=warmup)}
+    by_site = {}
+    for name, url, html in pages:
+        by_site.setdefault(name, (url, html))
+    for name, (url, html) in by_site.items():
+        results[f'parse_{name}'] = measure(lambda: crawler._parse_news_links(html, name, url),
+                                           repeat=repeat, warmup=warmup)
+    return results
+
+
+def main(argv=None) -> int:
+    """命令行入口"""
+    def add_arguments(parser):
+        parser.add_argument('--warc', default=CRAWLER_CONFIG.get('warc_dir', 'output/warc'),
+                            help='WARC文件或目录')
+        parser.add_argument('--warmup', type=int, default=3, help='预热轮数')
+
+    return benchmark_main(
+        '列表页解析基准测试（基于WARC记录）',
+        lambda args: run_benchmarks(args.warc, args.repeat, args.warmup),
+        DEFAULT_OUTPUT, DEFAULT_BASELINE, add_arguments,
+        title=lambda args: f"列表页解析基准测试（{args.warc}）", argv=argv)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
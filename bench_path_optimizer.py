@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+PATH优化器基准测试套件
+按场景（重复项/无效路径/优先级路径为主）测量optimize_path()性能，
+结果保存为JSON并与基线对比，超出阈值的回退将以非零状态码退出
+"""
+
+import os
+import sys
+from typing import Callable, Dict
+
+from benchmark import benchmark_main, measure
+from path_manager import PathOptimizer
+
+
+DEFAULT_OUTPUT = os.path.join('benchmarks', 'path_optimizer_latest.json')
+DEFAULT_BASELINE = os.path.join('benchmarks', 'path_optimizer_baseline.json')
+SEPARATOR = ';' if os.name == 'nt' else ':'
+
+
+def _real_paths() -> list:
+    """获取当前系统上存在的若干真实目录"""
+    candidates = (['/usr/bin', '/bin', '/usr/local/bin', '/usr/sbin', '/sbin']
+                  if os.name == 'posix' else
+                  [r'C:\Windows\System32', r'C:\Windows', r'C:\Windows\System32\Wbem'])
+    found = [path for path in candidates if os.path.isdir(path)]
+    return found or [os.path.expanduser('~')]
+
+
+def duplicates_heavy(size: int) -> str:
+    """生成以重复项为主的PATH：少量真实目录反复出现，含尾部斜杠等变体"""
+    real = _real_paths()
+    paths = []
+    i = 0
+    while len(paths) < size:
+        path = real[i % len(real)]
+        paths.append(path + os.sep if i % 3 == 0 else path)
+        i += 1
+    return SEPARATOR.join(paths)
+
+
+def invalid_heavy(size: int) -> str:
+    """生成以无效路径为主的PATH：约90%条目不存在"""
+    real = _real_paths()
+    paths = []
+    for i in range(size):
+        if i % 10 == 0:
+            paths.append(real[(i // 10) % len(real)])
+        else:
+            paths.append(f'/invalid/bench/path/{i}')
+    return SEPARATOR.join(paths)
+
+
+def priority_heavy(size: int, optimizer: PathOptimizer) -> str:
+    """生成以优先级路径为主的PATH：优先级路径逆序排列，穿插少量用户路径"""
+    priority = list(reversed(optimizer.priority_paths)) or _real_paths()
+    home = os.path.expanduser('~')
+    paths = []
+    i = 0
+    while len(paths) < size:
+        if i % 8 == 7:
+            paths.append(home)
+        else:
+            paths.append(priority[i % len(priority)])
+        i += 1
+    return SEPARATOR.join(paths)
+
+
+def build_scenarios(sizes=(100, 1000)) -> Dict[str, Callable[[], object]]:
+    """构建所有基准测试场景
+
+    Args:
+        sizes: 各场景的PATH条目数
+
+    Returns:
+        Dict[str, Callable]: 场景名到无参测试函数的映射
+    """
+    optimizer = PathOptimizer()
+    scenarios = {}
+    for size in sizes:
+        inputs = {
+            'duplicates_heavy': duplicates_heavy(size),
+            'invalid_heavy': invalid_heavy(size),
+            'priority_heavy': priority_heavy(size, optimizer),
+        }
+        for name, path_string in inputs.items():
+            scenarios[f'{name}_{size}'] = (
+                lambda p=path_string: optimizer.optimize_path(p)
+            )
+    return scenarios
+
+
+def run_benchmarks(repeat: int = 15, warmup: int = 3,
+                   sizes=(100, 1000)) -> Dict[str, Dict[str, float]]:
+    """运行全部场景并返回统计结果"""
+    results = {}
+    for name, func in build_scenarios(sizes).items():
+        results[name] = measure(func, repeat=repeat, warmup=warmup)
+    return results
+
+
+def main(argv=None) -> int:
+    """命令行入口"""
+    def add_arguments(parser):
+        parser.add_argument('--warmup', type=int, default=3, help='预热调用次数')
+        parser.add_argument('--sizes', type=int, nargs='+', default=[100, 1000],
+                            help='PATH条目数')
+
+    return benchmark_main(
+        'PATH优化器基准测试',
+        lambda args: run_benchmarks(args.repeat, args.warmup, tuple(args.sizes)),
+        DEFAULT_OUTPUT, DEFAULT_BASELINE, add_arguments, argv=argv)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+结果记录内存基准测试
+对比每条结果使用字典（每页格式化一次爬取时间字符串、按来源复制到分组字典）
+与使用NewsLink（整数时间戳、来源名称驻留、原地分组）时的内存占用
+"""
+
+import argparse
+import gc
+import json
+import os
+import sys
+import tracemalloc
+
+from config import WEBSITES
+from news_record import NewsLink, group_by_source, format_timestamp
+
+DEFAULT_OUTPUT = os.path.join('benchmarks', 'result_memory_latest.json')
+LINKS_PER_PAGE = 20
+
+
+def _raw_results(count: int):
+    """生成模拟的解析结果
+
+    结果按站点连续排列，同一页面的结果共享爬取时间；来源名称每条都是新字符串
+    （与从工作队列、JSON Lines读回的结果相同），标题和链接各不相同
+    """
+    names = list(WEBSITES)
+    timestamp = None
+    for i in range(count):
+        page = i // LINKS_PER_PAGE
+        if i % LINKS_PER_PAGE == 0:
+            timestamp = 1767225600 + page
+        source = ''.join(list(names[i * len(names) // count]))
+        yield (source, f'关于开展思政课程建设专项工作的通知（第{i}期）',
+               f'http://jyj.example.gov.cn/art/2025/6/{page}/art_{i}.html', timestamp)
+
+
+def build_dicts(count):
+    results = []
+    crawl_time = None
+    last_ts = None
+    for source, title, url, ts in _raw_results(count):
+        if ts != last_ts:
+            crawl_time, last_ts = format_timestamp.__wrapped__(ts), ts
+        results.append({'source': source, 'title': title, 'url': url, 'crawl_time': crawl_time})
+    return results
+
+
+def build_records(count):
+    return [NewsLink(source, title, url, ts) for source, title, url, ts in _raw_results(count)]
+
+
+def group_dicts(results):
+    """此前save_to_markdown的分组方式：复制到按来源的字典"""
+    sources = {}
+    for link in results:
+        if link['source'] not in sources:
+            sources[link['source']] = []
+        sources[link['source']].append(link)
+    for source, links in sources.items():
+        for link in links:
+            pass
+
+
+def group_records(results):
+    for source, count, links in group_by_source(results):
+        for link in links:
+            pass
+
+
+def _text_bytes(count):
+    """标题和链接字符串的大小，两种方案相同"""
+    return sum(sys.getsizeof(title) + sys.getsizeof(url) for _, title, url, _ in _raw_results(count))
+
+
+def _traced(func, arg):
+    """返回(结果, 结束时保留的内存字节数, 峰值内存字节数)"""
+    gc.collect()
+    tracemalloc.start()
+    result = func(arg)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current, peak
+
+
+def run_benchmarks(count: int = 100000):
+    """运行内存基准测试
+
+    Args:
+        count: 结果条数
+
+    Returns:
+        dict: 各方案每条结果的内存占用（字节，不含标题和链接字符串）
+    """
+    text_bytes = _text_bytes(count)
+    results = {}
+    for name, build, group in (('dict', build_dicts, group_dicts),
+                               ('news_link', build_records, group_records)):
+        records, stored, _ = _traced(build, count)
+        _, _, group_peak = _traced(group, records)
+        results[name] = {
+            'count': count,
+            'bytes_per_result': (stored - text_bytes) / count,
+            'group_peak_bytes_per_result': group_peak / count,
+        }
+        del records
+    return results
+
+
+def main(argv=None) -> int:
+    """命令行入口"""
+    parser = argparse.ArgumentParser(description='结果记录内存基准测试')
+    parser.add_argument('--count', type=int, default=100000, help='结果条数')
+    parser.add_argument('--output', default=DEFAULT_OUTPUT, help='结果JSON输出路径')
+    args = parser.parse_args(argv)
+
+    print(f"结果记录内存基准测试（{args.count} 条结果，不含标题和链接字符串）")
+    print("=" * 50)
+    results = run_benchmarks(args.count)
+    for name, item in results.items():
+        print(f"  {name:<10} 每条结果: {item['bytes_per_result']:7.1f} B"
+              f"  分组峰值: {item['group_peak_bytes_per_result']:6.1f} B")
+    before, after = results['dict'], results['news_link']
+    print(f"  每条结果节省 {1 - after['bytes_per_result'] / before['bytes_per_result']:.0%}")
+
+    directory = os.path.dirname(args.output)
+    if directory and not os.path.exists(directory):
+        os.makedirs(directory)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+传输层基准测试
+启动本地测试服务器（同一端口同时支持HTTP/1.1和明文HTTP/2先验知识），
+模拟单个教育局站点的文章页抓取，对比requests顺序请求与httpx HTTP/2多路复用
+需要安装 httpx[http2]（h2随之安装）
+"""
+
+import asyncio
+import os
+import sys
+import threading
+
+import requests
+
+from benchmark import benchmark_main, measure
+from transport import RequestsTransport, HTTPXTransport
+
+DEFAULT_OUTPUT = os.path.join('benchmarks', 'transport_latest.json')
+DEFAULT_BASELINE = os.path.join('benchmarks', 'transport_baseline.json')
+H2_PREFACE = b'PRI * HTTP/2.0\r\n\r\nSM\r\n\r\n'
+
+
+class LocalTestServer:
+    """本地测试服务器：每个响应前等待latency秒以模拟远程站点延迟"""
+
+    def __init__(self, latency: float = 0.02, page_size: int = 20 * 1024):
+        import h2  # noqa: F401  提前检查依赖
+        self.latency = latency
+        self.body = ('<html><body>' + '<p>思政新闻</p>' * (page_size // 20) + '</body></html>').encode('utf-8')
+        self.port = None
+        self._loop = asyncio.new_event_loop()
+        self._ready = threading.Event()
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        self._ready.wait()
+        return self
+
+    def __exit__(self, *args):
+        asyncio.run_coroutine_threadsafe(self._shutdown(), self._loop).result(timeout=5)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=5)
+
+    async def _shutdown(self):
+        """关闭监听并取消仍在处理的连接"""
+        self._server.close()
+        current = asyncio.current_task()
+        tasks = [task for task in asyncio.all_tasks() if task is not current]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _serve(self):
+        asyncio.set_event_loop(self._loop)
+        self._server = self._loop.run_until_complete(
+            asyncio.start_server(self._handle, '127.0.0.1', 0))
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._ready.set()
+        self._loop.run_forever()
+        self._loop.close()
+
+    async def _handle(self, reader, writer):
+        try:
+            head = await reader.readexactly(len(H2_PREFACE))
+            if head == H2_PREFACE:
+                await self._handle_h2(head, reader, writer)
+            else:
+                await self._handle_http1(head, reader, writer)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            writer.close()
+        except asyncio.CancelledError:
+            # 关闭服务器时取消连接；正常返回以避免asyncio在回调中报告已取消的任务
+            writer.close()
+
+    async def _handle_http1(self, head, reader, writer):
+        buffer = head
+        try:
+            while True:
+                while b'\r\n\r\n' not in buffer:
+                    data = await reader.read(65536)
+                    if not data:
+                        return
+                    buffer += data
+                _, buffer = buffer.split(b'\r\n\r\n', 1)
+                await asyncio.sleep(self.latency)
+                writer.write(b'HTTP/1.1 200 OK\r\nContent-Type: text/html; charset=utf-8\r\n'
+                             b'Content-Length: ' + str(len(self.body)).encode() + b'\r\n\r\n' + self.body)
+                await writer.drain()
+        finally:
+            writer.close()
+
+    async def _handle_h2(self, head, reader, writer):
+        import h2.config
+        import h2.connection
+        import h2.events
+
+        conn = h2.connection.H2Connection(h2.config.H2Configuration(client_side=False))
+        conn.initiate_connection()
+        pending = {}
+        tasks = set()
+
+        async def flush():
+            writer.write(conn.data_to_send())
+            await writer.drain()
+
+        async def respond(stream_id):
+            await asyncio.sleep(self.latency)
+            conn.send_headers(stream_id, [(':status', '200'),
+                                          ('content-type', 'text/html; charset=utf-8'),
+                                          ('content-length', str(len(self.body)))])
+            pending[stream_id] = memoryview(self.body)
+            await send_pending()
+
+        async def send_pending():
+            for stream_id in list(pending):
+                data = pending[stream_id]
+                while data:
+                    size = min(conn.local_flow_control_window(stream_id), len(data),
+                               conn.max_outbound_frame_size)
+                    if size <= 0:
+                        break
+                    conn.send_data(stream_id, bytes(data[:size]))
+                    data = data[size:]
+                if data:
+                    pending[stream_id] = data
+                else:
+                    conn.end_stream(stream_id)
+                    del pending[stream_id]
+            await flush()
+
+        data = head
+        try:
+            while True:
+                for event in conn.receive_data(data):
+                    if isinstance(event, h2.events.RequestReceived):
+                        task = asyncio.ensure_future(respond(event.stream_id))
+                        tasks.add(task)
+                        task.add_done_callback(tasks.discard)
+                    elif isinstance(event, h2.events.WindowUpdated):
+                        await send_pending()
+                    elif isinstance(event, h2.events.ConnectionTerminated):
+                        return
+                await flush()
+                data = await reader.read(65536)
+                if not data:
+                    return
+        finally:
+            writer.close()
+
+
+def run_benchmarks(pages: int = 30, latency: float = 0.02, repeat: int = 5,
+                   concurrency: int = 6):
+    """运行传输层基准测试
+
+    Args:
+        pages: 每轮抓取的文章页数量（同一主机）
+        latency: 服务器模拟延迟（秒）
+        repeat: 采样轮数
+        concurrency: httpx并发请求数
+    """
+    with LocalTestServer(latency=latency) as server:
+        urls = [(f'http://127.0.0.1:{server.port}/art/{i}.html', {}) for i in range(pages)]
+
+        session = requests.Session()
+        requests_transport = RequestsTransport(session)
+        h2_transport = HTTPXTransport(http1=False, http2=True, max_concurrency=concurrency)
+        h1_transport = HTTPXTransport(http1=True, http2=False, max_concurrency=concurrency)
+        try:
+            assert h2_transport.fetch(urls[0][0], {}, 10).http_version == 'HTTP/2'
+            results = {
+                'requests_http1_sequential': measure(
+                    lambda: requests_transport.fetch_many(urls, 10), repeat=repeat, warmup=1),
+                'httpx_http1_concurrent': measure(
+                    lambda: h1_transport.fetch_many(urls, 10), repeat=repeat, warmup=1),
+                'httpx_http2_multiplexed': measure(
+                    lambda: h2_transport.fetch_many(urls, 10), repeat=repeat, warmup=1),
+            }
+        finally:
+            h2_transport.close()
+            h1_transport.close()
+            session.close()
+    return results
+
+
+def main(argv=None) -> int:
+    """命令行入口"""
+    def add_arguments(parser):
+        parser.add_argument('--pages', type=int, default=30, help='每轮抓取的页面数')
+        parser.add_argument('--latency', type=float, default=0.02, help='服务器模拟延迟（秒）')
+        parser.add_argument('--concurrency', type=int, default=6, help='并发请求数')
+
+    return benchmark_main(
+        '传输层基准测试（本地HTTP/2测试服务器）',
+        lambda args: run_benchmarks(args.pages, args.latency, args.repeat, args.concurrency),
+        DEFAULT_OUTPUT, DEFAULT_BASELINE, add_arguments,
+        title=lambda args: f"传输层基准测试（{args.pages} 个页面，延迟 {args.latency * 1000:.0f} ms）",
+        repeat=5, argv=argv)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+URL标准化微基准测试
+对比旧实现（urljoin + 二次urlparse）与url_normalizer的冷/热缓存性能，
+输入为录制的真实链接集（benchmarks/links_recorded.json），未录制时使用合成链接集
+"""
+
+import json
+import os
+import random
+import sys
+from urllib.parse import urljoin, urlparse
+
+from benchmark import benchmark_main, measure
+import url_normalizer
+
+
+DEFAULT_LINKS = os.path.join('benchmarks', 'links_recorded.json')
+DEFAULT_OUTPUT = os.path.join('benchmarks', 'url_normalizer_latest.json')
+DEFAULT_BASELINE = os.path.join('benchmarks', 'url_normalizer_baseline.json')
+
+
+def legacy_normalize(url, base_url):
+    """旧版SZCrawler._normalize_url实现，用于对比"""
+    if not url or url.startswith('javascript:'):
+        return None
+    if not url.startswith(('http://', 'https://')):
+        url = urljoin(base_url, url)
+    url = url.split('#')[0]
+    try:
+        result = urlparse(url)
+        return url if all([result.scheme, result.netloc]) else None
+    except ValueError:
+        return None
+
+
+def record_links(filename):
+    """抓取config.WEBSITES首页，录制所有(base, href)链接对"""
+    from bs4 import BeautifulSoup
+    from config import WEBSITES
+    from crawler import SZCrawler
+
+    crawler = SZCrawler()
+    pairs = []
+    for name, url in WEBSITES.items():
+        html = crawler._fetch_page(url)
+        if not html:
+            continue
+        soup = BeautifulSoup(html, 'html.parser')
+        pairs.extend([url, a.get('href')] for a in soup.find_all('a') if a.get('href'))
+        print(f"  {name}: 累计 {len(pairs)} 条链接")
+
+    directory = os.path.dirname(filename)
+    if directory and not os.path.exists(directory):
+        os.makedirs(directory)
+    with open(filename, 'w', encoding='utf-8') as f:
+        json.dump(pairs, f, ensure_ascii=False)
+    return pairs
+
+
+def synthetic_links(count=5000, seed=42):
+    """生成模拟教育局网站链接分布的合成链接集（含相对路径、锚点、跟踪参数和重复项）"""
+    rng = random.Random(seed)
+    bases = ['http://jnedu.jinan.gov.cn/', 'http://edu.qingdao.gov.cn/',
+             'http://edu.zibo.gov.cn/', 'http://jyj.yantai.gov.cn/']
+    templates = [
+        '/art/2025/6/{n}/art_{m}_{n}.html',
+        'col/col{m}/index.html',
+        '../module/download/downfile.jsp?classid=0&filename={n}.pdf',
+        'http://{host}/art/2025/5/{n}/art_{m}_{n}.html?utm_source=wx',
+        'https://{host}:443/news/{n}.html#content',
+        'javascript:void(0)',
+        '#top',
+        '/index.html?spm={m}.{n}',
+    ]
+    pairs = []
+    for _ in range(count):
+        base = rng.choice(bases)
+        href = rng.choice(templates).format(
+            n=rng.randint(1, 400), m=rng.randint(1, 40), host=urlparse(base).netloc)
+        pairs.append([base, href])
+    return pairs
+
+
+def load_links(filename):
+    """读取录制的链接集，不存在时返回合成链接集"""
+    if os.path.exists(filename):
+        with open(filename, 'r', encoding='utf-8') as f:
+            return json.load(f), '录制'
+    return synthetic_links(), '合成'
+
+
+def run_benchmarks(pairs, repeat=15, warmup=2):
+    """运行各实现的基准测试"""
+    def run_legacy():
+        for base, href in pairs:
+            legacy_normalize(href, base)
+
+    def run_cold():
+        url_normalizer.clear_cache()
+        for base, href in pairs:
+            url_normalizer.normalize_link(href, base)
+
+    def run_warm():
+        for base, href in pairs:
+            url_normalizer.normalize_link(href, base)
+
+    return {
+        'legacy': measure(run_legacy, repeat=repeat, warmup=warmup),
+        'normalizer_cold_cache': measure(run_cold, repeat=repeat, warmup=warmup),
+        'normalizer_warm_cache': measure(run_warm, repeat=repeat, warmup=warmup),
+    }
+
+
+def main(argv=None) -> int:
+    """命令行入口"""
+    def add_arguments(parser):
+        parser.add_argument('--links', default=DEFAULT_LINKS, help='录制的链接集JSON路径')
+        parser.add_argument('--record', action='store_true', help='抓取配置的网站并录制链接集')
+
+    def run(args):
+        if args.record:
+            pairs, origin = record_links(args.links), '录制'
+        else:
+            pairs, origin = load_links(args.links)
+        print(f"  链接集: {origin}，{len(pairs)} 条")
+        results = run_benchmarks(pairs, repeat=args.repeat)
+        print(f"  缓存统计: {url_normalizer.cache_info()}")
+        return results
+
+    return benchmark_main('URL标准化微基准测试', run, DEFAULT_OUTPUT, DEFAULT_BASELINE,
+                          add_arguments, argv=argv)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
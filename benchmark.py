@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+基准测试工具模块
+提供预热、重复采样、中位数/IQR统计、基线对比功能，以及各基准测试脚本共用的命令行入口
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+
+def measure(func: Callable[[], object], repeat: int = 15, number: int = 1,
+            warmup: int = 3) -> Dict[str, float]:
+    """对函数进行多轮计时并返回统计结果
+
+    Args:
+        func: 无参可调用对象
+        repeat: 采样轮数
+        number: 每轮调用次数
+        warmup: 预热调用次数（不计入统计）
+
+    Returns:
+        Dict[str, float]: 单次调用耗时统计（纳秒）
+    """
+    if repeat < 1 or number < 1:
+        raise ValueError("repeat 和 number 必须大于 0")
+
+    for _ in range(warmup):
+        func()
+
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter_ns()
+        for _ in range(number):
+            func()
+        samples.append((time.perf_counter_ns() - start) / number)
+
+    return summarize(samples)
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    """计算样本的中位数、四分位距等统计量
+
+    Args:
+        samples: 耗时样本（纳秒）
+
+    Returns:
+        Dict[str, float]: 统计结果
+    """
+    if not samples:
+        raise ValueError("样本不能为空")
+
+    ordered = sorted(samples)
+    if len(ordered) >= 2:
+        q1, _, q3 = statistics.quantiles(ordered, n=4, method='inclusive')
+    else:
+        q1 = q3 = ordered[0]
+
+    return {
+        'median_ns': statistics.median(ordered),
+        'q1_ns': q1,
+        'q3_ns': q3,
+        'iqr_ns': q3 - q1,
+        'min_ns': ordered[0],
+        'max_ns': ordered[-1],
+        'samples': len(ordered),
+    }
+
+
+def save_results(results: Dict[str, Dict[str, float]], filename: str) -> None:
+    """将基准测试结果保存为JSON文件
+
+    Args:
+        results: 场景名到统计结果的映射
+        filename: 输出文件路径
+    """
+    directory = os.path.dirname(filename)
+    if directory and not os.path.exists(directory):
+        os.makedirs(directory)
+
+    payload = {
+        'created_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'results': results,
+    }
+    with open(filename, 'w', encoding='utf-8') as f:
+        json.dump(payload, f, ensure_ascii=False, indent=2)
+        f.write('\n')
+
+
+def load_results(filename: str) -> Optional[Dict[str, Dict[str, float]]]:
+    """读取JSON格式的基准测试结果，文件不存在时返回None"""
+    if not os.path.exists(filename):
+        return None
+    with open(filename, 'r', encoding='utf-8') as f:
+        return json.load(f).get('results', {})
+
+
+def compare_to_baseline(results: Dict[str, Dict[str, float]],
+                        baseline: Dict[str, Dict[str, float]],
+                        threshold: float = 0.2) -> List[Dict[str, float]]:
+    """将本次结果与基线对比，找出超出阈值的性能回退
+
+    以中位数比较；为降低噪声影响，本次中位数需同时超过
+    基线中位数*(1+threshold)和基线第三四分位数才判定为回退。
+
+    Args:
+        results: 本次结果
+        baseline: 基线结果
+        threshold: 允许的相对变慢比例，如0.2表示20%
+
+    Returns:
+        List[Dict[str, float]]: 回退场景列表，空列表表示无回退
+    """
+    regressions = []
+    for name, current in results.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+
+        limit = max(base['median_ns'] * (1 + threshold), base['q3_ns'])
+        if current['median_ns'] > limit:
+            regressions.append({
+                'scenario': name,
+                'baseline_ns': base['median_ns'],
+                'current_ns': current['median_ns'],
+                'ratio': current['median_ns'] / base['median_ns'],
+            })
+    return regressions
+
+
+def missing_scenarios(results: Dict[str, Dict[str, float]],
+                      baseline: Dict[str, Dict[str, float]]) -> List[str]:
+    """返回本次运行中基线缺少的场景名（这些场景无法判断是否回退）"""
+    return [name for name in results if not baseline.get(name)]
+
+
+def format_ns(value: float) -> str:
+    """将纳秒格式化为易读的时间字符串"""
+    if value >= 1e9:
+        return f"{value / 1e9:.2f} s"
+    if value >= 1e6:
+        return f"{value / 1e6:.2f} ms"
+    if value >= 1e3:
+        return f"{value / 1e3:.2f} µs"
+    return f"{value:.0f} ns"
+
+
+def print_results(results: Dict[str, Dict[str, float]]) -> None:
+    """打印基准测试结果表格"""
+    for name, stats in results.items():
+        print(f"  {name:<28} 中位数: {format_ns(stats['median_ns']):>10}  "
+              f"IQR: {format_ns(stats['iqr_ns']):>10}  "
+              f"(n={stats['samples']})")
+
+
+def check_baseline(results: Dict[str, Dict[str, float]], baseline_file: str,
+                   threshold: float = 0.2) -> int:
+    """将本次结果与基线文件对比并打印结论
+
+    基线文件不存在或缺少本次运行的场景时无法判断是否回退，按失败处理而不是静默通过。
+
+    Args:
+        results: 本次结果
+        baseline_file: 基线JSON路径
+        threshold: 允许的相对变慢比例
+
+    Returns:
+        int: 0表示无回退，1表示存在回退，2表示基线文件不存在或缺少场景
+    """
+    baseline = load_results(baseline_file)
+    if baseline is None:
+        print(f"错误: 未找到基线文件 {baseline_file}，无法检查性能回退，可使用 --update-baseline 生成")
+        return 2
+
+    missing = missing_scenarios(results, baseline)
+    if missing:
+        print("\n错误: 基线中缺少以下场景，无法检查性能回退，请使用 --update-baseline 更新基线:")
+        for name in missing:
+            print(f"  - {name}")
+
+    regressions = compare_to_baseline(results, baseline, threshold)
+    if not regressions:
+        if missing:
+            return 2
+        print(f"与基线对比：无超过 {threshold:.0%} 的性能回退")
+        return 0
+
+    print(f"\n检测到性能回退（阈值 {threshold:.0%}）:")
+    for item in regressions:
+        print(f"  - {item['scenario']}: {format_ns(item['baseline_ns'])} -> "
+              f"{format_ns(item['current_ns'])} ({item['ratio']:.2f}x)")
+    return 1
+
+
+def benchmark_main(description: str,
+                   run: Callable[[argparse.Namespace], Dict[str, Dict[str, float]]],
+                   default_output: str, default_baseline: str,
+                   add_arguments: Optional[Callable[[argparse.ArgumentParser], None]] = None,
+                   title: Optional[Callable[[argparse.Namespace], str]] = None,
+                   repeat: int = 15, argv=None) -> int:
+    """基准测试脚本的公共命令行入口：运行场景、保存结果，并更新基线或与基线对比
+
+    Args:
+        description: 命令行描述，未提供title时同时作为报告标题
+        run: 根据命令行参数运行全部场景，返回场景名到统计结果的映射
+        default_output: 结果JSON的默认路径
+        default_baseline: 基线JSON的默认路径
+        add_arguments: 可选，为命令行解析器添加脚本自己的参数
+        title: 可选，根据命令行参数生成报告标题
+        repeat: --repeat的默认采样轮数
+        argv: 命令行参数，None表示使用sys.argv
+
+    Returns:
+        int: 进程退出码，含义见check_baseline；更新基线时为0
+    """
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument('--repeat', type=int, default=repeat, help='每个场景的采样轮数')
+    parser.add_argument('--output', default=default_output, help='结果JSON输出路径')
+    parser.add_argument('--baseline', default=default_baseline, help='基线JSON路径')
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help='允许的相对回退比例（默认0.2即20%%）')
+    parser.add_argument('--update-baseline', action='store_true',
+                        help='将本次结果写入基线文件')
+    if add_arguments is not None:
+        add_arguments(parser)
+    args = parser.parse_args(argv)
+
+    print(title(args) if title is not None else description)
+    print("=" * 50)
+    results = run(args)
+    print_results(results)
+
+    save_results(results, args.output)
+    print(f"\n结果已保存到: {args.output}")
+
+    if args.update_baseline:
+        save_results(results, args.baseline)
+        print(f"基线已更新: {args.baseline}")
+        return 0
+    return check_baseline(results, args.baseline, args.threshold)
@@ -32,4 +32,43 @@ CRAWLER_CONFIG = {
     "output_dir": "output",  # 输出目录
     "request_timeout": 10,  # 请求超时时间（秒）
     "retry_times": 3,  # 重试次数
+    "log_level": "INFO",  # 日志级别，DEBUG时记录每条匹配的新闻
+    "queue_url": "sqlite:///output/work_queue.db",  # 多机协作的共享队列地址
+    "lease_seconds": 120,  # 任务租约时长（秒），超时未完成的任务会被重新分配
+    "queue_poll_interval": 5,  # 等待其他节点时的轮询间隔（秒）
+    "feed_discovery": True,  # 优先使用站点地图/RSS订阅源发现新闻
+    "feed_cache_ttl_days": 7,  # 订阅源探测结果的缓存有效期（天）
+    "feed_max_articles": 50,  # 每个站点从站点地图中最多抓取的文章数
+    "transport": "requests",  # 传输层：requests（HTTP/1.1）或 httpx（支持HTTP/2，需安装httpx[http2]）
+    "http2": True,  # 使用httpx传输层时是否启用HTTP/2
+    "max_concurrency": 6,  # 批量抓取文章页时的最大并发请求数
+    "dns_cache": True,  # 进程内缓存DNS解析结果，启动时并行解析所有站点主机名
+    "dns_cache_ttl": 300,  # 解析结果未带TTL时的缓存时间（秒）；安装dnspython时按记录的TTL缓存
+    "dns_negative_ttl": 30,  # 解析失败结果的缓存时间（秒）
+    "dns_prefetch_timeout": 10,  # 启动时等待预解析的最长时间（秒），未完成的查询在后台继续
+    "archive_dir": "output/archive",  # Parquet结果归档目录（需安装pyarrow），设为None则不归档
+    "daemon_min_interval": 1800,  # 守护模式下同一站点的最小访问间隔（秒）
+    "daemon_max_interval": 86400,  # 守护模式下同一站点的最大访问间隔（秒）
+    "daemon_initial_interval": 3600,  # 守护模式下新站点的初始访问间隔（秒）
+    "respect_robots": True,  # 遵守robots.txt（禁止抓取的URL会被跳过，Crawl-delay按主机生效）
+    "robots_user_agent": "SZCrawler",  # 匹配robots.txt规则时使用的爬虫名称
+    "robots_cache_ttl_hours": 24,  # robots.txt缓存有效期（小时）
+    "default_crawl_delay": 1,  # robots.txt未声明Crawl-delay时同一主机的请求间隔（秒），设为0会向同一主机连续请求
+    "max_crawl_delay": 60,  # Crawl-delay上限（秒）
+    "frontier_exact": True,  # 布隆过滤器判定可能重复时查询磁盘上的精确集合，避免误判漏抓
+    "frontier_capacity": 100000,  # 已见URL布隆过滤器的初始容量（写满后自动扩容）
+    "frontier_error_rate": 0.001,  # 布隆过滤器误判率上限
+    "warc_dir": "output/warc",  # --record 模式下WARC文件的保存目录
+    "page_fingerprint": True,  # 列表区域指纹未变化时复用上次的解析结果
+    # 按站点名称配置列表区域的起止标记（原始HTML片段），只解析该区域并计算指纹，例如：
+    # "济南市教育局": ['<div class="news-list"', '</ul>']
+    "region_markers": {},
+    # 各内容类型的最大下载字节数，超出部分截断；未列出的类型使用default
+    "max_response_bytes": {
+        "text/html": 5 * 1024 * 1024,
+        "application/xhtml+xml": 5 * 1024 * 1024,
+        "application/xml": 20 * 1024 * 1024,
+        "text/xml": 20 * 1024 * 1024,
+        "default": 2 * 1024 * 1024,
+    },
 } 
\ No newline at end of file
@@ -1,6 +1,6 @@
 import os
 import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 from datetime import datetime, timedelta
 from dateutil.parser import parse
 from fake_useragent import UserAgent
@@ -9,32 +9,154 @@ from config import WEBSITES, WECHAT_ACCOUNTS, CRAWLER_CONFIG
 import logging
 import time
 import urllib3
-from urllib.parse import urljoin, urlparse
-import re
+from urllib.parse import urlparse
 import sys
+import socket
+import json
+import signal
+import tempfile
+import threading
+from contextlib import nullcontext
+from profiler import StageProfiler
+from url_normalizer import normalize_link, canonical_key
+from log_manager import setup_logging
+from work_queue import make_task, open_queue, LeaseKeeper
+from feed_discovery import FeedDiscovery
+from fetch_policy import is_binary_url
+from transport import create_transport
+from dns_cache import DNSCache, mount_dns_cache
+from requests.compat import chardet
+from scheduler import AdaptiveScheduler
+from result_archive import ResultArchive
+from page_fingerprint import region_fingerprint, slice_region, FingerprintStore, NEWS_CONTAINER_CLASS
+from warc_store import WarcWriter, ReplayTransport, RecordingSession, ReplaySession, find_warc_files
+from robots_policy import RobotsCache, HostThrottle
+from url_frontier import URLFrontier, SeenURLs, PRIORITY_LIST, PRIORITY_ARTICLE
+from news_record import NewsLink, group_by_source
+from progress import (SITE_STARTED, SITE_FINISHED, PAGE_FETCHED, MATCH_FOUND, RETRY,
+                      RUN_FINISHED)
 
 # 禁用 SSL 警告
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
-# 配置日志
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('crawler.log', encoding='utf-8', mode='w'),
-        logging.StreamHandler()
-    ]
-)
 logger = logging.getLogger(__name__)
 
+# 未启用性能分析时复用的空上下文
+_NO_PROFILE = nullcontext()
+
+class FetchError(Exception):
+    """页面在全部重试后仍获取失败"""
+
+
 class SZCrawler:
-    def __init__(self):
+    def __init__(self, profiler=None, record_warc=False, progress=None):
         self.ua = UserAgent()
         self.output_dir = CRAWLER_CONFIG['output_dir']
         self._create_output_dir()
         self.session = requests.Session()
         self.session.verify = False
+        self.profiler = profiler
+        self.dns_cache = None
+        # 各主机的DNS查询耗时：主机名 -> [总秒数, 查询次数, 失败次数]，在运行汇总中输出
+        self.dns_timings = {}
+        self._dns_lock = threading.Lock()
+        if CRAWLER_CONFIG.get('dns_cache', True):
+            self.dns_cache = DNSCache(
+                default_ttl=CRAWLER_CONFIG.get('dns_cache_ttl', 300),
+                negative_ttl=CRAWLER_CONFIG.get('dns_negative_ttl', 30),
+                on_lookup=self._record_dns
+            )
+            # 会话上挂载后，robots.txt和订阅源探测等直接使用会话的请求也经过缓存
+            mount_dns_cache(self.session, self.dns_cache)
+        self.transport = create_transport(
+            CRAWLER_CONFIG.get('transport', 'requests'),
+            self.session,
+            http2=CRAWLER_CONFIG.get('http2', True),
+            max_concurrency=CRAWLER_CONFIG.get('max_concurrency', 6),
+            dns_cache=self.dns_cache
+        )
         self.stop_flag = False
+        self.progress = progress
+        # 工作节点模式下当前任务的续租器
+        self.lease_keeper = None
+        self.attachments = []
+        self.warc_writer = None
+        # 直接使用会话的请求（robots.txt、订阅源探测和读取）所用的会话，记录模式下同样写入WARC
+        direct_session = self.session
+        if record_warc:
+            self.warc_writer = WarcWriter(CRAWLER_CONFIG.get('warc_dir') or os.path.join(self.output_dir, 'warc'))
+            direct_session = RecordingSession(self.session, self.warc_writer)
+        # 按主机安排请求间隔，取代各站点之间固定的等待；robots.txt的获取同样计入
+        self.throttle = HostThrottle(self._host_delay, self._sleep)
+        self.robots = None
+        if CRAWLER_CONFIG.get('respect_robots', True):
+            self.robots = RobotsCache(
+                direct_session,
+                self._get_headers,
+                user_agent=CRAWLER_CONFIG.get('robots_user_agent', 'SZCrawler'),
+                ttl_hours=CRAWLER_CONFIG.get('robots_cache_ttl_hours', 24),
+                timeout=CRAWLER_CONFIG['request_timeout'],
+                # 记录模式不读取磁盘缓存，保证robots.txt被重新获取并写入WARC
+                cache_file=None if record_warc else os.path.join(self.output_dir, 'robots_cache.json'),
+                max_crawl_delay=CRAWLER_CONFIG.get('max_crawl_delay', 60),
+                throttle=self.throttle,
+                fetch_delay=CRAWLER_CONFIG.get('default_crawl_delay', 1)
+            )
+        self.frontier = None
+        self.feed_discovery = None
+        if CRAWLER_CONFIG.get('feed_discovery', True):
+            self.feed_discovery = self._create_feed_discovery(
+                direct_session,
+                None if record_warc else os.path.join(self.output_dir, 'feed_cache.json')
+            )
+        self.archive = None
+        if CRAWLER_CONFIG.get('archive_dir'):
+            try:
+                self.archive = ResultArchive(CRAWLER_CONFIG['archive_dir'])
+            except ImportError as e:
+                logger.warning(f"Parquet归档未启用: {str(e)}")
+        self.fingerprints = None
+        if CRAWLER_CONFIG.get('page_fingerprint', True):
+            self.fingerprints = FingerprintStore(os.path.join(self.output_dir, 'page_fingerprints.json'))
+
+    def _create_feed_discovery(self, session, cache_file):
+        """创建订阅源发现器
+
+        Args:
+            session: 请求订阅源使用的会话（记录模式下为RecordingSession，回放时为ReplaySession）
+            cache_file: 探测结果缓存文件，None表示只在内存中缓存
+        """
+        return FeedDiscovery(
+            session,
+            self._get_headers,
+            cache_file=cache_file,
+            ttl_days=CRAWLER_CONFIG.get('feed_cache_ttl_days', 7),
+            timeout=CRAWLER_CONFIG['request_timeout'],
+            robots=self.robots,
+            caps=CRAWLER_CONFIG.get('max_response_bytes'),
+            throttle=self.throttle
+        )
+
+    def _stage(self, name):
+        """返回阶段计时上下文，未启用性能分析时为空操作"""
+        if self.profiler is None:
+            return _NO_PROFILE
+        return self.profiler.stage(name)
+
+    def _emit(self, kind, site=None, url=None, **detail):
+        """发布进度事件，未设置事件流时为空操作"""
+        if self.progress is not None:
+            self.progress.emit(kind, site, url, **detail)
+
+    def stop(self):
+        """请求停止爬取（可从其他线程调用），当前请求结束后退出"""
+        self.stop_flag = True
+
+    def _site(self, name):
+        """返回站点计时作用域，未启用性能分析时为空操作"""
+        if self.profiler is None:
+            return _NO_PROFILE
+        return self.profiler.site(name)
 
     def _create_output_dir(self):
         """创建输出目录"""
@@ -47,6 +169,7 @@ class SZCrawler:
             'User-Agent': self.ua.random,
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
             'Accept-Language': 'zh-CN,zh;q=0.8,zh-TW;q=0.7,zh-HK;q=0.5,en-US;q=0.3,en;q=0.2',
+            'Accept-Encoding': 'gzip, deflate',
             'Connection': 'keep-alive',
             'Upgrade-Insecure-Requests': '1',
         }
@@ -60,34 +183,152 @@ class SZCrawler:
 
         return headers
 
-    def _is_valid_url(self, url):
-        """检查URL是否有效"""
+    def _normalize_url(self, url, base_url):
+        """标准化URL，返回NormalizedURL(url, key)，无效链接返回None
+
+        结果按(base_url, url)缓存，详见url_normalizer模块
+        """
+        return normalize_link(url, base_url)
+
+    def _host_delay(self, url):
+        """主机的请求间隔：robots.txt声明的Crawl-delay，未声明时使用配置的默认值"""
+        delay = self.robots.crawl_delay(url) if self.robots is not None else None
+        if delay is None:
+            delay = CRAWLER_CONFIG.get('default_crawl_delay', 1)
+        return delay
+
+    def _record_dns(self, host, seconds, error):
+        """记录一次DNS查询的耗时（由DNS缓存在发出查询的线程中调用）"""
+        with self._dns_lock:
+            timing = self.dns_timings.setdefault(host, [0.0, 0, 0])
+            timing[0] += seconds
+            timing[1] += 1
+            timing[2] += error is not None
+        if self.profiler is not None:
+            self.profiler.record_dns(host, seconds)
+        if error is not None:
+            logger.warning(f"DNS解析失败: {host}, 耗时 {seconds:.2f} 秒, 错误: {str(error)}")
+        else:
+            logger.debug(f"DNS解析 {host}: {seconds * 1000:.1f} ms")
+
+    def _prefetch_dns(self):
+        """并行解析所有配置站点的主机名，首个请求不再等待DNS查询"""
+        if self.dns_cache is None:
+            return
+        hosts = [urlparse(url).hostname for url in WEBSITES.values()]
+        start = time.perf_counter()
+        with self._stage('dns_prefetch'):
+            timings = self.dns_cache.prefetch(hosts, timeout=CRAWLER_CONFIG.get('dns_prefetch_timeout', 10))
+        if not timings:
+            return
+        finished = {host: seconds for host, seconds in timings.items() if seconds is not None}
+        message = (f"DNS预解析 {len(timings)} 个主机，用时 {time.perf_counter() - start:.2f} 秒"
+                   f"（逐个解析共需 {sum(finished.values()):.2f} 秒）")
+        if finished:
+            slowest = max(finished, key=finished.get)
+            message += f"，最慢: {slowest} {finished[slowest]:.2f} 秒"
+        if len(finished) < len(timings):
+            message += f"，{len(timings) - len(finished)} 个主机仍在解析"
+        logger.info(message)
+
+    def _log_dns_summary(self):
+        """在运行汇总中按耗时从高到低列出各主机的DNS解析时间"""
+        with self._dns_lock:
+            timings = {host: list(timing) for host, timing in self.dns_timings.items()}
+        if not timings:
+            return
+        lines = [f"DNS解析耗时（{len(timings)} 个主机）:"]
+        for host, (seconds, count, failures) in sorted(timings.items(), key=lambda item: item[1][0],
+                                                       reverse=True):
+            line = f"  {host}: {seconds * 1000:.1f} ms（{count} 次查询"
+            line += f"，失败 {failures} 次）" if failures else "）"
+            lines.append(line)
+        logger.info('\n'.join(lines))
+
+    def _is_allowed(self, url):
+        """robots.txt是否允许抓取该URL"""
+        if self.robots is None:
+            return True
+        with self._stage('robots'):
+            allowed = self.robots.allowed(url)
+        if not allowed:
+            logger.info(f"robots.txt禁止抓取，已跳过: {url}")
+        return allowed
+
+    def _create_frontier(self):
+        """创建抓取队列：已见URL的精确集合保存在输出目录下的临时SQLite文件中，关闭时删除"""
+        path = None
+        if CRAWLER_CONFIG.get('frontier_exact', True):
+            fd, path = tempfile.mkstemp(prefix='frontier_', suffix='.db', dir=self.output_dir)
+            os.close(fd)
+        seen = SeenURLs(
+            path,
+            initial_capacity=CRAWLER_CONFIG.get('frontier_capacity', 100000),
+            error_rate=CRAWLER_CONFIG.get('frontier_error_rate', 0.001),
+            delete_on_close=True
+        )
+        return URLFrontier(seen, self.throttle.delay)
+
+    def _close_frontier(self):
+        """关闭抓取队列"""
+        if self.frontier is not None:
+            self.frontier.close()
+            self.frontier = None
+
+    def _record_attachment(self, url, content_type=None, content_length=None):
+        """记录二进制附件（不下载正文）"""
+        self.attachments.append({
+            'url': url,
+            'content_type': content_type,
+            'content_length': int(content_length) if content_length and content_length.isdigit() else None
+        })
+        logger.info(f"跳过二进制附件: {url} ({content_type or '按扩展名识别'})")
+
+    def _decode_body(self, body, encoding):
+        """按响应头编码解码，未声明编码时自动检测"""
+        if not encoding or encoding == 'ISO-8859-1':
+            # 取开头部分检测编码，避免对大页面整体检测
+            encoding = chardet.detect(body[:64 * 1024])['encoding'] or 'utf-8'
         try:
-            result = urlparse(url)
-            return all([result.scheme, result.netloc])
-        except:
-            return False
+            return body.decode(encoding, errors='replace')
+        except LookupError:
+            return body.decode('utf-8', errors='replace')
 
-    def _normalize_url(self, url, base_url):
-        """标准化URL"""
-        if not url:
-            return None
+    def _handle_result(self, result):
+        """处理传输层返回的结果，返回页面文本；二进制附件返回None"""
+        if self.warc_writer is not None:
+            with self._stage('warc_record'):
+                self.warc_writer.write_response(result)
+        if result.status_code >= 400:
+            raise requests.exceptions.HTTPError(f"{result.status_code} 错误: {result.url}")
         
-        # 处理JavaScript链接
-        if url.startswith('javascript:'):
+        if result.body is None:
+            self._record_attachment(result.url, result.headers.get('content-type'),
+                                    result.headers.get('content-length'))
             return None
-            
-        # 处理相对路径
-        if not url.startswith(('http://', 'https://')):
-            url = urljoin(base_url, url)
-            
-        # 移除URL中的锚点
-        url = url.split('#')[0]
+        if result.truncated:
+            logger.warning(f"响应体超过字节上限，已截断: {result.url}")
         
-        return url if self._is_valid_url(url) else None
+        # 检测并设置正确的编码
+        with self._stage('decode'):
+            return self._decode_body(result.body, result.encoding)
+
+    def _fetch_page(self, url, raise_errors=False):
+        """获取页面内容
+
+        通过传输层以流式读取并按内容类型限制大小；二进制附件只记录不下载，返回None
 
-    def _fetch_page(self, url):
-        """获取页面内容"""
+        Args:
+            url: 页面URL
+            raise_errors: 全部重试失败后抛出FetchError而不是返回None（工作节点据此将任务标记为失败）
+        """
+        if is_binary_url(url):
+            self._record_attachment(url)
+            return None
+        if not self._is_allowed(url):
+            return None
+
+        error = None
         for attempt in range(CRAWLER_CONFIG['retry_times']):
             if self.stop_flag:
                 return None
@@ -98,95 +339,274 @@ class SZCrawler:
                 # 设置请求头
                 headers = self._get_headers(url)
                 
-                # 发送请求
-                response = self.session.get(
-                    url,
-                    headers=headers,
-                    timeout=CRAWLER_CONFIG['request_timeout']
-                )
-                response.raise_for_status()
+                # 按主机的请求间隔等待
+                with self._stage('politeness_wait'):
+                    self.throttle.wait(url)
+                if self.stop_flag or not self._renew_lease():
+                    return None
                 
-                # 检测并设置正确的编码
-                if response.encoding == 'ISO-8859-1':
-                    response.encoding = response.apparent_encoding
+                # 发送请求
+                with self._stage('fetch'):
+                    result = self.transport.fetch(
+                        url,
+                        headers,
+                        CRAWLER_CONFIG['request_timeout'],
+                        CRAWLER_CONFIG.get('max_response_bytes')
+                    )
                 
-                logger.info(f"成功获取页面: {url}")
-                return response.text
+                text = self._handle_result(result)
+                if text is not None:
+                    logger.info(f"成功获取页面: {url} ({result.http_version})")
+                    self._emit(PAGE_FETCHED, url=url, bytes=len(result.body))
+                return text
                 
             except requests.exceptions.SSLError as e:
+                error = e
                 logger.error(f"SSL错误: {url}, 错误: {str(e)}")
             except requests.exceptions.ConnectionError as e:
+                error = e
                 logger.error(f"连接错误: {url}, 错误: {str(e)}")
             except requests.exceptions.Timeout as e:
+                error = e
                 logger.error(f"请求超时: {url}, 错误: {str(e)}")
             except requests.exceptions.RequestException as e:
+                error = e
                 logger.error(f"请求异常: {url}, 错误: {str(e)}")
             except Exception as e:
+                error = e
                 logger.error(f"未知错误: {url}, 错误: {str(e)}")
             
+            if not self.transport.retryable:
+                break
             if attempt < CRAWLER_CONFIG['retry_times'] - 1:
                 wait_time = (attempt + 1) * 2
                 logger.info(f"等待 {wait_time} 秒后重试...")
-                time.sleep(wait_time)
+                self._emit(RETRY, url=url, attempt=attempt + 1, wait=wait_time)
+                with self._stage('retry_wait'):
+                    time.sleep(wait_time)
         
+        if raise_errors and error is not None and not self.stop_flag:
+            raise FetchError(f"获取页面失败: {url}, 错误: {str(error)}") from error
         return None
 
+    def _fetch_pages(self, urls):
+        """批量获取页面内容，返回与urls顺序一致的文本列表
+
+        支持并发的传输层（如HTTP/2）会同时发出请求；失败的请求回退到带重试的_fetch_page。
+        有请求间隔的主机（robots.txt声明或default_crawl_delay）不并发，逐个按间隔请求
+        """
+        texts = [None] * len(urls)
+        pending = []
+        for i, url in enumerate(urls):
+            if is_binary_url(url):
+                self._record_attachment(url)
+            elif not self._is_allowed(url):
+                continue
+            elif self.throttle.delay(url) > 0:
+                texts[i] = self._fetch_page(url)
+            else:
+                pending.append(i)
+        if not pending or self.stop_flag or not self._renew_lease():
+            return texts
+        
+        with self._stage('fetch'):
+            results = self.transport.fetch_many(
+                [(urls[i], self._get_headers(urls[i])) for i in pending],
+                CRAWLER_CONFIG['request_timeout'],
+                CRAWLER_CONFIG.get('max_response_bytes')
+            )
+        
+        for i, result in zip(pending, results):
+            try:
+                if isinstance(result, Exception):
+                    raise result
+                texts[i] = self._handle_result(result)
+                if texts[i] is not None:
+                    self._emit(PAGE_FETCHED, url=urls[i], bytes=len(result.body))
+            except Exception as e:
+                logger.warning(f"批量请求失败，改为单独重试: {urls[i]}, 错误: {str(e)}")
+                texts[i] = self._fetch_page(urls[i])
+        return texts
+
     def _parse_news_links(self, html, source_name, base_url):
         """解析新闻链接，仅在标题中搜索关键词"""
         if not html:
             return []
         
-        soup = BeautifulSoup(html, 'html.parser')
-        news_links = []
+        # 每个页面只生成一次爬取时间
+        crawl_ts = int(time.time())
+        keyword = CRAWLER_CONFIG['keyword']
+        
+        # 配置了区域标记时只解析标记之间的内容，与指纹覆盖的范围一致
+        html = slice_region(html, CRAWLER_CONFIG.get('region_markers', {}).get(source_name))
         
-        # 针对不同网站使用不同的解析策略
+        # 针对不同网站使用不同的解析策略：济南、青岛只解析新闻容器内的链接
         domain = urlparse(base_url).netloc
+        use_containers = 'jinan.gov.cn' in domain or 'qingdao.gov.cn' in domain
+        
+        # 列表区域指纹未变化时直接复用上次的结果，跳过解析和匹配；指纹与解析读取相同的链接
+        fingerprint = None
+        if self.fingerprints is not None:
+            with self._stage('fingerprint'):
+                fingerprint = region_fingerprint(html, containers=use_containers)
+                cached = self.fingerprints.lookup(base_url, fingerprint, keyword)
+            if cached is not None:
+                logger.info(f"{source_name} 列表区域未变化，复用上次的 {len(cached)} 条结果")
+                news_links = [NewsLink(source_name, link['title'], link['url'], crawl_ts) for link in cached]
+                for link in news_links:
+                    self._emit(MATCH_FOUND, source_name, link.url, title=link.title)
+                return news_links
+        
+        with self._stage('parse'):
+            soup = BeautifulSoup(html, 'html.parser')
+        news_links = []
+        seen_keys = set()
+        log_matches = logger.isEnabledFor(logging.DEBUG)
         
         # 查找所有可能的新闻链接容器
         news_containers = []
-        if 'jinan.gov.cn' in domain:
-            news_containers = soup.find_all(['div', 'ul'], class_=re.compile(r'news|list|content'))
-        elif 'qingdao.gov.cn' in domain:
-            news_containers = soup.find_all(['div', 'ul'], class_=re.compile(r'news|list|content'))
+        if use_containers:
+            news_containers = soup.find_all(['div', 'ul'], class_=NEWS_CONTAINER_CLASS)
         else:
             # 默认查找所有链接
             news_containers = [soup]
         
-        for container in news_containers:
-            for link in container.find_all('a'):
-                if self.stop_flag:
-                    return news_links
+        with self._stage('match'):
+            for container in news_containers:
+                for link in container.find_all('a'):
+                    if self.stop_flag:
+                        return news_links
+                        
+                    href = link.get('href')
+                    text = link.get_text(strip=True)
                     
-                href = link.get('href')
-                text = link.get_text(strip=True)
-                
-                # 检查标题中是否包含关键词
-                if href and text and CRAWLER_CONFIG['keyword'] in text:
-                    # 标准化URL
-                    full_url = self._normalize_url(href, base_url)
-                    if full_url:
-                        news_links.append({
-                            'source': source_name,
-                            'title': text,
-                            'url': full_url,
-                            'crawl_time': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                        })
-                        logger.info(f"找到相关新闻: {text}")
+                    # 检查标题中是否包含关键词
+                    if href and text and keyword in text:
+                        # 标准化URL
+                        with self._stage('normalize'):
+                            normalized = self._normalize_url(href, base_url)
+                        if normalized and normalized.key not in seen_keys:
+                            seen_keys.add(normalized.key)
+                            news_links.append(NewsLink(source_name, text, normalized.url, crawl_ts))
+                            self._emit(MATCH_FOUND, source_name, normalized.url, title=text)
+                            if log_matches:
+                                logger.debug("找到相关新闻: %s", text)
         
+        if fingerprint is not None:
+            self.fingerprints.update(base_url, fingerprint, keyword, news_links)
         return news_links
 
-    def crawl_website(self, name, url):
-        """爬取指定网站"""
+    def _extract_title(self, html):
+        """提取文章页面标题"""
+        soup = BeautifulSoup(html, 'html.parser', parse_only=SoupStrainer('title'))
+        return soup.get_text(strip=True)
+
+    def _crawl_feeds(self, name, feeds, start_date, end_date):
+        """通过订阅源获取新闻：RSS/Atom直接按标题匹配，站点地图条目按日期过滤后再抓取正文标题
+
+        Returns:
+            tuple: (新闻列表, 订阅源是否可用)；订阅源全部获取失败或没有可按日期判断的条目时不可用
+        """
+        news_links = []
+        stats = {}
+        seen_keys = set()
+        pending_articles = []
+        crawl_ts = int(time.time())
+        keyword = CRAWLER_CONFIG['keyword']
+
+        def add(title, article_url, publish_date):
+            normalized = self._normalize_url(article_url, article_url)
+            if normalized and normalized.key not in seen_keys:
+                seen_keys.add(normalized.key)
+                news_links.append(NewsLink(name, title, normalized.url, crawl_ts, publish_date))
+                self._emit(MATCH_FOUND, name, normalized.url, title=title)
+
+        with self._stage('feed'):
+            for feed in feeds:
+                for entry in self.feed_discovery.iter_entries(feed['url'], start_date, end_date,
+                                                              stats=stats):
+                    if self.stop_flag:
+                        return news_links, True
+                    if entry['title'] is None:
+                        pending_articles.append((entry['loc'], entry['lastmod']))
+                    elif keyword in entry['title']:
+                        add(entry['title'], entry['loc'], entry['lastmod'])
+
+        # 先排除robots.txt禁止抓取的文章，避免占用抓取数量上限
+        if self.robots is not None:
+            with self._stage('robots'):
+                allowed = set(self.robots.filter_allowed(article_url for article_url, _ in pending_articles))
+                pending_articles = [(article_url, publish_date)
+                                    for article_url, publish_date in pending_articles
+                                    if article_url in allowed]
+        # 文章经抓取队列去重（本次运行中已成功抓取的文章不再抓取），按主机轮流取出
+        if self.frontier is None:
+            self.frontier = self._create_frontier()
+        max_articles = CRAWLER_CONFIG.get('feed_max_articles', 50)
+        queued = 0
+        hosts = set()
+        with self._stage('frontier'):
+            for article_url, publish_date in pending_articles:
+                if queued >= max_articles:
+                    logger.warning(f"{name} 站点地图中日期范围内的文章过多，仅抓取前 {max_articles} 篇")
+                    break
+                # 抓取成功后才记为已见，失败的文章在守护模式的下一轮中重试
+                if self.frontier.add(article_url, 'article', source=name, data=publish_date,
+                                     defer_seen=True):
+                    queued += 1
+                    hosts.add(urlparse(self._normalize_url(article_url, article_url).url).netloc)
+            # 只取出本站点的文章，不会带走队列中其他站点遗留的URL
+            batch = self.frontier.pop_batch(queued, PRIORITY_ARTICLE, hosts) if queued else []
+        pages = [None] * len(batch)
+        try:
+            pages = self._fetch_pages([item.url for item in batch])
+        finally:
+            for item, html in zip(batch, pages):
+                # 附件只记录不下载，同样视为已处理
+                self.frontier.done(item, success=bool(html) or is_binary_url(item.url))
+        for item, html in zip(batch, pages):
+            if html:
+                title = self._extract_title(html)
+                if keyword in title:
+                    add(title, item.url, item.data)
+
+        return news_links, stats.get('usable', 0) > 0
+
+    def crawl_website(self, name, url, start_date=None, end_date=None, raise_errors=False):
+        """爬取指定网站
+
+        站点提供订阅源或站点地图时优先使用；没有订阅源、订阅源获取失败或条目都没有日期时，回退为解析首页HTML
+
+        Args:
+            raise_errors: 首页获取失败时抛出FetchError，而不是当作没有结果
+        """
         if self.stop_flag:
             return []
             
         logger.info(f"开始爬取: {name} ({url})")
-        html = self._fetch_page(url)
-        if html:
-            news_links = self._parse_news_links(html, name, url)
-            logger.info(f"在 {name} 中找到 {len(news_links)} 条相关新闻")
-            return news_links
-        return []
+        self._emit(SITE_STARTED, name, url)
+        news_links = []
+        try:
+            with self._site(name):
+                if self.feed_discovery:
+                    with self._stage('discover'):
+                        feeds = self.feed_discovery.discover(url)
+                    if feeds:
+                        start_date, end_date = self._resolve_dates(start_date, end_date)
+                        news_links, usable = self._crawl_feeds(name, feeds, start_date, end_date)
+                        if usable:
+                            logger.info(f"通过订阅源在 {name} 中找到 {len(news_links)} 条相关新闻")
+                            return news_links
+                        # 订阅源获取失败或条目都没有日期时，回退为解析首页
+                        logger.warning(f"{name} 的订阅源没有可用条目，回退为解析首页")
+
+                html = self._fetch_page(url, raise_errors)
+                if html:
+                    news_links = self._parse_news_links(html, name, url)
+                    logger.info(f"在 {name} 中找到 {len(news_links)} 条相关新闻")
+                return news_links
+        finally:
+            self._emit(SITE_FINISHED, name, url, matches=len(news_links))
 
     def save_to_markdown(self, news_links, start_date, end_date):
         """保存为Markdown文件"""
@@ -202,70 +622,411 @@ class SZCrawler:
             f.write(f"- 总新闻数: {len(news_links)}\n")
             f.write(f"- 爬取时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
             
-            # 按来源分组
-            sources = {}
-            for link in news_links:
-                if link['source'] not in sources:
-                    sources[link['source']] = []
-                sources[link['source']].append(link)
-            
-            # 写入每个来源的新闻
-            for source, links in sources.items():
-                f.write(f"## {source} ({len(links)}条)\n\n")
+            # 按来源分组写入每个来源的新闻
+            for source, count, links in group_by_source(news_links):
+                f.write(f"## {source} ({count}条)\n\n")
                 for link in links:
-                    f.write(f"- [{link['title']}]({link['url']})\n")
-                    f.write(f"  - 爬取时间: {link['crawl_time']}\n\n")
+                    f.write(f"- [{link.title}]({link.url})\n")
+                    f.write(f"  - 爬取时间: {link.crawl_time}\n\n")
 
         logger.info(f"结果已保存到: {filename}")
 
-    def run(self, start_date=None, end_date=None):
-        """运行爬虫"""
+    def save_to_archive(self, news_links):
+        """将结果追加到Parquet归档（未启用归档时忽略）"""
+        if not self.archive or not news_links:
+            return
+        try:
+            rows = self.archive.append([link.to_dict() for link in news_links], CRAWLER_CONFIG['keyword'])
+            logger.info(f"已归档 {rows} 条结果到: {self.archive.root}")
+        except Exception as e:
+            logger.error(f"写入Parquet归档失败: {str(e)}", exc_info=True)
+
+    def _resolve_dates(self, start_date, end_date):
+        """补全默认的开始和结束日期"""
         if not start_date:
             start_date = (datetime.now() - timedelta(days=CRAWLER_CONFIG['date_range_days'])).strftime('%Y-%m-%d')
         if not end_date:
             end_date = datetime.now().strftime('%Y-%m-%d')
+        return start_date, end_date
+
+    def _merge_news_links(self, all_news_links, news_links, seen_keys):
+        """按规范键去重后追加新闻链接"""
+        for link in news_links:
+            key = canonical_key(link.url)
+            if key not in seen_keys:
+                seen_keys.add(key)
+                all_news_links.append(link)
+
+    def run(self, start_date=None, end_date=None):
+        """运行爬虫"""
+        start_date, end_date = self._resolve_dates(start_date, end_date)
 
         logger.info(f"开始爬取 {start_date} 至 {end_date} 的新闻")
         all_news_links = []
+        seen_keys = set()
+        
+        if self.progress is not None:
+            self.progress.start_run(len(WEBSITES))
+        self._prefetch_dns()
+        
+        # 站点首页作为列表页进入抓取队列，按主机轮流取出
+        self._close_frontier()
+        self.frontier = self._create_frontier()
+        for name, url in WEBSITES.items():
+            self.frontier.add(url, 'list', source=name)
         
         # 爬取网站
-        total_sites = len(WEBSITES)
-        for i, (name, url) in enumerate(WEBSITES.items(), 1):
+        try:
+            while not self.stop_flag:
+                item = self.frontier.pop(PRIORITY_LIST)
+                if item is None:
+                    break
+                    
+                try:
+                    news_links = self.crawl_website(item.source, item.url, start_date, end_date)
+                    # 按规范键跨站点去重
+                    self._merge_news_links(all_news_links, news_links, seen_keys)
+                except Exception as e:
+                    logger.error(f"爬取 {item.source} 时发生错误: {str(e)}", exc_info=True)
+                    continue
+        finally:
+            self._close_frontier()
+
+        # 保存结果
+        if not self.stop_flag:
+            with self._stage('save'):
+                self.save_to_markdown(all_news_links, start_date, end_date)
+                self.save_to_archive(all_news_links)
+            logger.info(f"爬取完成，共找到 {len(all_news_links)} 条新闻")
+            if self.attachments:
+                logger.info(f"共跳过 {len(self.attachments)} 个二进制附件")
+        self._log_dns_summary()
+        self._emit(RUN_FINISHED, total=len(all_news_links), stopped=self.stop_flag)
+
+    def run_replay(self, path, start_date=None, end_date=None):
+        """回放模式：从WARC文件离线重新解析，不访问网络
+
+        目录下的每个WARC文件对应一次记录的运行，按文件名顺序回放，结果按规范键去重后
+        保存为Markdown；订阅源的探测和读取同样从存档提供，不使用页面指纹和Parquet归档，
+        也不等待爬取间隔
+
+        Args:
+            path: WARC文件或包含WARC文件的目录
+            start_date: 开始日期（用于输出文件名）
+            end_date: 结束日期
+
+        Returns:
+            list: 合并后的新闻链接
+        """
+        start_date, end_date = self._resolve_dates(start_date, end_date)
+        use_feeds = self.feed_discovery is not None
+        self.fingerprints = None
+        self.archive = None
+        self.warc_writer = None
+        self.robots = None
+        self.throttle = HostThrottle(lambda url: 0)
+
+        all_news_links = []
+        seen_keys = set()
+        warc_files = find_warc_files(path)
+        if self.progress is not None:
+            self.progress.start_run(len(warc_files) * len(WEBSITES))
+        for warc_file in warc_files:
             if self.stop_flag:
                 break
-                
+            with self._stage('warc_load'):
+                self.transport = ReplayTransport.from_file(warc_file)
+            if use_feeds:
+                # 每个存档重新探测订阅源，探测结果只在内存中缓存
+                self.feed_discovery = self._create_feed_discovery(
+                    ReplaySession(self.transport.responses), None)
+            logger.info(f"回放 {warc_file}（{len(self.transport.responses)} 个响应）")
+            # 存档中有该站点的任何响应（首页、robots.txt或订阅源）时才回放该站点
+            recorded_hosts = {urlparse(recorded).netloc for recorded in self.transport.responses}
+            for name, url in WEBSITES.items():
+                if self.stop_flag:
+                    break
+                if urlparse(url).netloc not in recorded_hosts:
+                    continue
+                news_links = self.crawl_website(name, url, start_date, end_date)
+                self._merge_news_links(all_news_links, news_links, seen_keys)
+
+        if not self.stop_flag:
+            with self._stage('save'):
+                self.save_to_markdown(all_news_links, start_date, end_date)
+            logger.info(f"回放完成，共找到 {len(all_news_links)} 条新闻")
+        self._emit(RUN_FINISHED, total=len(all_news_links), stopped=self.stop_flag)
+        return all_news_links
+
+    def run_worker(self, queue, start_date=None, end_date=None, worker_id=None):
+        """作为工作节点从共享队列领取任务并爬取，直到队列中没有未完成任务
+
+        Args:
+            queue: 工作队列（见work_queue模块）
+            start_date: 开始日期，与日期范围共同决定运行ID，所有节点需一致
+            end_date: 结束日期
+            worker_id: 节点标识，默认为主机名-进程号
+
+        Returns:
+            int: 本节点完成的任务数
+        """
+        start_date, end_date = self._resolve_dates(start_date, end_date)
+        run_id = f"{start_date}_{end_date}"
+        worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+        lease_seconds = CRAWLER_CONFIG.get('lease_seconds', 120)
+        completed = 0
+        if self.progress is not None:
+            self.progress.start_run()
+        self._prefetch_dns()
+
+        logger.info(f"工作节点 {worker_id} 开始处理队列任务 (运行ID: {run_id})")
+        max_attempts = CRAWLER_CONFIG['retry_times']
+        while not self.stop_flag:
+            task = queue.lease(run_id, worker_id, lease_seconds, max_attempts)
+            if task is None:
+                if queue.is_finished(run_id):
+                    break
+                # 其他节点仍持有租约，等待其完成或租约过期
+                time.sleep(CRAWLER_CONFIG.get('queue_poll_interval', 5))
+                continue
+
             try:
-                news_links = self.crawl_website(name, url)
-                all_news_links.extend(news_links)
-                time.sleep(2)  # 增加爬取间隔，避免请求过于频繁
+                # 获取失败时抛出异常，由队列按尝试次数重新分配或标记为失败
+                self.lease_keeper = LeaseKeeper(queue, task, worker_id, lease_seconds)
+                news_links = self.crawl_website(task.name, task.url, start_date, end_date,
+                                                raise_errors=True)
+            except FetchError as e:
+                logger.error(f"处理任务 {task.id} 失败: {str(e)}")
+                queue.fail(task, worker_id, str(e), max_attempts)
+                continue
             except Exception as e:
-                logger.error(f"爬取 {name} 时发生错误: {str(e)}", exc_info=True)
+                logger.error(f"处理任务 {task.id} 时发生错误: {str(e)}", exc_info=True)
+                queue.fail(task, worker_id, str(e), max_attempts)
                 continue
+            finally:
+                self.lease_keeper = None
+            if self.stop_flag:
+                # 停止时未完成的任务不提交，租约过期后由其他节点重新领取
+                break
 
-        # 保存结果
-        if not self.stop_flag:
+            if queue.complete(task, worker_id, [link.to_dict() for link in news_links]):
+                completed += 1
+            else:
+                logger.warning(f"任务 {task.id} 的租约已由其他节点接手，丢弃本节点结果")
+
+        self._close_frontier()
+        logger.info(f"工作节点 {worker_id} 结束，共完成 {completed} 个任务")
+        self._log_dns_summary()
+        self._emit(RUN_FINISHED, total=completed, stopped=self.stop_flag)
+        return completed
+
+    def _renew_lease(self):
+        """工作节点模式下按需续租当前任务，租约已被其他节点接手时返回False，停止继续抓取"""
+        if self.lease_keeper is None:
+            return True
+        if self.lease_keeper.lost:
+            return False
+        if self.lease_keeper.renew():
+            return True
+        logger.warning(f"任务 {self.lease_keeper.task.id} 的租约已丢失，停止抓取")
+        return False
+
+    def _sleep(self, seconds):
+        """可被stop_flag中断的等待"""
+        deadline = time.time() + seconds
+        while not self.stop_flag:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                break
+            time.sleep(min(remaining, 1))
+
+    def _append_daemon_results(self, day, news_links):
+        """将守护模式当天的新增新闻追加到JSON Lines文件，并重新生成当天的Markdown汇总"""
+        records_file = os.path.join(self.output_dir, f"daemon_{day}.jsonl")
+        with open(records_file, 'a', encoding='utf-8') as f:
+            for link in news_links:
+                f.write(json.dumps(link.to_dict(), ensure_ascii=False) + '\n')
+
+        with open(records_file, 'r', encoding='utf-8') as f:
+            day_links = [NewsLink.from_dict(json.loads(line)) for line in f if line.strip()]
+        self.save_to_markdown(day_links, day, day)
+
+    def run_daemon(self):
+        """守护模式：常驻运行并复用会话，按各站点估计的更新频率安排重爬
+
+        新增新闻按天写入 output/daemon_YYYY-MM-DD.jsonl 并生成当天的Markdown汇总，
+        调度状态保存在 output/schedule_state.json，重启后继续使用已学习的频率
+        """
+        scheduler = AdaptiveScheduler(
+            WEBSITES,
+            min_interval=CRAWLER_CONFIG.get('daemon_min_interval', 1800),
+            max_interval=CRAWLER_CONFIG.get('daemon_max_interval', 86400),
+            initial_interval=CRAWLER_CONFIG.get('daemon_initial_interval', 3600),
+            state_file=os.path.join(self.output_dir, 'schedule_state.json')
+        )
+        logger.info(f"守护模式启动，共 {len(scheduler.states)} 个站点")
+        if self.progress is not None:
+            self.progress.start_run()
+        self._prefetch_dns()
+
+        while not self.stop_flag:
+            state = scheduler.next_due()
+            wait_time = state.next_visit - time.time()
+            if wait_time > 0:
+                logger.info(f"下次访问: {state.name}，{wait_time / 60:.1f} 分钟后")
+                self._sleep(wait_time)
+                continue
+
+            try:
+                # 获取失败时抛出异常，按失败退避，不当作没有新内容的访问
+                news_links = self.crawl_website(state.name, state.url, raise_errors=True)
+            except FetchError as e:
+                logger.error(f"爬取 {state.name} 失败: {str(e)}")
+                scheduler.record_failure(state.name)
+                scheduler.save_state()
+                continue
+            except Exception as e:
+                logger.error(f"爬取 {state.name} 时发生错误: {str(e)}", exc_info=True)
+                scheduler.record_failure(state.name)
+                scheduler.save_state()
+                continue
+
+            keys = [canonical_key(link.url) for link in news_links]
+            new_keys = set(scheduler.record_visit(state.name, keys))
+            scheduler.save_state()
+
+            new_links = [link for link, key in zip(news_links, keys) if key in new_keys]
+            if new_links:
+                self._append_daemon_results(datetime.now().strftime('%Y-%m-%d'), new_links)
+                self.save_to_archive(new_links)
+            logger.info(f"{state.name}: 新增 {len(new_links)} 条，"
+                        f"下次访问间隔 {state.interval / 60:.0f} 分钟")
+
+        # 守护模式下抓取队列在整个运行期间保留，已抓取过的文章不会重复抓取
+        self._close_frontier()
+        logger.info("守护模式已停止")
+        self._log_dns_summary()
+
+    def run_coordinator(self, queue, start_date=None, end_date=None):
+        """作为协调节点：向共享队列写入站点任务，参与爬取，待全部任务结束后合并输出
+
+        多个节点使用相同日期范围时运行ID相同，重复写入的任务会被忽略
+        """
+        start_date, end_date = self._resolve_dates(start_date, end_date)
+        run_id = f"{start_date}_{end_date}"
+
+        # 写入队列前排除robots.txt禁止抓取的站点
+        tasks = [make_task(run_id, 'site', name, url) for name, url in WEBSITES.items()
+                 if self._is_allowed(url)]
+        added = queue.add_tasks(tasks)
+        logger.info(f"协调节点已写入 {added} 个新任务 (运行ID: {run_id})")
+
+        self.run_worker(queue, start_date, end_date)
+        while not self.stop_flag and not queue.is_finished(run_id):
+            time.sleep(CRAWLER_CONFIG.get('queue_poll_interval', 5))
+
+        if self.stop_flag:
+            return
+
+        status = queue.status(run_id)
+        if status['failed']:
+            logger.warning(f"有 {status['failed']} 个任务多次失败，结果中将缺少对应站点")
+
+        all_news_links = []
+        results = [NewsLink.from_dict(data) for data in queue.results(run_id)]
+        self._merge_news_links(all_news_links, results, set())
+        with self._stage('save'):
             self.save_to_markdown(all_news_links, start_date, end_date)
-            logger.info(f"爬取完成，共找到 {len(all_news_links)} 条新闻")
+            self.save_to_archive(all_news_links)
+        logger.info(f"分布式爬取完成，共找到 {len(all_news_links)} 条新闻")
+
+def _pop_option(args, name, has_value=False):
+    """从参数列表中取出可选参数，返回其值（开关型参数返回True/False）"""
+    for i, arg in enumerate(args):
+        if arg == name:
+            args.pop(i)
+            if has_value:
+                return args.pop(i) if i < len(args) else None
+            return True
+        if has_value and arg.startswith(name + '='):
+            args.pop(i)
+            return arg.split('=', 1)[1]
+    return None if has_value else False
 
 def main():
     try:
+        args = sys.argv[1:]
+        profile = _pop_option(args, '--profile')
+        profile_dir = _pop_option(args, '--profile-dir', has_value=True)
+        log_level = _pop_option(args, '--log-level', has_value=True)
+        queue_spec = _pop_option(args, '--queue', has_value=True)
+        coordinator = _pop_option(args, '--coordinator')
+        worker = _pop_option(args, '--worker')
+        daemon = _pop_option(args, '--daemon')
+        record_warc = _pop_option(args, '--record')
+        replay_path = _pop_option(args, '--replay', has_value=True)
+        # 配置日志（后台线程写出，爬取线程不阻塞于日志I/O）
+        setup_logging(log_level or CRAWLER_CONFIG.get('log_level', 'INFO'))
+
         # 只保留命令行模式
-        if len(sys.argv) > 1 and sys.argv[1] == '--cli':
-            crawler = SZCrawler()
+        if args and args[0] == '--cli':
+            profiler = None
+            if profile or profile_dir:
+                profiler = StageProfiler(enable_cprofile=bool(profile_dir))
+            crawler = SZCrawler(profiler=profiler, record_warc=record_warc)
             start_date = None
             end_date = None
             
             # 解析命令行参数
-            if len(sys.argv) > 2:
-                start_date = sys.argv[2]
-            if len(sys.argv) > 3:
-                end_date = sys.argv[3]
+            if len(args) > 1:
+                start_date = args[1]
+            if len(args) > 2:
+                end_date = args[2]
                 
-            crawler.run(start_date, end_date)
+            if profiler:
+                profiler.start()
+            try:
+                if replay_path:
+                    crawler.run_replay(replay_path, start_date, end_date)
+                elif daemon:
+                    def handle_stop(signum, frame):
+                        crawler.stop_flag = True
+                    signal.signal(signal.SIGINT, handle_stop)
+                    signal.signal(signal.SIGTERM, handle_stop)
+                    crawler.run_daemon()
+                elif coordinator or worker:
+                    queue = open_queue(queue_spec or CRAWLER_CONFIG['queue_url'])
+                    if coordinator:
+                        crawler.run_coordinator(queue, start_date, end_date)
+                    else:
+                        crawler.run_worker(queue, start_date, end_date)
+                else:
+                    crawler.run(start_date, end_date)
+            finally:
+                if crawler.warc_writer is not None:
+                    crawler.warc_writer.close()
+                    logger.info(f"已记录 {crawler.warc_writer.records} 个响应: {crawler.warc_writer.path}")
+                if profiler:
+                    profiler.stop()
+                    print(profiler.report())
+                    if profile_dir:
+                        for kind, path in profiler.dump(profile_dir).items():
+                            print(f"性能分析文件 ({kind}): {path}")
         else:
             print("请使用命令行模式运行：")
-            print("python crawler.py --cli [开始日期] [结束日期]")
+            print("python crawler.py --cli [开始日期] [结束日期] [--profile] [--profile-dir 目录] [--log-level 级别]")
+            print("                   [--coordinator | --worker] [--queue 队列地址] [--daemon]")
+            print("                   [--record | --replay WARC文件或目录]")
             print("日期格式：YYYY-MM-DD")
+            print("--profile: 输出各阶段及各站点耗时汇总")
+            print("--profile-dir: 同时写入cProfile统计(pstats)和火焰图折叠栈文件")
+            print("--log-level: 日志级别（DEBUG/INFO/WARNING/ERROR），DEBUG时输出每条匹配的新闻")
+            print("--coordinator: 多机协作的协调节点，写入任务、参与爬取并合并输出")
+            print("--worker: 多机协作的工作节点，从共享队列领取任务")
+            print("--queue: 队列地址，如 sqlite:///共享目录/queue.db 或 redis://host:6379/0")
+            print("--daemon: 守护模式，按各站点更新频率自适应重爬，Ctrl+C停止")
+            print("--record: 将原始响应记录为WARC文件（目录见配置warc_dir）")
+            print("--replay: 从WARC文件离线回放解析，不访问网络")
             sys.exit(1)
     except Exception as e:
         logger.error(f"程序运行出错: {str(e)}", exc_info=True)
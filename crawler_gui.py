@@ -1,5 +1,127 @@
-# 预留GUI实现
+"""
+爬虫图形界面
+在后台线程中运行SZCrawler，通过进度事件流刷新界面：Tk主循环定时取出订阅缓冲区中的事件，
+爬取线程只负责发布事件，不会因界面刷新而变慢，也不会从非Tk线程调用界面
+"""
+
+import threading
+import tkinter as tk
+from tkinter import ttk
+
+from config import CRAWLER_CONFIG
+from log_manager import setup_logging
+from progress import (ProgressStream, RUN_FINISHED, SITE_STARTED, SITE_FINISHED, MATCH_FOUND,
+                      RETRY)
+
+MAX_LOG_LINES = 1000
+POLL_INTERVAL_MS = 100
+
+
+def _format_seconds(seconds):
+    if seconds is None:
+        return '--'
+    minutes, seconds = divmod(int(seconds), 60)
+    return f"{minutes}分{seconds:02d}秒"
+
 
 class SZCrawlerGUI:
     def __init__(self, root):
-        pass 
\ No newline at end of file
+        self.root = root
+        self.root.title('思政新闻爬虫')
+        self.progress = ProgressStream(maxsize=500)
+        self.crawler = None
+
+        form = ttk.Frame(root, padding=8)
+        form.pack(fill=tk.X)
+        ttk.Label(form, text='开始日期').pack(side=tk.LEFT)
+        self.start_date = ttk.Entry(form, width=12)
+        self.start_date.pack(side=tk.LEFT, padx=4)
+        ttk.Label(form, text='结束日期').pack(side=tk.LEFT)
+        self.end_date = ttk.Entry(form, width=12)
+        self.end_date.pack(side=tk.LEFT, padx=4)
+        self.start_button = ttk.Button(form, text='开始', command=self.start)
+        self.start_button.pack(side=tk.LEFT, padx=4)
+        self.stop_button = ttk.Button(form, text='停止', command=self.stop, state=tk.DISABLED)
+        self.stop_button.pack(side=tk.LEFT)
+
+        self.bar = ttk.Progressbar(root, mode='determinate')
+        self.bar.pack(fill=tk.X, padx=8)
+        self.status = ttk.Label(root, text='就绪', padding=(8, 4))
+        self.status.pack(fill=tk.X)
+        self.log = tk.Listbox(root, height=20)
+        self.log.pack(fill=tk.BOTH, expand=True, padx=8, pady=(0, 8))
+
+    def start(self):
+        """在后台线程中开始爬取"""
+        from crawler import SZCrawler
+
+        self.crawler = SZCrawler(progress=self.progress)
+        subscription = self.progress.subscribe()
+        self.start_button.config(state=tk.DISABLED)
+        self.stop_button.config(state=tk.NORMAL)
+        self.log.delete(0, tk.END)
+        start_date = self.start_date.get().strip() or None
+        end_date = self.end_date.get().strip() or None
+        threading.Thread(target=self._run, args=(start_date, end_date), daemon=True).start()
+        self._poll(subscription)
+
+    def stop(self):
+        """请求停止爬取"""
+        if self.crawler is not None:
+            self.crawler.stop()
+            self.status.config(text='正在停止...')
+
+    def _run(self, start_date, end_date):
+        try:
+            self.crawler.run(start_date, end_date)
+        except Exception as e:
+            self.progress.emit(RUN_FINISHED, error=str(e))
+
+    def _poll(self, subscription):
+        """在Tk主循环中取出已到达的事件，运行结束前每隔POLL_INTERVAL_MS毫秒再次检查"""
+        for event in subscription.drain():
+            self._on_event(event)
+            if event.kind == RUN_FINISHED:
+                self.progress.unsubscribe(subscription)
+                return
+        if subscription.closed:
+            return
+        self.root.after(POLL_INTERVAL_MS, self._poll, subscription)
+
+    def _on_event(self, event):
+        if event.sites_total:
+            self.bar.config(maximum=event.sites_total, value=event.sites_done)
+        self.status.config(text=(
+            f"站点 {event.sites_done}/{event.sites_total or '-'}  页面 {event.pages}  "
+            f"匹配 {event.matches}  {event.pages_per_second:.1f} 页/秒  "
+            f"预计剩余 {_format_seconds(event.eta_seconds)}"))
+
+        line = None
+        if event.kind == SITE_STARTED:
+            line = f"开始爬取: {event.site}"
+        elif event.kind == SITE_FINISHED:
+            line = f"完成: {event.site}（{event.detail.get('matches', 0)} 条）"
+        elif event.kind == MATCH_FOUND:
+            line = f"  找到: {event.detail.get('title')}"
+        elif event.kind == RETRY:
+            line = f"  重试: {event.url}（第 {event.detail.get('attempt')} 次）"
+        elif event.kind == RUN_FINISHED:
+            line = f"结束: {event.detail.get('error') or '共 %d 条新闻' % event.matches}"
+            self.start_button.config(state=tk.NORMAL)
+            self.stop_button.config(state=tk.DISABLED)
+        if line:
+            self.log.insert(tk.END, line)
+            if self.log.size() > MAX_LOG_LINES:
+                self.log.delete(0)
+            self.log.see(tk.END)
+
+
+def main():
+    setup_logging(CRAWLER_CONFIG.get('log_level', 'INFO'))
+    root = tk.Tk()
+    SZCrawlerGUI(root)
+    root.mainloop()
+
+
+if __name__ == "__main__":
+    main()
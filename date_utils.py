@@ -0,0 +1,24 @@
+"""
+日期工具模块
+解析站点地图、RSS/Atom和爬取结果中格式各异的日期：ISO 8601、RFC 822以及带时区偏移的写法，
+逐个值解析，不依赖同一批数据使用相同格式
+"""
+
+from datetime import date, datetime
+from typing import Optional
+
+from dateutil.parser import parse as parse_date
+
+
+def to_date(value) -> Optional[date]:
+    """将字符串或日期对象转换为date，无法解析时返回None"""
+    if not value:
+        return None
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    try:
+        return parse_date(value.strip(), fuzzy=True).date()
+    except (ValueError, OverflowError):
+        return None
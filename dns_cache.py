@@ -0,0 +1,304 @@
+"""
+DNS解析缓存模块
+各站点是不同的*.gov.cn域名，省内解析器有时需要数秒才能响应。DNSCache在进程内缓存解析结果：
+    - 安装dnspython时按记录的TTL过期，否则使用配置的默认TTL（系统解析接口不提供TTL）
+    - 同一主机同时只发出一次查询，其他线程等待其结果
+    - 解析失败时短时间缓存失败结果；已有过期记录时继续使用旧地址
+    - prefetch在启动时并行解析全部主机
+连接层通过mount_dns_cache（requests/urllib3）和CachedDNSBackend（httpx/httpcore）使用缓存，
+只替换建立TCP连接时使用的地址，Host头、SNI和证书校验仍使用原主机名。
+"""
+
+import ipaddress
+import logging
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import requests
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import ConnectTimeoutError, NameResolutionError, NewConnectionError
+
+try:
+    import dns.exception
+    import dns.resolver
+except ImportError:  # dnspython为可选依赖，未安装时使用系统解析器
+    dns = None
+
+try:
+    import anyio
+    import httpcore
+except ImportError:  # 仅httpx传输层需要
+    httpcore = None
+
+logger = logging.getLogger(__name__)
+
+
+def system_lookup(host: str) -> Tuple[List[str], Optional[int]]:
+    """使用系统解析器（getaddrinfo）解析，返回(地址列表, None)，系统接口不提供TTL"""
+    infos = socket.getaddrinfo(host, None, proto=socket.IPPROTO_TCP)
+    return list(dict.fromkeys(info[4][0] for info in infos)), None
+
+
+def dnspython_lookup(host: str) -> Tuple[List[str], Optional[int]]:
+    """使用dnspython解析，返回(地址列表, TTL秒数)
+
+    优先查询A记录，没有时查询AAAA记录；DNS查询没有结果时交给系统解析器（hosts文件等）
+    """
+    for rdtype in ('A', 'AAAA'):
+        try:
+            answer = dns.resolver.resolve(host, rdtype)
+        except dns.resolver.NoAnswer:
+            continue
+        except dns.exception.DNSException:
+            break
+        return [record.address for record in answer], answer.rrset.ttl
+    return system_lookup(host)
+
+
+def _is_ip(host: str) -> bool:
+    try:
+        ipaddress.ip_address(host)
+        return True
+    except ValueError:
+        return False
+
+
+class _Entry(NamedTuple):
+    addresses: List[str]
+    expires_at: float
+    error: Optional[tuple] = None  # 失败时为socket.gaierror的参数
+
+
+class DNSCache:
+    """线程安全的DNS解析缓存"""
+
+    def __init__(self, default_ttl: float = 300, negative_ttl: float = 30, max_ttl: float = 86400,
+                 lookup: Optional[Callable[[str], Tuple[List[str], Optional[int]]]] = None,
+                 on_lookup: Optional[Callable[[str, float, Optional[Exception]], None]] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        """初始化缓存
+
+        Args:
+            default_ttl: 解析结果未带TTL时的有效期（秒）
+            negative_ttl: 解析失败结果的有效期（秒）
+            max_ttl: TTL上限（秒）
+            lookup: 解析函数，返回(地址列表, TTL或None)；默认安装dnspython时使用dnspython
+            on_lookup: 每次实际查询后调用，参数为(主机名, 耗时秒数, 异常或None)
+            clock: 时间函数（测试用）
+        """
+        self.default_ttl = default_ttl
+        self.negative_ttl = negative_ttl
+        self.max_ttl = max_ttl
+        self.lookup = lookup or (dnspython_lookup if dns is not None else system_lookup)
+        self.on_lookup = on_lookup
+        self.clock = clock
+        self.timings: Dict[str, float] = {}  # 每个主机最近一次查询的耗时
+        self.hits = 0
+        self.lookups = 0
+        self._entries: Dict[str, _Entry] = {}
+        self._pending: Dict[str, threading.Event] = {}
+        self._lock = threading.Lock()
+
+    def cached(self, host: str) -> Optional[List[str]]:
+        """返回未过期的缓存地址，不发出查询；没有时返回None"""
+        if _is_ip(host):
+            return [host]
+        key = host.lower().rstrip('.')
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and not entry.error and entry.expires_at > self.clock():
+                self.hits += 1
+                return entry.addresses
+        return None
+
+    def resolve(self, host: str) -> List[str]:
+        """解析主机名
+
+        Args:
+            host: 主机名或IP地址
+
+        Returns:
+            List[str]: IP地址列表
+
+        Raises:
+            socket.gaierror: 解析失败（包括缓存的失败结果）
+        """
+        if _is_ip(host):
+            return [host]
+
+        key = host.lower().rstrip('.')
+        while True:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None and entry.expires_at > self.clock():
+                    self.hits += 1
+                    if entry.error:
+                        raise socket.gaierror(*entry.error)
+                    return entry.addresses
+                pending = self._pending.get(key)
+                if pending is None:
+                    pending = self._pending[key] = threading.Event()
+                    break
+            # 其他线程正在查询同一主机
+            pending.wait()
+
+        try:
+            return self._refresh(key, entry)
+        finally:
+            with self._lock:
+                del self._pending[key]
+            pending.set()
+
+    def _refresh(self, key: str, stale: Optional[_Entry]) -> List[str]:
+        """发出查询并更新缓存"""
+        start = time.perf_counter()
+        error = None
+        try:
+            addresses, ttl = self.lookup(key)
+            if not addresses:
+                raise socket.gaierror(socket.EAI_NONAME, f"没有地址记录: {key}")
+        except OSError as e:
+            error = e
+        elapsed = time.perf_counter() - start
+        self.timings[key] = elapsed
+        if self.on_lookup is not None:
+            self.on_lookup(key, elapsed, error)
+
+        with self._lock:
+            self.lookups += 1
+            now = self.clock()
+            if error is None:
+                ttl = self.default_ttl if ttl is None else min(ttl, self.max_ttl)
+                self._entries[key] = _Entry(addresses, now + ttl)
+                return addresses
+            if stale is not None and not stale.error:
+                logger.warning(f"DNS解析失败，继续使用过期的地址: {key}, 错误: {str(error)}")
+                self._entries[key] = _Entry(stale.addresses, now + self.negative_ttl)
+                return stale.addresses
+            args = error.args if isinstance(error, socket.gaierror) else (socket.EAI_FAIL, str(error))
+            self._entries[key] = _Entry([], now + self.negative_ttl, args)
+        raise socket.gaierror(*args)
+
+    def _prefetch_one(self, host):
+        start = time.perf_counter()
+        try:
+            self.resolve(host)
+        except OSError:
+            pass
+        return time.perf_counter() - start
+
+    def prefetch(self, hosts: Iterable[str], max_workers: int = 16,
+                 timeout: Optional[float] = None) -> Dict[str, Optional[float]]:
+        """并行解析一组主机名
+
+        超过timeout仍未完成的查询在后台继续，完成后照常写入缓存
+
+        Args:
+            hosts: 主机名（IP地址会被忽略）
+            max_workers: 最大并发查询数
+            timeout: 最长等待秒数，None表示等待全部完成
+
+        Returns:
+            Dict[str, Optional[float]]: 主机名到解析耗时的映射，超时未完成的为None
+        """
+        hosts = list(dict.fromkeys(host.lower().rstrip('.') for host in hosts
+                                   if host and not _is_ip(host)))
+        if not hosts:
+            return {}
+        executor = ThreadPoolExecutor(max_workers=min(max_workers, len(hosts)),
+                                      thread_name_prefix='dns-prefetch')
+        futures = {executor.submit(self._prefetch_one, host): host for host in hosts}
+        done, _ = wait(futures, timeout)
+        executor.shutdown(wait=False)
+        return {host: future.result() if future in done else None for future, host in futures.items()}
+
+
+class _CachedDNSConnectionMixin:
+    """建立连接时使用缓存的地址，依次尝试各地址"""
+
+    dns_cache: DNSCache = None
+
+    def _new_conn(self):
+        host = self._dns_host
+        try:
+            addresses = self.dns_cache.resolve(host)
+        except socket.gaierror as e:
+            raise NameResolutionError(self.host, self, e) from e
+        error = None
+        for address in addresses:
+            # 只在建立TCP连接期间替换，SNI和证书校验在此之后使用原主机名
+            self._dns_host = address
+            try:
+                return super()._new_conn()
+            except (NewConnectionError, ConnectTimeoutError) as e:
+                error = e
+            finally:
+                self._dns_host = host
+        raise error
+
+
+class DNSCacheAdapter(requests.adapters.HTTPAdapter):
+    """使用DNS缓存建立连接的requests适配器"""
+
+    def __init__(self, dns_cache: DNSCache, **kwargs):
+        self.dns_cache = dns_cache
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        attrs = {'dns_cache': self.dns_cache}
+        http_connection = type('CachedHTTPConnection', (_CachedDNSConnectionMixin, HTTPConnection), attrs)
+        https_connection = type('CachedHTTPSConnection', (_CachedDNSConnectionMixin, HTTPSConnection), attrs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': type('CachedHTTPConnectionPool', (HTTPConnectionPool,),
+                         {'ConnectionCls': http_connection}),
+            'https': type('CachedHTTPSConnectionPool', (HTTPSConnectionPool,),
+                          {'ConnectionCls': https_connection}),
+        }
+
+
+def mount_dns_cache(session: requests.Session, dns_cache: DNSCache):
+    """为会话的http和https连接挂载DNS缓存"""
+    adapter = DNSCacheAdapter(dns_cache)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+
+
+if httpcore is not None:
+    class CachedDNSBackend(httpcore.AsyncNetworkBackend):
+        """httpcore网络后端：使用DNS缓存的地址建立连接
+
+        缓存未命中时在工作线程中查询，不阻塞事件循环
+        """
+
+        def __init__(self, dns_cache: DNSCache, backend=None):
+            self.dns_cache = dns_cache
+            self.backend = backend or httpcore.AnyIOBackend()
+
+        async def connect_tcp(self, host, port, timeout=None, local_address=None, socket_options=None):
+            addresses = self.dns_cache.cached(host)
+            if addresses is None:
+                try:
+                    addresses = await anyio.to_thread.run_sync(self.dns_cache.resolve, host)
+                except socket.gaierror as e:
+                    raise httpcore.ConnectError(str(e)) from e
+            error = None
+            for address in addresses:
+                try:
+                    return await self.backend.connect_tcp(address, port, timeout, local_address,
+                                                          socket_options)
+                except (httpcore.ConnectError, httpcore.ConnectTimeout) as e:
+                    error = e
+            raise error
+
+        async def connect_unix_socket(self, path, timeout=None, socket_options=None):
+            return await self.backend.connect_unix_socket(path, timeout, socket_options)
+
+        async def sleep(self, seconds):
+            await self.backend.sleep(seconds)
+else:
+    CachedDNSBackend = None
@@ -0,0 +1,310 @@
+"""
+订阅源发现模块
+探测站点的sitemap.xml和RSS/Atom订阅源并缓存探测结果，
+使用增量XML解析流式读取条目，按发布日期过滤后再决定是否抓取正文
+"""
+
+import json
+import logging
+import os
+import time
+import xml.etree.ElementTree as ET
+from typing import Dict, Iterator, List, Optional
+from urllib.parse import urljoin
+
+from date_utils import to_date
+from fetch_policy import byte_cap
+
+logger = logging.getLogger(__name__)
+
+# 常见的订阅源和站点地图路径
+WELL_KNOWN_PATHS = ('sitemap.xml', 'sitemap_index.xml', 'rss.xml', 'rss', 'feed')
+
+# 根元素名称到订阅源类型的映射
+FEED_TYPES = {'urlset': 'sitemap', 'sitemapindex': 'sitemap', 'rss': 'rss',
+              'rdf': 'rss', 'feed': 'atom'}
+
+CHUNK_SIZE = 16 * 1024
+PROBE_BYTES = 64 * 1024
+
+
+def _local_name(tag: str) -> str:
+    """去除XML命名空间，返回小写的本地元素名"""
+    return tag.rsplit('}', 1)[-1].lower()
+
+
+class FeedEntryParser:
+    """sitemap/RSS/Atom增量解析器
+
+    已处理的条目元素会被清空并从父元素中移除，树中只保留尚未结束的元素，
+    内存占用与文件大小无关。
+    """
+
+    def __init__(self):
+        self._parser = ET.XMLPullParser(events=('start', 'end'))
+        self._stack = []
+        self.root = None
+
+    def feed(self, chunk: bytes) -> Iterator[Dict[str, Optional[str]]]:
+        """输入一个字节块，产出其中已完成的条目"""
+        self._parser.feed(chunk)
+        return self._drain()
+
+    def close(self) -> Iterator[Dict[str, Optional[str]]]:
+        """结束输入，产出剩余的条目"""
+        self._parser.close()
+        return self._drain()
+
+    def _drain(self) -> Iterator[Dict[str, Optional[str]]]:
+        """取出解析器中已完成的条目元素"""
+        for event, element in self._parser.read_events():
+            if event == 'start':
+                if self.root is None:
+                    self.root = element
+                self._stack.append(element)
+                continue
+            self._stack.pop()
+            if _local_name(element.tag) in ('url', 'sitemap', 'item', 'entry'):
+                entry = _entry_fields(element)
+                element.clear()
+                if self._stack:
+                    self._stack[-1].remove(element)
+                yield entry
+
+
+def iter_feed_entries(chunks) -> Iterator[Dict[str, Optional[str]]]:
+    """增量解析sitemap/RSS/Atom，逐条产出条目
+
+    已处理的元素会立即清除并从树中移除，内存占用与文件大小无关。
+
+    Args:
+        chunks: 字节块迭代器（如response.iter_content()）
+
+    Yields:
+        Dict: {'kind': 'url'|'sitemap'|'item', 'loc', 'lastmod', 'title'}
+              sitemap条目无标题，title为None
+    """
+    parser = FeedEntryParser()
+    for chunk in chunks:
+        if not chunk:
+            continue
+        yield from parser.feed(chunk)
+    yield from parser.close()
+
+
+def _entry_fields(element) -> Dict[str, Optional[str]]:
+    """将条目元素转换为字典"""
+    name = _local_name(element.tag)
+
+    fields = {}
+    for child in element:
+        child_name = _local_name(child.tag)
+        if child_name == 'link' and child.get('href'):
+            fields.setdefault('link', child.get('href'))
+        elif child.text:
+            fields.setdefault(child_name, child.text.strip())
+
+    if name in ('url', 'sitemap'):
+        return {'kind': name, 'loc': fields.get('loc'),
+                'lastmod': fields.get('lastmod'), 'title': None}
+    return {'kind': 'item', 'loc': fields.get('link'),
+            'lastmod': (fields.get('pubdate') or fields.get('date')
+                        or fields.get('updated') or fields.get('published')),
+            'title': fields.get('title', '')}
+
+
+class FeedDiscovery:
+    """订阅源探测与读取
+
+    每个站点只探测一次，探测结果（包括“无订阅源”）缓存到JSON文件，
+    在有效期内不会重复探测。
+    """
+
+    def __init__(self, session, get_headers, cache_file: Optional[str] = None,
+                 ttl_days: float = 7, timeout: float = 10, max_depth: int = 2, robots=None,
+                 caps: Optional[Dict[str, int]] = None, throttle=None):
+        """初始化订阅源探测器
+
+        Args:
+            session: requests.Session
+            get_headers: 根据URL生成请求头的函数
+            cache_file: 探测结果缓存文件，None表示只在内存中缓存
+            ttl_days: 探测结果有效期（天）
+            timeout: 请求超时时间（秒）
+            max_depth: 站点地图索引的最大递归深度
+            robots: 可选的RobotsCache，提供时复用其缓存的Sitemap声明并跳过禁止抓取的地址
+            caps: 各内容类型的最大下载字节数，默认使用fetch_policy.DEFAULT_BYTE_CAPS
+            throttle: 可选的HostThrottle，提供时每次请求前按主机的请求间隔等待
+        """
+        self.session = session
+        self.get_headers = get_headers
+        self.cache_file = cache_file
+        self.ttl = ttl_days * 86400
+        self.timeout = timeout
+        self.max_depth = max_depth
+        self.robots = robots
+        self.caps = caps
+        self.throttle = throttle
+        self.cache = self._load_cache()
+
+    def _load_cache(self) -> Dict[str, Dict]:
+        if self.cache_file and os.path.exists(self.cache_file):
+            try:
+                with open(self.cache_file, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"读取订阅源缓存失败: {self.cache_file}, 错误: {str(e)}")
+        return {}
+
+    def save_cache(self):
+        """将探测结果写入缓存文件"""
+        if not self.cache_file:
+            return
+        directory = os.path.dirname(self.cache_file)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        with open(self.cache_file, 'w', encoding='utf-8') as f:
+            json.dump(self.cache, f, ensure_ascii=False, indent=2)
+
+    def _open(self, url):
+        """以流式方式请求URL，失败时返回None"""
+        if self.throttle is not None:
+            self.throttle.wait(url)
+        try:
+            response = self.session.get(url, headers=self.get_headers(url),
+                                        timeout=self.timeout, stream=True)
+            if response.status_code != 200:
+                response.close()
+                return None
+            return response
+        except Exception as e:
+            logger.debug("请求订阅源失败: %s, 错误: %s", url, e)
+            return None
+
+    def _iter_chunks(self, response, url: str) -> Iterator[bytes]:
+        """读取响应体，超过该内容类型的字节上限时截断"""
+        limit = byte_cap(response.headers.get('Content-Type'), self.caps)
+        received = 0
+        for chunk in response.iter_content(CHUNK_SIZE):
+            if received + len(chunk) > limit:
+                yield chunk[:limit - received]
+                logger.warning(f"订阅源超过 {limit} 字节上限，已截断: {url}")
+                return
+            received += len(chunk)
+            yield chunk
+
+    def _candidates(self, site_url: str) -> List[str]:
+        """生成候选订阅源地址：robots.txt中声明的Sitemap优先，其次为常见路径"""
+        candidates = []
+        if self.robots is not None:
+            candidates.extend(self.robots.sitemaps(site_url))
+        else:
+            response = self._open(urljoin(site_url, '/robots.txt'))
+            if response is not None:
+                with response:
+                    for line in response.iter_lines(decode_unicode=True):
+                        if line and line.lower().startswith('sitemap:'):
+                            candidates.append(line.split(':', 1)[1].strip())
+        for path in WELL_KNOWN_PATHS:
+            url = urljoin(site_url, path)
+            if url not in candidates:
+                candidates.append(url)
+        if self.robots is not None:
+            candidates = [url for url in candidates if self.robots.allowed(url)]
+        return candidates
+
+    def _feed_type(self, url: str) -> Optional[str]:
+        """读取开头部分判断是否为订阅源，返回类型或None"""
+        response = self._open(url)
+        if response is None:
+            return None
+        parser = ET.XMLPullParser(events=('start',))
+        received = 0
+        with response:
+            try:
+                for chunk in self._iter_chunks(response, url):
+                    parser.feed(chunk)
+                    for _, element in parser.read_events():
+                        return FEED_TYPES.get(_local_name(element.tag))
+                    received += len(chunk)
+                    if received >= PROBE_BYTES:
+                        break
+            except ET.ParseError:
+                return None
+        return None
+
+    def discover(self, site_url: str) -> List[Dict[str, str]]:
+        """获取站点的订阅源列表（带缓存）
+
+        Args:
+            site_url: 站点首页URL
+
+        Returns:
+            List[Dict[str, str]]: [{'url': 订阅源地址, 'type': 'sitemap'|'rss'|'atom'}]
+        """
+        cached = self.cache.get(site_url)
+        if cached and time.time() - cached['checked_at'] < self.ttl:
+            return cached['feeds']
+
+        feeds = []
+        for url in self._candidates(site_url):
+            feed_type = self._feed_type(url)
+            if feed_type:
+                feeds.append({'url': url, 'type': feed_type})
+        # 站点地图与RSS内容重复，发现RSS时只使用RSS（自带标题，无需抓取正文）
+        if any(feed['type'] != 'sitemap' for feed in feeds):
+            feeds = [feed for feed in feeds if feed['type'] != 'sitemap']
+
+        self.cache[site_url] = {'feeds': feeds, 'checked_at': time.time()}
+        self.save_cache()
+        logger.info(f"订阅源探测完成: {site_url}, 发现 {len(feeds)} 个订阅源")
+        return feeds
+
+    def iter_entries(self, feed_url: str, start_date, end_date, depth: int = 0,
+                     stats: Optional[Dict[str, int]] = None) -> Iterator[Dict[str, Optional[str]]]:
+        """流式读取订阅源，产出发布日期在范围内的条目
+
+        站点地图索引会按子地图的lastmod过滤后递归读取；
+        没有日期的站点地图条目无法过滤，跳过并计入stats['undated']，RSS/Atom条目则保留。
+        能够判断是否在日期范围内的条目计入stats['usable']，订阅源获取失败时两者都不增加，
+        调用方据此判断订阅源是否可用。
+
+        Args:
+            feed_url: 订阅源地址
+            start_date: 开始日期（含）
+            end_date: 结束日期（含）
+            depth: 当前递归深度
+            stats: 可选的计数字典，累计'usable'和'undated'
+
+        Yields:
+            Dict: 条目，见iter_feed_entries
+        """
+        if stats is None:
+            stats = {}
+        start, end = to_date(start_date), to_date(end_date)
+        response = self._open(feed_url)
+        if response is None:
+            return
+
+        undated = 0
+        with response:
+            try:
+                for entry in iter_feed_entries(self._iter_chunks(response, feed_url)):
+                    if not entry['loc']:
+                        continue
+                    published = to_date(entry['lastmod'])
+                    if entry['kind'] == 'sitemap':
+                        if depth < self.max_depth and (published is None or published >= start):
+                            yield from self.iter_entries(entry['loc'], start, end, depth + 1, stats)
+                        continue
+                    if published is None and entry['kind'] != 'item':
+                        undated += 1
+                        continue
+                    stats['usable'] = stats.get('usable', 0) + 1
+                    if published is None or start <= published <= end:
+                        yield entry
+            except ET.ParseError as e:
+                logger.warning(f"解析订阅源失败: {feed_url}, 错误: {str(e)}")
+        if undated:
+            stats['undated'] = stats.get('undated', 0) + undated
+            logger.warning(f"站点地图 {feed_url} 中有 {undated} 条没有日期的条目，无法按日期过滤，已跳过")
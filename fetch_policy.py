@@ -0,0 +1,70 @@
+"""
+抓取策略模块
+按扩展名或Content-Type识别二进制附件，并按内容类型限制响应体大小
+"""
+
+import os
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+# 视为附件、不下载正文的扩展名
+BINARY_EXTENSIONS = frozenset({
+    '.pdf', '.doc', '.docx', '.xls', '.xlsx', '.ppt', '.pptx', '.wps', '.et',
+    '.zip', '.rar', '.7z', '.gz', '.tar', '.exe', '.apk',
+    '.jpg', '.jpeg', '.png', '.gif', '.bmp', '.webp',
+    '.mp3', '.mp4', '.avi', '.flv', '.wmv', '.mov',
+})
+
+# 视为文本、需要下载正文的Content-Type
+TEXT_CONTENT_TYPES = ('text/', 'application/xhtml+xml', 'application/xml',
+                      'application/rss+xml', 'application/atom+xml', 'application/json')
+
+MB = 1024 * 1024
+
+# 各内容类型的最大下载字节数，未列出的类型使用default
+DEFAULT_BYTE_CAPS = {
+    'text/html': 5 * MB,
+    'application/xhtml+xml': 5 * MB,
+    'application/xml': 20 * MB,
+    'text/xml': 20 * MB,
+    'default': 2 * MB,
+}
+
+
+def _mime_type(content_type: Optional[str]) -> str:
+    """从Content-Type头中取出小写的MIME类型"""
+    if not content_type:
+        return ''
+    return content_type.split(';', 1)[0].strip().lower()
+
+
+def url_extension(url: str) -> str:
+    """返回URL路径的小写扩展名（含点），无扩展名时返回空字符串"""
+    return os.path.splitext(urlsplit(url).path)[1].lower()
+
+
+def is_binary_url(url: str) -> bool:
+    """根据扩展名判断URL是否指向二进制附件"""
+    return url_extension(url) in BINARY_EXTENSIONS
+
+
+def is_binary_content_type(content_type: Optional[str]) -> bool:
+    """根据Content-Type判断响应是否为二进制内容，缺失时视为文本"""
+    mime = _mime_type(content_type)
+    if not mime:
+        return False
+    return not mime.startswith(TEXT_CONTENT_TYPES)
+
+
+def byte_cap(content_type: Optional[str], caps: Optional[Dict[str, int]] = None) -> int:
+    """获取指定内容类型的最大下载字节数
+
+    Args:
+        content_type: Content-Type响应头
+        caps: 自定义上限配置，默认使用DEFAULT_BYTE_CAPS
+
+    Returns:
+        int: 最大字节数
+    """
+    caps = caps or DEFAULT_BYTE_CAPS
+    return caps.get(_mime_type(content_type), caps.get('default', DEFAULT_BYTE_CAPS['default']))
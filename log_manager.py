@@ -0,0 +1,100 @@
+"""
+日志管理模块
+通过QueueHandler/QueueListener将日志格式化和文件/终端输出移到后台线程，
+爬取线程只负责入队，不会因日志I/O阻塞
+"""
+
+import atexit
+import copy
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional, Union
+
+LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+
+_listener: Optional[QueueListener] = None
+_queue_handler: Optional[QueueHandler] = None
+
+
+class _DeferredQueueHandler(QueueHandler):
+    """只合并消息参数、不做格式化的队列处理器
+
+    标准QueueHandler会在调用线程中完成格式化（含时间字符串），
+    这里仅合并msg与args，格式化交给后台线程中的处理器完成。
+    """
+
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+def _parse_level(level: Union[int, str, None]) -> int:
+    """将日志级别名称或数值转换为数值"""
+    if level is None:
+        return logging.INFO
+    if isinstance(level, int):
+        return level
+    value = logging.getLevelName(str(level).upper())
+    if not isinstance(value, int):
+        raise ValueError(f"无效的日志级别: {level}")
+    return value
+
+
+def setup_logging(level: Union[int, str, None] = None,
+                  log_file: Optional[str] = 'crawler.log') -> QueueListener:
+    """配置后台日志输出，由程序入口调用（导入模块时不会配置）
+
+    只在根日志器上添加本模块的队列处理器，不移除其他处理器（如pytest或宿主程序安装的处理器）；
+    重复调用时会停止旧的后台线程、移除旧的队列处理器并按新参数重新配置。
+
+    Args:
+        level: 日志级别，如'INFO'、'DEBUG'
+        log_file: 日志文件路径，None表示只输出到终端
+
+    Returns:
+        QueueListener: 后台日志监听器
+    """
+    global _listener, _queue_handler
+    stop_logging()
+
+    formatter = logging.Formatter(LOG_FORMAT)
+    handlers = []
+    if log_file:
+        handlers.append(logging.FileHandler(log_file, encoding='utf-8', mode='w'))
+    handlers.append(logging.StreamHandler())
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    log_queue = queue.SimpleQueue()
+    root = logging.getLogger()
+    _queue_handler = _DeferredQueueHandler(log_queue)
+    root.addHandler(_queue_handler)
+    root.setLevel(_parse_level(level))
+
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    return _listener
+
+
+def set_level(level: Union[int, str]) -> None:
+    """调整日志详细程度"""
+    logging.getLogger().setLevel(_parse_level(level))
+
+
+def stop_logging() -> None:
+    """移除队列处理器、停止后台日志线程，并将队列中剩余日志写出"""
+    global _listener, _queue_handler
+    if _queue_handler is not None:
+        logging.getLogger().removeHandler(_queue_handler)
+        _queue_handler = None
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+atexit.register(stop_logging)
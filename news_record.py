@@ -0,0 +1,105 @@
+"""
+新闻结果记录模块
+NewsLink 使用__slots__保存单条结果：来源名称驻留（同一来源共享一个字符串对象），
+爬取时间保存为整数时间戳，只在输出时格式化；序列化边界（工作队列、JSON Lines、Parquet归档）
+通过to_dict/from_dict与字典互转。
+"""
+
+import sys
+from datetime import datetime
+from functools import lru_cache
+from itertools import groupby
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+TIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+@lru_cache(maxsize=4096)
+def format_timestamp(timestamp: int) -> str:
+    """将整数时间戳格式化为本地时间字符串（同一页面的结果共享时间戳，缓存格式化结果）"""
+    return datetime.fromtimestamp(timestamp).strftime(TIME_FORMAT)
+
+
+def parse_timestamp(value: str) -> int:
+    """将本地时间字符串解析为整数时间戳"""
+    return int(datetime.strptime(value, TIME_FORMAT).timestamp())
+
+
+class NewsLink:
+    """一条匹配的新闻链接"""
+
+    __slots__ = ('source', 'title', 'url', 'crawl_ts', 'publish_date')
+
+    def __init__(self, source: str, title: str, url: str, crawl_ts: int,
+                 publish_date: Optional[str] = None):
+        """初始化记录
+
+        Args:
+            source: 来源站点名称
+            title: 新闻标题
+            url: 新闻链接
+            crawl_ts: 爬取时间（Unix时间戳，秒）
+            publish_date: 发布日期（订阅源提供时）
+        """
+        self.source = sys.intern(source)
+        self.title = title
+        self.url = url
+        self.crawl_ts = crawl_ts
+        self.publish_date = publish_date
+
+    @property
+    def crawl_time(self) -> str:
+        """格式化的爬取时间"""
+        return format_timestamp(self.crawl_ts)
+
+    def to_dict(self) -> Dict[str, Optional[str]]:
+        """转换为字典，字段与此前的结果字典一致"""
+        data = {'source': self.source, 'title': self.title, 'url': self.url,
+                'crawl_time': self.crawl_time}
+        if self.publish_date is not None:
+            data['publish_date'] = self.publish_date
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'NewsLink':
+        """由to_dict生成的字典还原记录"""
+        return cls(data['source'], data['title'], data['url'],
+                   parse_timestamp(data['crawl_time']), data.get('publish_date'))
+
+    def __eq__(self, other):
+        if not isinstance(other, NewsLink):
+            return NotImplemented
+        return all(getattr(self, slot) == getattr(other, slot) for slot in self.__slots__)
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"NewsLink(source={self.source!r}, title={self.title!r}, url={self.url!r}, " \
+               f"crawl_time={self.crawl_time!r})"
+
+
+def group_by_source(news_links: List[NewsLink]) -> Iterator[Tuple[str, int, Iterable[NewsLink]]]:
+    """按来源分组，来源顺序与首次出现的顺序一致
+
+    结果通常已按站点连续排列，此时直接在原列表上分组；否则只对引用做一次稳定排序，不复制记录
+
+    Yields:
+        (来源名称, 条数, 该来源的记录迭代器)
+    """
+    first_index = {}
+    counts = {}
+    contiguous = True
+    previous = None
+    for index, link in enumerate(news_links):
+        source = link.source
+        if source is not previous and source != previous:
+            if source in first_index:
+                contiguous = False
+            else:
+                first_index[source] = index
+                counts[source] = 0
+            previous = source
+        counts[source] += 1
+    ordered = news_links if contiguous else sorted(news_links, key=lambda link: first_index[link.source])
+    for source, links in groupby(ordered, key=lambda link: link.source):
+        yield source, counts[source], links
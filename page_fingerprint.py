@@ -0,0 +1,155 @@
+"""
+列表页区域指纹模块
+对列表页中与解析结果相关的区域计算指纹：只取解析时会读取的链接（href与文字），
+按新闻容器解析的站点只取容器内的链接，广告脚本、时钟、访问计数及容器外的变化不影响指纹。指纹不变时可直接复用上次的解析结果，
+跳过BeautifulSoup解析和关键词匹配。
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+from typing import Dict, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+# 解析逻辑变化时递增，使旧指纹全部失效
+FINGERPRINT_VERSION = 3
+
+# 新闻容器的class规则，与_parse_news_links中济南/青岛站点查找容器的规则共用
+NEWS_CONTAINER_CLASS = re.compile(r'news|list|content')
+
+# 按出现顺序匹配链接和div/ul的起止标签
+_TOKEN_RE = re.compile(
+    r'<a\b([^>]*)>(.*?)</a\s*>'
+    r'|<(/?)(div|ul)\b([^>]*)>',
+    re.IGNORECASE | re.DOTALL
+)
+_CLASS_RE = re.compile(r'\bclass\s*=\s*(?:"([^"]*)"|\'([^\']*)\'|([^\s>]+))', re.IGNORECASE)
+_HREF_RE = re.compile(r'\bhref\s*=\s*(?:"([^"]*)"|\'([^\']*)\'|([^\s>]+))', re.IGNORECASE)
+_TAG_RE = re.compile(r'<[^>]+>')
+_SPACE_RE = re.compile(r'\s+')
+
+
+def slice_region(html: str, markers: Optional[Sequence[str]]) -> str:
+    """按配置的起止标记截取区域，找不到标记时返回整个页面
+
+    指纹和解析必须使用同一区域，否则区域外新增的链接既不改变指纹也不会被解析到。
+    """
+    if not markers:
+        return html
+    start_marker, end_marker = markers
+    start = html.find(start_marker)
+    if start < 0:
+        return html
+    end = html.find(end_marker, start + len(start_marker))
+    if end < 0:
+        return html[start:]
+    return html[start:end + len(end_marker)]
+
+
+def _first_group(match) -> str:
+    return next((group for group in match.groups() if group is not None), '') if match else ''
+
+
+def _is_container(attrs: str) -> bool:
+    """按class中的各个类名判断是否为新闻容器（与BeautifulSoup的class_匹配方式一致）"""
+    return any(NEWS_CONTAINER_CLASS.search(name) for name in _first_group(_CLASS_RE.search(attrs)).split())
+
+
+def region_fingerprint(html: str, markers: Optional[Sequence[str]] = None,
+                       containers: bool = False) -> str:
+    """计算列表区域指纹
+
+    Args:
+        html: 页面HTML
+        markers: 可选的(起始标记, 结束标记)，只对两者之间的原始HTML计算指纹
+        containers: 只对新闻容器（class匹配NEWS_CONTAINER_CLASS的div/ul）内的链接计算指纹，
+            与解析时只读取容器内链接的站点一致；否则对区域内的全部链接计算
+
+    Returns:
+        str: 十六进制指纹
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    # 未闭合的div/ul：(标签名, 是否为新闻容器)
+    open_tags = []
+    depth = 0
+    for match in _TOKEN_RE.finditer(slice_region(html, markers)):
+        attrs, inner, closing, tag, tag_attrs = match.groups()
+        if tag is not None:
+            if not containers:
+                continue
+            tag = tag.lower()
+            if not closing:
+                if not tag_attrs.rstrip().endswith('/'):
+                    is_container = _is_container(tag_attrs)
+                    open_tags.append((tag, is_container))
+                    depth += is_container
+                continue
+            # 结束标签关闭最近的同名标签及其中未闭合的标签
+            for i in range(len(open_tags) - 1, -1, -1):
+                if open_tags[i][0] == tag:
+                    depth -= sum(is_container for _, is_container in open_tags[i:])
+                    del open_tags[i:]
+                    break
+            continue
+        if containers and depth == 0:
+            continue
+        href = _first_group(_HREF_RE.search(attrs))
+        text = _SPACE_RE.sub('', _TAG_RE.sub('', inner))
+        digest.update(f'a:{href}\x1f{text}'.encode('utf-8', 'surrogatepass'))
+        digest.update(b'\x1e')
+    return digest.hexdigest()
+
+
+class FingerprintStore:
+    """按URL保存区域指纹及对应的解析结果"""
+
+    def __init__(self, cache_file: Optional[str] = None):
+        """初始化存储
+
+        Args:
+            cache_file: 持久化文件，None表示只在内存中保存
+        """
+        self.cache_file = cache_file
+        self.entries = self._load()
+
+    def _load(self) -> Dict[str, Dict]:
+        if self.cache_file and os.path.exists(self.cache_file):
+            try:
+                with open(self.cache_file, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"读取页面指纹缓存失败: {self.cache_file}, 错误: {str(e)}")
+        return {}
+
+    def save(self):
+        """保存到缓存文件"""
+        if not self.cache_file:
+            return
+        directory = os.path.dirname(self.cache_file)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        temp_file = self.cache_file + '.tmp'
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f, ensure_ascii=False)
+        os.replace(temp_file, self.cache_file)
+
+    def lookup(self, url: str, fingerprint: str, keyword: str) -> Optional[List[Dict]]:
+        """指纹和关键词均未变化时返回上次的解析结果，否则返回None"""
+        entry = self.entries.get(url)
+        if (entry and entry.get('version') == FINGERPRINT_VERSION
+                and entry['fingerprint'] == fingerprint and entry['keyword'] == keyword):
+            return entry['links']
+        return None
+
+    def update(self, url: str, fingerprint: str, keyword: str, links: List):
+        """记录URL的最新指纹和解析结果（NewsLink列表，不保存爬取时间）并保存"""
+        self.entries[url] = {
+            'version': FINGERPRINT_VERSION,
+            'fingerprint': fingerprint,
+            'keyword': keyword,
+            'links': [{'title': link.title, 'url': link.url} for link in links],
+        }
+        self.save()
@@ -100,7 +100,7 @@ def demo_performance_comparison():
     """演示性能对比"""
     print("\n=== 性能对比演示 ===\n")
     
-    import time
+    from benchmark import measure
     
     # 创建一个大的测试PATH
     separator = ':' if os.name == 'posix' else ';'
@@ -114,21 +114,17 @@ def demo_performance_comparison():
     
     large_path = separator.join(large_path_parts)
     
-    # 测试优化性能
+    # 测试优化性能（预热后多轮采样）
     iterations = 10
-    start_time = time.time()
-    
-    for _ in range(iterations):
-        result = optimize_path(large_path)
-    
-    end_time = time.time()
-    avg_time = (end_time - start_time) / iterations
+    stats = measure(lambda: optimize_path(large_path), repeat=iterations)
+    median_time = stats['median_ns'] / 1e9
     
     print(f"大型PATH优化性能测试:")
     print(f"  测试路径条目数: {len(large_path_parts)}")
-    print(f"  测试迭代次数: {iterations}")
-    print(f"  平均执行时间: {avg_time*1000:.2f} ms")
-    print(f"  吞吐量: {len(large_path_parts)/avg_time:.0f} 条目/秒")
+    print(f"  测试采样轮数: {iterations}")
+    print(f"  中位执行时间: {median_time*1000:.2f} ms (IQR {stats['iqr_ns']/1e6:.2f} ms)")
+    print(f"  吞吐量: {len(large_path_parts)/median_time:.0f} 条目/秒")
+    print(f"  完整场景基准测试请运行: python bench_path_optimizer.py")
 
 
 def demo_practical_usage():
@@ -0,0 +1,220 @@
+"""
+爬虫性能分析模块
+为爬取流程的各阶段提供低开销计时，并可选输出cProfile统计和火焰图折叠栈
+"""
+
+import cProfile
+import os
+import pstats
+import time
+from collections import defaultdict
+from typing import Dict, Optional
+
+
+class _StageTimer:
+    """单个阶段的计时上下文，使用__slots__降低热路径开销"""
+
+    __slots__ = ('_profiler', '_name', '_start', 'child_time')
+
+    def __init__(self, profiler, name):
+        self._profiler = profiler
+        self._name = name
+        self._start = 0.0
+        self.child_time = 0.0
+
+    def __enter__(self):
+        self._profiler._stack.append(self)
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        elapsed = time.perf_counter() - self._start
+        profiler = self._profiler
+        stack = profiler._stack
+        path = ';'.join(timer._name for timer in stack)
+        stack.pop()
+        if stack:
+            stack[-1].child_time += elapsed
+        profiler._record(self._name, path, elapsed, elapsed - self.child_time)
+        return False
+
+
+class StageProfiler:
+    """按阶段和站点统计耗时的性能分析器
+
+    用法：
+        profiler = StageProfiler(enable_cprofile=True)
+        with profiler.site('济南市教育局'):
+            with profiler.stage('fetch'):
+                ...
+        print(profiler.report())
+        profiler.dump('output/profile')
+    """
+
+    def __init__(self, enable_cprofile: bool = False):
+        """初始化性能分析器
+
+        Args:
+            enable_cprofile: 是否同时启用cProfile函数级分析
+        """
+        self.stage_totals: Dict[str, float] = defaultdict(float)
+        self.stage_self: Dict[str, float] = defaultdict(float)
+        self.stage_counts: Dict[str, int] = defaultdict(int)
+        self.site_totals: Dict[str, Dict[str, float]] = defaultdict(lambda: defaultdict(float))
+        self.collapsed: Dict[str, float] = defaultdict(float)
+        self.dns_totals: Dict[str, float] = defaultdict(float)
+        self.dns_counts: Dict[str, int] = defaultdict(int)
+        self._stack = []
+        self._site: Optional[str] = None
+        self._cprofile = cProfile.Profile() if enable_cprofile else None
+        self._started = None
+        self.wall_time = 0.0
+
+    def start(self):
+        """开始整体计时（及cProfile）"""
+        self._started = time.perf_counter()
+        if self._cprofile:
+            self._cprofile.enable()
+
+    def stop(self):
+        """结束整体计时（及cProfile）"""
+        if self._cprofile:
+            self._cprofile.disable()
+        if self._started is not None:
+            self.wall_time += time.perf_counter() - self._started
+            self._started = None
+
+    def stage(self, name: str) -> _StageTimer:
+        """返回指定阶段的计时上下文"""
+        return _StageTimer(self, name)
+
+    def site(self, name: str) -> '_SiteScope':
+        """返回站点作用域，作用域内的阶段耗时归入该站点"""
+        return _SiteScope(self, name)
+
+    def record_dns(self, host: str, seconds: float):
+        """记录一次主机名解析耗时（可在任意线程中调用，不计入阶段耗时）"""
+        self.dns_totals[host] += seconds
+        self.dns_counts[host] += 1
+
+    def _record(self, name, path, elapsed, self_time):
+        """记录一次阶段耗时"""
+        self.stage_totals[name] += elapsed
+        self.stage_self[name] += self_time
+        self.stage_counts[name] += 1
+        site = self._site or '(全局)'
+        self.site_totals[site][name] += self_time
+        self.collapsed[f'{site};{path}'] += self_time
+
+    def report(self) -> str:
+        """生成按阶段和站点的耗时汇总文本"""
+        lines = ["性能分析汇总", "=" * 50]
+        if self.wall_time:
+            lines.append(f"总耗时: {self.wall_time:.3f} s")
+
+        lines.append(f"\n{'阶段':<16}{'次数':>8}{'总耗时(s)':>12}{'自身耗时(s)':>14}{'平均(ms)':>12}")
+        for name in sorted(self.stage_totals, key=self.stage_totals.get, reverse=True):
+            count = self.stage_counts[name]
+            total = self.stage_totals[name]
+            lines.append(f"{name:<16}{count:>8}{total:>12.3f}{self.stage_self[name]:>14.3f}"
+                         f"{total / count * 1000:>12.3f}")
+
+        lines.append("\n按站点（自身耗时，秒）:")
+        for site, stages in sorted(self.site_totals.items(),
+                                   key=lambda item: sum(item[1].values()), reverse=True):
+            detail = ', '.join(f"{name}={value:.3f}" for name, value in
+                               sorted(stages.items(), key=lambda item: item[1], reverse=True))
+            lines.append(f"  {site}: {sum(stages.values()):.3f} ({detail})")
+
+        if self.dns_totals:
+            lines.append("\nDNS解析（秒）:")
+            for host in sorted(self.dns_totals, key=self.dns_totals.get, reverse=True):
+                lines.append(f"  {host}: {self.dns_totals[host]:.3f} ({self.dns_counts[host]} 次)")
+
+        return '\n'.join(lines)
+
+    def dump(self, output_dir: str) -> Dict[str, str]:
+        """将分析结果写入目录
+
+        输出文件：
+            crawler.pstats       cProfile统计（启用cProfile时）
+            crawler.collapsed    阶段级折叠栈，可直接用于flamegraph.pl/speedscope
+            crawler_funcs.collapsed  由cProfile调用关系生成的函数级折叠栈（启用cProfile时）
+
+        Args:
+            output_dir: 输出目录
+
+        Returns:
+            Dict[str, str]: 输出类型到文件路径的映射
+        """
+        if not os.path.exists(output_dir):
+            os.makedirs(output_dir)
+
+        files = {}
+        collapsed_file = os.path.join(output_dir, 'crawler.collapsed')
+        with open(collapsed_file, 'w', encoding='utf-8') as f:
+            for stack, seconds in sorted(self.collapsed.items()):
+                micros = int(seconds * 1_000_000)
+                if micros > 0:
+                    f.write(f"{stack} {micros}\n")
+        files['collapsed'] = collapsed_file
+
+        if self._cprofile:
+            pstats_file = os.path.join(output_dir, 'crawler.pstats')
+            self._cprofile.dump_stats(pstats_file)
+            files['pstats'] = pstats_file
+
+            funcs_file = os.path.join(output_dir, 'crawler_funcs.collapsed')
+            with open(funcs_file, 'w', encoding='utf-8') as f:
+                for line in _pstats_to_collapsed(pstats.Stats(self._cprofile)):
+                    f.write(line + '\n')
+            files['func_collapsed'] = funcs_file
+
+        return files
+
+
+class _SiteScope:
+    """站点作用域上下文"""
+
+    __slots__ = ('_profiler', '_name', '_previous')
+
+    def __init__(self, profiler, name):
+        self._profiler = profiler
+        self._name = name
+        self._previous = None
+
+    def __enter__(self):
+        self._previous = self._profiler._site
+        self._profiler._site = self._name
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._profiler._site = self._previous
+        return False
+
+
+def _func_label(func) -> str:
+    """将pstats函数键格式化为折叠栈中的帧名"""
+    filename, line, name = func
+    return f"{os.path.basename(filename)}:{name}:{line}".replace(';', ',').replace(' ', '_')
+
+
+def _pstats_to_collapsed(stats: pstats.Stats):
+    """由cProfile的调用关系生成两层（调用者;被调用者）折叠栈
+
+    cProfile只记录直接调用关系而非完整调用栈，因此输出为近似火焰图，
+    每个函数的自身耗时按调用者的调用耗时比例分摊。
+    """
+    for func, (_, _, tottime, cumtime, callers) in stats.stats.items():
+        micros = int(tottime * 1_000_000)
+        if micros <= 0:
+            continue
+        label = _func_label(func)
+        if not callers:
+            yield f"{label} {micros}"
+            continue
+        caller_total = sum(entry[3] for entry in callers.values()) or 1
+        for caller, entry in callers.items():
+            share = int(micros * entry[3] / caller_total)
+            if share > 0:
+                yield f"{_func_label(caller)};{label} {share}"
@@ -0,0 +1,169 @@
+"""
+爬取进度事件流模块
+爬取线程通过ProgressStream.emit发布事件（站点开始/结束、页面获取、匹配、重试），
+每个订阅者有独立的有界缓冲区，写满时丢弃最旧的事件，因此发布方从不等待消费方；
+订阅者阻塞等待新事件，无需轮询。每个事件附带累计统计、吞吐量和预计剩余时间。
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional
+
+RUN_STARTED = 'run_started'
+SITE_STARTED = 'site_started'
+SITE_FINISHED = 'site_finished'
+PAGE_FETCHED = 'page_fetched'
+MATCH_FOUND = 'match_found'
+RETRY = 'retry'
+RUN_FINISHED = 'run_finished'
+
+
+class ProgressEvent(NamedTuple):
+    """一个进度事件，统计字段为发布时的累计值"""
+    kind: str
+    timestamp: float
+    site: Optional[str]
+    url: Optional[str]
+    detail: Dict
+    sites_done: int
+    sites_total: Optional[int]
+    pages: int
+    matches: int
+    pages_per_second: float
+    eta_seconds: Optional[float]
+
+
+class Subscription:
+    """订阅者的有界事件缓冲区"""
+
+    def __init__(self, maxsize: int, notify: Optional[Callable[[], None]] = None):
+        self._events = deque(maxlen=maxsize)
+        self._condition = threading.Condition()
+        self._notify = notify
+        self.closed = False
+        self.dropped = 0
+
+    def _put(self, event: ProgressEvent):
+        with self._condition:
+            if len(self._events) == self._events.maxlen:
+                self.dropped += 1
+            self._events.append(event)
+            self._condition.notify()
+        if self._notify is not None:
+            self._notify()
+
+    def _close(self):
+        with self._condition:
+            self.closed = True
+            self._condition.notify_all()
+        if self._notify is not None:
+            self._notify()
+
+    def get(self, timeout: Optional[float] = None) -> Optional[ProgressEvent]:
+        """取出下一个事件，没有事件时阻塞等待
+
+        Args:
+            timeout: 最长等待秒数，None表示一直等待
+
+        Returns:
+            ProgressEvent: 事件；超时或事件流已关闭且缓冲区为空时返回None
+        """
+        with self._condition:
+            if not self._condition.wait_for(lambda: self._events or self.closed, timeout):
+                return None
+            return self._events.popleft() if self._events else None
+
+    def drain(self) -> List[ProgressEvent]:
+        """不等待，取出缓冲区中的全部事件"""
+        with self._condition:
+            events = list(self._events)
+            self._events.clear()
+            return events
+
+    def __iter__(self) -> Iterator[ProgressEvent]:
+        """逐个产出事件，直到事件流关闭"""
+        while True:
+            event = self.get()
+            if event is None:
+                return
+            yield event
+
+
+class ProgressStream:
+    """线程安全的进度事件流"""
+
+    def __init__(self, maxsize: int = 1000):
+        """初始化事件流
+
+        Args:
+            maxsize: 每个订阅者缓冲的最大事件数，超出时丢弃最旧的事件
+        """
+        self.maxsize = maxsize
+        self._subscribers: List[Subscription] = []
+        self._lock = threading.Lock()
+        self._reset(None)
+
+    def _reset(self, sites_total):
+        self.sites_total = sites_total
+        self.sites_done = 0
+        self.pages = 0
+        self.matches = 0
+        self.started_at = time.monotonic()
+
+    def subscribe(self, maxsize: Optional[int] = None,
+                  notify: Optional[Callable[[], None]] = None) -> Subscription:
+        """订阅事件流
+
+        Args:
+            maxsize: 缓冲区大小，默认使用事件流的设置
+            notify: 有新事件时在发布线程中调用的回调，必须立即返回（如唤醒界面线程）
+
+        Returns:
+            Subscription: 订阅
+        """
+        subscription = Subscription(maxsize or self.maxsize, notify)
+        with self._lock:
+            self._subscribers.append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        """取消订阅"""
+        with self._lock:
+            if subscription in self._subscribers:
+                self._subscribers.remove(subscription)
+        subscription._close()
+
+    def start_run(self, sites_total: Optional[int] = None):
+        """开始新一轮爬取，重置统计并发布RUN_STARTED"""
+        with self._lock:
+            self._reset(sites_total)
+        self.emit(RUN_STARTED)
+
+    def emit(self, kind: str, site: Optional[str] = None, url: Optional[str] = None, **detail):
+        """发布事件，不会阻塞等待订阅者"""
+        with self._lock:
+            if kind == PAGE_FETCHED:
+                self.pages += 1
+            elif kind == MATCH_FOUND:
+                self.matches += 1
+            elif kind == SITE_FINISHED:
+                self.sites_done += 1
+            elapsed = time.monotonic() - self.started_at
+            eta = None
+            if self.sites_total and self.sites_done:
+                remaining = max(self.sites_total - self.sites_done, 0)
+                eta = elapsed / self.sites_done * remaining
+            event = ProgressEvent(kind, time.time(), site, url, detail, self.sites_done,
+                                  self.sites_total, self.pages, self.matches,
+                                  self.pages / elapsed if elapsed > 0 else 0.0, eta)
+            subscribers = list(self._subscribers)
+        for subscription in subscribers:
+            subscription._put(event)
+
+    def close(self):
+        """关闭事件流，唤醒所有等待中的订阅者"""
+        with self._lock:
+            subscribers, self._subscribers = self._subscribers, []
+        for subscription in subscribers:
+            subscription._close()
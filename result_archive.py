@@ -0,0 +1,110 @@
+"""
+爬取结果归档模块
+将结果按爬取日期和来源分区写入Parquet数据集，字符串列使用字典编码，
+每次写入生成新文件，可反复追加；查询时只读取所需的分区和列
+"""
+
+import os
+import uuid
+from typing import Iterable, List, Optional
+
+import pandas as pd
+
+from date_utils import to_date
+
+try:
+    import pyarrow  # noqa: F401  pandas读写Parquet所需的引擎
+except ImportError:  # pyarrow为可选依赖
+    pyarrow = None
+
+PARTITION_COLS = ['crawl_date', 'source']
+COLUMNS = ['source', 'title', 'url', 'publish_date', 'crawl_time', 'keywords']
+
+
+class ResultArchive:
+    """Parquet结果归档
+
+    目录结构：
+        archive/crawl_date=2025-06-06/source=济南市教育局/part-<uuid>-0.parquet
+    """
+
+    def __init__(self, root: str):
+        """初始化归档
+
+        Args:
+            root: 归档根目录
+        """
+        if pyarrow is None:
+            raise ImportError("使用Parquet归档需要安装pyarrow: pip install pyarrow")
+        self.root = root
+
+    def append(self, news_links: Iterable[dict], keywords: Optional[str] = None) -> int:
+        """追加一批结果
+
+        Args:
+            news_links: 新闻链接字典列表
+            keywords: 匹配的关键词，多个关键词以逗号分隔
+
+        Returns:
+            int: 写入的行数
+        """
+        frame = pd.DataFrame(list(news_links))
+        if frame.empty:
+            return 0
+
+        if 'publish_date' not in frame:
+            frame['publish_date'] = None
+        frame['crawl_time'] = pd.to_datetime(frame['crawl_time'])
+        # 来源不同的日期格式（ISO、RFC 822等）和时区混在同一列，逐个解析
+        publish_dates = [None if pd.isna(value) else to_date(value)
+                         for value in frame['publish_date']]
+        frame['publish_date'] = pd.to_datetime(pd.Series(publish_dates, index=frame.index)).dt.date
+        frame['crawl_date'] = frame['crawl_time'].dt.strftime('%Y-%m-%d')
+        frame['keywords'] = keywords or ''
+        frame = frame[COLUMNS + ['crawl_date']]
+        # 重复值多的列使用分类类型，写入时对应Parquet字典编码
+        for column in ('source', 'keywords'):
+            frame[column] = frame[column].astype('category')
+
+        frame.to_parquet(
+            self.root,
+            engine='pyarrow',
+            index=False,
+            partition_cols=PARTITION_COLS,
+            basename_template=f'part-{uuid.uuid4().hex}-{{i}}.parquet',
+            use_dictionary=['source', 'title', 'url', 'keywords'],
+            compression='zstd',
+        )
+        return len(frame)
+
+    def query(self, columns: Optional[List[str]] = None, start_date: Optional[str] = None,
+              end_date: Optional[str] = None, sources: Optional[List[str]] = None) -> pd.DataFrame:
+        """按爬取日期和来源读取归档，只扫描匹配的分区和所需的列
+
+        Args:
+            columns: 需要的列，默认全部
+            start_date: 开始爬取日期（含），格式YYYY-MM-DD
+            end_date: 结束爬取日期（含）
+            sources: 来源名称列表
+
+        Returns:
+            pd.DataFrame: 查询结果
+        """
+        if not os.path.exists(self.root):
+            return pd.DataFrame(columns=columns or COLUMNS)
+
+        filters = []
+        if start_date:
+            filters.append(('crawl_date', '>=', start_date))
+        if end_date:
+            filters.append(('crawl_date', '<=', end_date))
+        if sources:
+            filters.append(('source', 'in', list(sources)))
+
+        return pd.read_parquet(
+            self.root,
+            engine='pyarrow',
+            columns=columns,
+            filters=filters or None,
+            partitioning='hive',
+        )
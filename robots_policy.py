@@ -0,0 +1,207 @@
+"""
+robots.txt 处理模块
+按主机获取并缓存robots.txt（带有效期，缓存持久化到JSON文件），判断URL是否允许抓取，
+并按各主机声明的Crawl-delay/Request-rate安排请求间隔：间隔按主机分别计算，
+切换到其他主机时无需等待。
+
+获取失败时的处理：
+    4xx（含404）   视为没有限制
+    5xx/网络错误   沿用过期的缓存；没有缓存时暂时视为没有限制，retry_seconds后重新获取
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional
+from urllib.parse import urlsplit
+from urllib.robotparser import RobotFileParser
+
+logger = logging.getLogger(__name__)
+
+# 只读取robots.txt开头的部分，与主流搜索引擎的上限一致
+MAX_ROBOTS_BYTES = 500 * 1024
+
+
+def _origin(url: str) -> str:
+    parts = urlsplit(url)
+    return f"{parts.scheme or 'http'}://{parts.netloc.lower()}"
+
+
+class RobotsCache:
+    """按主机缓存的robots.txt规则"""
+
+    def __init__(self, session, get_headers, user_agent: str = 'SZCrawler',
+                 ttl_hours: float = 24, timeout: float = 10, cache_file: Optional[str] = None,
+                 max_crawl_delay: float = 60, retry_seconds: float = 600,
+                 throttle: Optional['HostThrottle'] = None, fetch_delay: float = 0):
+        """初始化缓存
+
+        Args:
+            session: requests.Session
+            get_headers: 根据URL生成请求头的函数
+            user_agent: 匹配robots.txt规则时使用的爬虫名称
+            ttl_hours: 缓存有效期（小时）
+            timeout: 请求超时时间（秒）
+            cache_file: 缓存文件，None表示只在内存中缓存
+            max_crawl_delay: Crawl-delay上限（秒），避免个别站点的过大设置使爬取停滞
+            retry_seconds: 获取失败且没有缓存时，重新获取前的等待时间（秒）
+            throttle: 可选的按主机限速器，获取robots.txt前同样按主机等待
+            fetch_delay: 获取robots.txt时占用的请求间隔（秒），此时该主机的Crawl-delay尚未知
+        """
+        self.session = session
+        self.get_headers = get_headers
+        self.user_agent = user_agent
+        self.ttl = ttl_hours * 3600
+        self.timeout = timeout
+        self.cache_file = cache_file
+        self.max_crawl_delay = max_crawl_delay
+        self.retry_seconds = retry_seconds
+        self.throttle = throttle
+        self.fetch_delay = fetch_delay
+        self.cache = self._load_cache()
+        self._parsers: Dict[str, RobotFileParser] = {}
+        self._lock = threading.Lock()
+
+    def _load_cache(self) -> Dict[str, Dict]:
+        if self.cache_file and os.path.exists(self.cache_file):
+            try:
+                with open(self.cache_file, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"读取robots.txt缓存失败: {self.cache_file}, 错误: {str(e)}")
+        return {}
+
+    def save_cache(self):
+        """将缓存写入文件"""
+        if not self.cache_file:
+            return
+        directory = os.path.dirname(self.cache_file)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        temp_file = self.cache_file + '.tmp'
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            json.dump(self.cache, f, ensure_ascii=False)
+        os.replace(temp_file, self.cache_file)
+
+    def _download(self, origin: str) -> Dict:
+        """获取robots.txt，返回缓存条目"""
+        url = origin + '/robots.txt'
+        if self.throttle is not None:
+            # 显式指定间隔，不能通过delay_for查询本主机尚未获取的Crawl-delay
+            self.throttle.wait(url, self.fetch_delay)
+        now = time.time()
+        try:
+            with self.session.get(url, headers=self.get_headers(url), timeout=self.timeout,
+                                  stream=True) as response:
+                if response.status_code >= 500:
+                    raise OSError(f"{response.status_code} 错误")
+                text = ''
+                if response.status_code < 400:
+                    body = b''
+                    for chunk in response.iter_content(64 * 1024):
+                        body += chunk
+                        if len(body) >= MAX_ROBOTS_BYTES:
+                            break
+                    text = body[:MAX_ROBOTS_BYTES].decode('utf-8', errors='replace')
+                return {'status': response.status_code, 'text': text,
+                        'fetched_at': now, 'expires_at': now + self.ttl}
+        except Exception as e:
+            stale = self.cache.get(origin)
+            if stale is not None:
+                logger.warning(f"获取robots.txt失败，沿用缓存: {url}, 错误: {str(e)}")
+                return dict(stale, expires_at=now + self.retry_seconds)
+            logger.warning(f"获取robots.txt失败，暂不限制: {url}, 错误: {str(e)}")
+            return {'status': None, 'text': '', 'fetched_at': now,
+                    'expires_at': now + self.retry_seconds}
+
+    def _parser(self, url: str) -> RobotFileParser:
+        """返回URL所在主机的规则，缓存过期时重新获取"""
+        origin = _origin(url)
+        with self._lock:
+            entry = self.cache.get(origin)
+            parser = self._parsers.get(origin)
+            if entry is None or min(entry['expires_at'], entry['fetched_at'] + self.ttl) <= time.time():
+                entry = self._download(origin)
+                self.cache[origin] = entry
+                self.save_cache()
+                parser = None
+            if parser is None:
+                parser = RobotFileParser(origin + '/robots.txt')
+                parser.parse(entry['text'].splitlines())
+                self._parsers[origin] = parser
+            return parser
+
+    def allowed(self, url: str) -> bool:
+        """URL是否允许抓取"""
+        return self._parser(url).can_fetch(self.user_agent, url)
+
+    def filter_allowed(self, urls: Iterable[str]) -> List[str]:
+        """过滤掉robots.txt禁止抓取的URL"""
+        allowed = []
+        for url in urls:
+            if self.allowed(url):
+                allowed.append(url)
+            else:
+                logger.info(f"robots.txt禁止抓取，已跳过: {url}")
+        return allowed
+
+    def crawl_delay(self, url: str) -> Optional[float]:
+        """主机要求的请求间隔（秒），未声明时返回None"""
+        parser = self._parser(url)
+        delays = []
+        crawl_delay = parser.crawl_delay(self.user_agent)
+        if crawl_delay is not None:
+            delays.append(float(crawl_delay))
+        rate = parser.request_rate(self.user_agent)
+        if rate is not None and rate.requests:
+            delays.append(rate.seconds / rate.requests)
+        if not delays:
+            return None
+        return min(max(delays), self.max_crawl_delay)
+
+    def sitemaps(self, url: str) -> List[str]:
+        """robots.txt中声明的站点地图地址"""
+        return list(self._parser(url).site_maps() or [])
+
+
+class HostThrottle:
+    """按主机安排请求间隔：同一主机的相邻请求至少间隔delay_for(url)秒"""
+
+    def __init__(self, delay_for: Callable[[str], float],
+                 sleep: Callable[[float], None] = time.sleep):
+        """初始化
+
+        Args:
+            delay_for: 返回URL所在主机请求间隔（秒）的函数
+            sleep: 等待函数，可传入能被中断的实现
+        """
+        self.delay_for = delay_for
+        self.sleep = sleep
+        self._next_time: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def delay(self, url: str) -> float:
+        """URL所在主机的请求间隔（秒）"""
+        return self.delay_for(url)
+
+    def wait(self, url: str, delay: Optional[float] = None) -> float:
+        """等待至该主机允许下一次请求，返回实际等待的秒数
+
+        Args:
+            url: 请求的URL
+            delay: 本次请求之后的间隔（秒），默认为delay_for(url)
+        """
+        host = urlsplit(url).netloc.lower()
+        if delay is None:
+            delay = self.delay_for(url)
+        with self._lock:
+            now = time.monotonic()
+            ready = max(now, self._next_time.get(host, 0.0))
+            # 先占用时间槽，并发调用时各自顺延
+            self._next_time[host] = ready + delay
+        waited = ready - now
+        if waited > 0:
+            self.sleep(waited)
+        return waited
@@ -0,0 +1,169 @@
+"""
+自适应重爬调度模块
+根据各站点新增匹配新闻的频率估计其更新速率，并据此安排下次访问时间
+"""
+
+import json
+import logging
+import os
+import time
+from typing import Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class SiteState:
+    """单个站点的调度状态"""
+
+    __slots__ = ('name', 'url', 'rate', 'interval', 'last_visit', 'next_visit',
+                 'visits', 'failures', 'seen')
+
+    def __init__(self, name, url, interval, next_visit=0.0):
+        self.name = name
+        self.url = url
+        self.rate = None  # 估计的每小时新增匹配条数
+        self.interval = interval
+        self.last_visit = None
+        self.next_visit = next_visit
+        self.visits = 0
+        self.failures = 0
+        self.seen = []  # 已见过的新闻规范键（按时间先后）
+
+    def to_dict(self) -> Dict:
+        return {slot: getattr(self, slot) for slot in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'SiteState':
+        state = cls(data['name'], data['url'], data['interval'])
+        for slot in cls.__slots__:
+            if slot in data:
+                setattr(state, slot, data[slot])
+        return state
+
+
+class AdaptiveScheduler:
+    """按站点更新速率调度访问的调度器
+
+    每次访问后以指数加权移动平均更新站点的新增速率估计λ（条/小时），
+    下次访问间隔取 target_items/λ，并限制在[min_interval, max_interval]内；
+    没有新增时间隔按backoff倍数增长，访问失败时同样退避。
+    """
+
+    def __init__(self, sites: Dict[str, str], min_interval: float = 1800,
+                 max_interval: float = 86400, initial_interval: float = 3600,
+                 alpha: float = 0.3, target_items: float = 1.0, backoff: float = 1.5,
+                 state_file: Optional[str] = None, max_seen: int = 2000):
+        """初始化调度器
+
+        Args:
+            sites: 站点名称到URL的映射
+            min_interval: 最小访问间隔（秒）
+            max_interval: 最大访问间隔（秒）
+            initial_interval: 新站点的初始访问间隔（秒）
+            alpha: 速率估计的平滑系数，越大越看重最近一次访问
+            target_items: 期望每次访问平均发现的新增条数
+            backoff: 无新增或失败时的间隔增长倍数
+            state_file: 状态持久化文件，重启后继续使用已学习的速率
+            max_seen: 每个站点保留的已见新闻键数量上限
+        """
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.initial_interval = initial_interval
+        self.alpha = alpha
+        self.target_items = target_items
+        self.backoff = backoff
+        self.state_file = state_file
+        self.max_seen = max_seen
+        self.states: Dict[str, SiteState] = {}
+
+        saved = self._load_state()
+        for name, url in sites.items():
+            state = saved.get(name)
+            if state is None or state.url != url:
+                state = SiteState(name, url, initial_interval)
+            self.states[name] = state
+
+    def _load_state(self) -> Dict[str, SiteState]:
+        if not self.state_file or not os.path.exists(self.state_file):
+            return {}
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                return {item['name']: SiteState.from_dict(item) for item in json.load(f)}
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"读取调度状态失败: {self.state_file}, 错误: {str(e)}")
+            return {}
+
+    def save_state(self):
+        """保存调度状态"""
+        if not self.state_file:
+            return
+        directory = os.path.dirname(self.state_file)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        temp_file = self.state_file + '.tmp'
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            json.dump([state.to_dict() for state in self.states.values()], f, ensure_ascii=False)
+        os.replace(temp_file, self.state_file)
+
+    def _clamp(self, interval: float) -> float:
+        return min(self.max_interval, max(self.min_interval, interval))
+
+    def next_due(self) -> Optional[SiteState]:
+        """返回下次访问时间最早的站点"""
+        if not self.states:
+            return None
+        return min(self.states.values(), key=lambda state: state.next_visit)
+
+    def due_sites(self, now: Optional[float] = None) -> List[SiteState]:
+        """返回已到访问时间的站点，按到期时间排序"""
+        now = time.time() if now is None else now
+        due = [state for state in self.states.values() if state.next_visit <= now]
+        return sorted(due, key=lambda state: state.next_visit)
+
+    def record_visit(self, name: str, keys: Iterable[str],
+                     now: Optional[float] = None) -> List[str]:
+        """记录一次成功访问，更新速率估计并安排下次访问
+
+        Args:
+            name: 站点名称
+            keys: 本次访问匹配到的全部新闻规范键
+            now: 访问时间，默认当前时间
+
+        Returns:
+            List[str]: 本次新增（此前未见过）的键，首次访问时为全部键
+        """
+        now = time.time() if now is None else now
+        state = self.states[name]
+        seen = set(state.seen)
+        new_keys = []
+        for key in keys:
+            if key not in seen:
+                seen.add(key)
+                new_keys.append(key)
+
+        if state.last_visit is not None:
+            hours = max((now - state.last_visit) / 3600, 1e-6)
+            sample = len(new_keys) / hours
+            state.rate = sample if state.rate is None else (
+                self.alpha * sample + (1 - self.alpha) * state.rate)
+
+            if new_keys and state.rate > 0:
+                state.interval = self._clamp(self.target_items / state.rate * 3600)
+            else:
+                state.interval = self._clamp(state.interval * self.backoff)
+        # 首次访问只建立已见基线，不参与速率估计
+
+        state.seen = (state.seen + new_keys)[-self.max_seen:]
+        state.last_visit = now
+        state.next_visit = now + state.interval
+        state.visits += 1
+        state.failures = 0
+        return new_keys
+
+    def record_failure(self, name: str, now: Optional[float] = None):
+        """记录一次失败访问，按退避倍数推迟下次访问（不改变速率估计）"""
+        now = time.time() if now is None else now
+        state = self.states[name]
+        state.failures += 1
+        delay = self._clamp(self.min_interval * (self.backoff ** state.failures))
+        state.next_visit = now + min(delay, state.interval)
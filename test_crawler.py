@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+爬虫主流程测试
+使用本地HTTP服务器模拟教育局网站
+"""
+
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import crawler as crawler_module
+from config import CRAWLER_CONFIG
+from crawler import SZCrawler
+
+HOMEPAGE = """<html><body><div class="news-list"><ul>
+<li><a href="/art/1.html">思政课程建设推进会召开</a></li>
+<li><a href="/art/2.html">招生工作通知</a></li>
+</ul></div></body></html>""".encode('utf-8')
+
+DATELESS_SITEMAP = b"""<?xml version="1.0" encoding="UTF-8"?>
+<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+<url><loc>{site}art/1.html</loc></url>
+<url><loc>{site}art/2.html</loc></url>
+</urlset>"""
+
+DATED_SITEMAP = b"""<?xml version="1.0" encoding="UTF-8"?>
+<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+<url><loc>{site}art/1.html</loc><lastmod>2026-01-05</lastmod></url>
+<url><loc>{site}art/2.html</loc><lastmod>2026-01-06</lastmod></url>
+</urlset>"""
+
+ARTICLES = {
+    '/art/1.html': '<html><head><title>思政课程建设推进会召开</title></head></html>'.encode('utf-8'),
+    '/art/2.html': '<html><head><title>招生工作通知</title></head></html>'.encode('utf-8'),
+}
+
+
+class SiteServer:
+    """按路径返回固定内容的本地站点，记录请求路径"""
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.requested = []
+        site = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                site.requested.append(self.path)
+                body = site.pages.get(self.path)
+                if body is None:
+                    self.send_response(404)
+                    self.end_headers()
+                    return
+                content_type = 'text/html; charset=utf-8'
+                if self.path.endswith('.xml'):
+                    content_type = 'application/xml'
+                elif self.path.endswith('.txt'):
+                    content_type = 'text/plain'
+                self.send_response(200)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f'http://127.0.0.1:{self.server.server_address[1]}/'
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def crawler(tmp_path, monkeypatch):
+    for key, value in {'output_dir': str(tmp_path), 'archive_dir': None, 'dns_cache': False,
+                       'page_fingerprint': False, 'retry_times': 1, 'request_timeout': 5,
+                       'default_crawl_delay': 0}.items():
+        monkeypatch.setitem(CRAWLER_CONFIG, key, value)
+    return SZCrawler()
+
+
+def serve(pages):
+    """启动本地站点，页面中的{site}替换为站点地址"""
+    site = SiteServer(pages)
+    for path, body in pages.items():
+        pages[path] = body.replace(b'{site}', site.url.encode())
+    return site
+
+
+def test_dateless_sitemap_falls_back_to_homepage(crawler):
+    """测试站点地图条目都没有日期时回退为解析首页"""
+    site = serve({'/': HOMEPAGE,
+                  '/robots.txt': b'User-agent: *\nSitemap: {site}sitemap.xml\n',
+                  '/sitemap.xml': DATELESS_SITEMAP})
+    try:
+        news_links = crawler.crawl_website('测试教育局', site.url, '2026-01-01', '2026-01-10')
+    finally:
+        site.close()
+
+    assert crawler.feed_discovery.discover(site.url) == [
+        {'url': f'{site.url}sitemap.xml', 'type': 'sitemap'}]
+    assert [link.title for link in news_links] == ['思政课程建设推进会召开']
+    assert '/' in site.requested
+    assert '/art/1.html' not in site.requested
+
+
+def test_failed_feed_fetch_falls_back_to_homepage(crawler):
+    """测试订阅源获取失败时回退为解析首页"""
+    site = serve({'/': HOMEPAGE})
+    try:
+        crawler.feed_discovery.cache[site.url] = {
+            'feeds': [{'url': f'{site.url}rss.xml', 'type': 'rss'}], 'checked_at': 2 ** 40}
+        news_links = crawler.crawl_website('测试教育局', site.url, '2026-01-01', '2026-01-10')
+    finally:
+        site.close()
+
+    assert '/rss.xml' in site.requested
+    assert [link.title for link in news_links] == ['思政课程建设推进会召开']
+
+
+def test_record_and_replay_feed_pipeline(crawler, monkeypatch, tmp_path):
+    """测试记录模式保留订阅源流程，站点地图和文章页写入WARC后可离线回放"""
+    monkeypatch.setitem(CRAWLER_CONFIG, 'warc_dir', str(tmp_path / 'warc'))
+    site = serve(dict(ARTICLES, **{'/': HOMEPAGE,
+                                   '/robots.txt': b'User-agent: *\nSitemap: {site}sitemap.xml\n',
+                                   '/sitemap.xml': DATED_SITEMAP}))
+    recorder = SZCrawler(record_warc=True)
+    try:
+        recorded = recorder.crawl_website('测试教育局', site.url, '2026-01-01', '2026-01-10')
+    finally:
+        recorder.warc_writer.close()
+        site.close()
+    assert [link.url for link in recorded] == [f'{site.url}art/1.html']
+    assert '/' not in site.requested
+
+    monkeypatch.setattr(crawler_module, 'WEBSITES', {'测试教育局': site.url})
+    replayed = crawler.run_replay(str(tmp_path / 'warc'), '2026-01-01', '2026-01-10')
+    assert [(link.title, link.url) for link in replayed] == [(link.title, link.url) for link in recorded]
+
+
+def test_daemon_records_fetch_failure(crawler, monkeypatch):
+    """测试守护模式下首页获取失败按失败退避，而不是记为没有新内容的访问"""
+    # 取一个已关闭的本地端口，请求会立即被拒绝
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        url = f'http://127.0.0.1:{sock.getsockname()[1]}/'
+    monkeypatch.setattr(crawler_module, 'WEBSITES', {'测试教育局': url})
+    crawler.feed_discovery = None
+    crawler.robots = None
+
+    schedulers = []
+
+    class OneRoundScheduler(crawler_module.AdaptiveScheduler):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            schedulers.append(self)
+
+        def save_state(self):
+            super().save_state()
+            crawler.stop()
+
+    monkeypatch.setattr(crawler_module, 'AdaptiveScheduler', OneRoundScheduler)
+    crawler.run_daemon()
+
+    state = schedulers[0].states['测试教育局']
+    assert state.failures == 1
+    assert state.visits == 0
+    assert state.last_visit is None
@@ -0,0 +1,19 @@
+#!/usr/bin/env python3
+"""
+日期工具模块测试
+"""
+
+from datetime import date, datetime
+
+from date_utils import to_date
+
+
+def test_to_date_formats():
+    """测试ISO 8601、RFC 822、日期对象和无法解析的值"""
+    assert to_date('2026-01-01') == date(2026, 1, 1)
+    assert to_date('2026-01-01T08:00:00+08:00') == date(2026, 1, 1)
+    assert to_date('Fri, 02 Jan 2026 08:00:00 +0800') == date(2026, 1, 2)
+    assert to_date(datetime(2026, 1, 3, 12)) == date(2026, 1, 3)
+    assert to_date(date(2026, 1, 4)) == date(2026, 1, 4)
+    assert to_date('') is None
+    assert to_date('无日期') is None
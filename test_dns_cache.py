@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+DNS解析缓存模块测试
+"""
+
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from dns_cache import DNSCache, mount_dns_cache
+from transport import create_transport, install_dns_backend
+
+
+class FakeLookup:
+    def __init__(self, addresses=('127.0.0.1',), ttl=None, delay=0.0):
+        self.addresses = list(addresses)
+        self.ttl = ttl
+        self.delay = delay
+        self.calls = []
+        self.fail = False
+
+    def __call__(self, host):
+        self.calls.append(host)
+        time.sleep(self.delay)
+        if self.fail:
+            raise socket.gaierror(socket.EAI_AGAIN, 'Temporary failure in name resolution')
+        return self.addresses, self.ttl
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class EchoHostHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        body = self.headers['Host'].encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def echo_server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), EchoHostHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server.server_address[1]
+    server.shutdown()
+    server.server_close()
+
+
+def test_ttl_from_record_and_default():
+    """测试按记录TTL过期，未带TTL时使用默认值"""
+    clock = FakeClock()
+    lookup = FakeLookup(['10.0.0.1'], ttl=60)
+    cache = DNSCache(default_ttl=300, lookup=lookup, clock=clock)
+    assert cache.resolve('Edu.Jinan.gov.cn.') == ['10.0.0.1']
+    assert cache.resolve('edu.jinan.gov.cn') == ['10.0.0.1']
+    assert lookup.calls == ['edu.jinan.gov.cn']
+    clock.now += 61
+    assert cache.cached('edu.jinan.gov.cn') is None
+    cache.resolve('edu.jinan.gov.cn')
+    assert len(lookup.calls) == 2
+
+    lookup.ttl = None
+    clock.now += 61
+    cache.resolve('edu.jinan.gov.cn')
+    clock.now += 299
+    assert cache.cached('edu.jinan.gov.cn') == ['10.0.0.1']
+    assert cache.resolve('10.1.2.3') == ['10.1.2.3']
+    assert len(lookup.calls) == 3
+
+
+def test_negative_cache_and_stale_fallback():
+    """测试解析失败结果短时缓存，已有过期记录时继续使用旧地址"""
+    clock = FakeClock()
+    lookup = FakeLookup(['10.0.0.1'], ttl=60)
+    errors = []
+    cache = DNSCache(negative_ttl=30, lookup=lookup, clock=clock,
+                     on_lookup=lambda host, seconds, error: errors.append(error))
+    cache.resolve('a.gov.cn')
+    lookup.fail = True
+    clock.now += 61
+    assert cache.resolve('a.gov.cn') == ['10.0.0.1']
+    assert isinstance(errors[-1], socket.gaierror)
+
+    with pytest.raises(socket.gaierror):
+        cache.resolve('b.gov.cn')
+    with pytest.raises(socket.gaierror):
+        cache.resolve('b.gov.cn')
+    assert lookup.calls.count('b.gov.cn') == 1
+    clock.now += 31
+    lookup.fail = False
+    assert cache.resolve('b.gov.cn') == ['10.0.0.1']
+
+
+def test_concurrent_misses_share_one_lookup_and_prefetch_is_parallel():
+    """测试同一主机并发未命中时只查询一次，预解析并行进行"""
+    lookup = FakeLookup(delay=0.2)
+    cache = DNSCache(lookup=lookup)
+    threads = [threading.Thread(target=cache.resolve, args=('a.gov.cn',)) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert lookup.calls == ['a.gov.cn']
+
+    hosts = [f'site{i}.gov.cn' for i in range(8)]
+    start = time.perf_counter()
+    timings = cache.prefetch(hosts + ['site0.gov.cn', '10.0.0.1', None])
+    assert time.perf_counter() - start < 0.2 * 8 / 2
+    assert set(timings) == set(hosts)
+    assert all(seconds >= 0.2 for seconds in timings.values())
+    assert set(cache.timings) == set(hosts) | {'a.gov.cn'}
+
+    slow = DNSCache(lookup=FakeLookup(delay=0.5))
+    assert slow.prefetch(['slow.gov.cn'], timeout=0.05) == {'slow.gov.cn': None}
+
+
+def test_requests_session_connects_to_cached_address(echo_server):
+    """测试会话使用缓存的地址建立连接，Host头仍为原主机名"""
+    lookup = FakeLookup(['127.0.0.1'])
+    session = requests.Session()
+    mount_dns_cache(session, DNSCache(lookup=lookup))
+    for _ in range(2):
+        response = session.get(f'http://szcrawler-dns.test:{echo_server}/', timeout=5)
+        assert response.text == f'szcrawler-dns.test:{echo_server}'
+    assert lookup.calls == ['szcrawler-dns.test']
+
+    lookup.fail = True
+    with pytest.raises(requests.exceptions.ConnectionError):
+        session.get(f'http://unresolvable.test:{echo_server}/', timeout=5)
+
+
+def test_httpx_transport_uses_dns_cache(echo_server):
+    """测试httpx传输层使用DNS缓存"""
+    pytest.importorskip('httpx')
+    lookup = FakeLookup(['127.0.0.1'])
+    transport = create_transport('httpx', None, http2=False, dns_cache=DNSCache(lookup=lookup))
+    try:
+        urls = [(f'http://szcrawler-dns.test:{echo_server}/{i}', {}) for i in range(3)]
+        results = transport.fetch_many(urls, 5)
+        assert [result.body for result in results] == [f'szcrawler-dns.test:{echo_server}'.encode()] * 3
+        assert lookup.calls == ['szcrawler-dns.test']
+    finally:
+        transport.close()
+
+
+def test_install_dns_backend_falls_back_without_pool():
+    """测试连接池结构不符合预期时不替换网络后端，保留系统解析"""
+    pytest.importorskip('httpx')
+
+    class Transport:
+        pass
+
+    assert not install_dns_backend(Transport(), DNSCache(lookup=FakeLookup(['127.0.0.1'])))
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+订阅源发现模块测试
+"""
+
+from feed_discovery import FeedDiscovery, FeedEntryParser, iter_feed_entries
+from robots_policy import HostThrottle
+
+SITEMAP = b"""<?xml version="1.0" encoding="UTF-8"?>
+<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+<url><loc>http://x.gov.cn/art/1.html</loc><lastmod>2026-01-01</lastmod></url>
+<url><loc>http://x.gov.cn/art/2.html</loc><lastmod>2025-03-01T08:00:00+08:00</lastmod></url>
+<url><loc>http://x.gov.cn/art/3.html</loc></url>
+</urlset>"""
+
+RSS = """<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0"><channel><title>教育局</title>
+<item><title>思政课程建设</title><link>http://x.gov.cn/a.html</link><pubDate>Fri, 02 Jan 2026 08:00:00 +0800</pubDate></item>
+<item><title>旧闻</title><link>http://x.gov.cn/b.html</link><pubDate>Mon, 03 Mar 2025 08:00:00 +0800</pubDate></item>
+</channel></rss>""".encode('utf-8')
+
+
+class FakeResponse:
+    def __init__(self, body, status_code=200, headers=None):
+        self.body = body
+        self.status_code = status_code
+        self.headers = headers or {}
+
+    def iter_content(self, chunk_size=1):
+        for i in range(0, len(self.body), 7):  # 小块输入以覆盖增量解析
+            yield self.body[i:i + 7]
+
+    def iter_lines(self, decode_unicode=False):
+        yield from self.body.decode('utf-8').splitlines()
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+
+class FakeSession:
+    def __init__(self, pages):
+        self.pages = pages
+        self.requested = []
+
+    def get(self, url, **kwargs):
+        self.requested.append(url)
+        if url in self.pages:
+            return FakeResponse(self.pages[url])
+        return FakeResponse(b'', status_code=404)
+
+
+def test_iter_feed_entries_incremental():
+    """测试分块输入时增量解析站点地图和RSS"""
+    sitemap = list(iter_feed_entries(SITEMAP[i:i + 5] for i in range(0, len(SITEMAP), 5)))
+    assert [entry['loc'] for entry in sitemap] == [
+        'http://x.gov.cn/art/1.html', 'http://x.gov.cn/art/2.html', 'http://x.gov.cn/art/3.html']
+    assert sitemap[0]['title'] is None
+
+    items = list(iter_feed_entries([RSS]))
+    assert items[0]['title'] == '思政课程建设'
+    assert items[0]['loc'] == 'http://x.gov.cn/a.html'
+
+
+def test_discover_is_cached_and_prefers_rss(tmp_path):
+    """测试探测结果被缓存，且同时存在RSS与站点地图时只使用RSS"""
+    session = FakeSession({
+        'http://x.gov.cn/robots.txt': b'User-agent: *\nSitemap: http://x.gov.cn/sitemap.xml\n',
+        'http://x.gov.cn/sitemap.xml': SITEMAP,
+        'http://x.gov.cn/rss.xml': RSS,
+    })
+    cache_file = str(tmp_path / 'feeds.json')
+    discovery = FeedDiscovery(session, lambda url: {}, cache_file=cache_file)
+    feeds = discovery.discover('http://x.gov.cn/')
+    assert feeds == [{'url': 'http://x.gov.cn/rss.xml', 'type': 'rss'}]
+
+    session.requested.clear()
+    reloaded = FeedDiscovery(session, lambda url: {}, cache_file=cache_file)
+    assert reloaded.discover('http://x.gov.cn/') == feeds
+    assert session.requested == []
+
+
+def test_iter_entries_filters_by_date():
+    """测试按日期过滤条目，无日期的站点地图条目被跳过并计数"""
+    session = FakeSession({'http://x.gov.cn/sitemap.xml': SITEMAP,
+                           'http://x.gov.cn/rss.xml': RSS})
+    discovery = FeedDiscovery(session, lambda url: {})
+
+    stats = {}
+    sitemap = list(discovery.iter_entries('http://x.gov.cn/sitemap.xml', '2026-01-01', '2026-01-05',
+                                          stats=stats))
+    assert [entry['loc'] for entry in sitemap] == ['http://x.gov.cn/art/1.html']
+    assert stats == {'usable': 2, 'undated': 1}
+
+    stats = {}
+    rss = list(discovery.iter_entries('http://x.gov.cn/rss.xml', '2026-01-01', '2026-01-05',
+                                      stats=stats))
+    assert [entry['title'] for entry in rss] == ['思政课程建设']
+    assert stats == {'usable': 2}
+
+    stats = {}
+    assert list(discovery.iter_entries('http://x.gov.cn/missing.xml', '2026-01-01', '2026-01-05',
+                                       stats=stats)) == []
+    assert stats == {}
+
+
+def test_parsed_entries_are_detached_from_tree():
+    """测试已产出的条目从树中移除，根元素不会随文件增大而保留子元素"""
+    urls = ''.join(f'<url><loc>http://x.gov.cn/art/{i}.html</loc></url>' for i in range(200))
+    body = f'<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">{urls}</urlset>'.encode()
+    parser = FeedEntryParser()
+    count = 0
+    for i in range(0, len(body), 64):
+        count += len(list(parser.feed(body[i:i + 64])))
+        assert len(parser.root) <= 1
+    count += len(list(parser.close()))
+    assert count == 200
+    assert len(parser.root) == 0
+
+    parser = FeedEntryParser()
+    assert len(list(parser.feed(RSS))) + len(list(parser.close())) == 2
+    channel = parser.root[0]
+    assert [child.tag for child in channel] == ['title']
+
+
+def test_iter_entries_respects_byte_cap():
+    """测试订阅源超过字节上限时截断，只产出上限内已解析的条目"""
+    urls = ''.join(f'<url><loc>http://x.gov.cn/art/{i}.html</loc>'
+                   f'<lastmod>2026-01-02</lastmod></url>' for i in range(100))
+    body = f'<urlset>{urls}</urlset>'.encode()
+    session = FakeSession({'http://x.gov.cn/sitemap.xml': body})
+    discovery = FeedDiscovery(session, lambda url: {}, caps={'default': 1000})
+
+    entries = list(discovery.iter_entries('http://x.gov.cn/sitemap.xml', '2026-01-01', '2026-01-05'))
+    assert 0 < len(entries) < 100
+
+
+def test_discovery_waits_between_requests():
+    """测试探测和读取订阅源的每次请求都经过主机请求间隔"""
+    session = FakeSession({'http://x.gov.cn/sitemap.xml': SITEMAP})
+    waits = []
+    throttle = HostThrottle(lambda url: 5, sleep=waits.append)
+    discovery = FeedDiscovery(session, lambda url: {}, throttle=throttle)
+
+    discovery.discover('http://x.gov.cn/')
+    list(discovery.iter_entries('http://x.gov.cn/sitemap.xml', '2026-01-01', '2026-01-05'))
+    assert len(session.requested) == 7
+    # 第一次请求不等待，之后每次请求都与上一次间隔5秒
+    assert len(waits) == len(session.requested) - 1
+    assert all(wait > 4 for wait in waits)
@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+"""
+抓取策略模块测试
+"""
+
+from fetch_policy import is_binary_url, is_binary_content_type, byte_cap, DEFAULT_BYTE_CAPS
+
+
+def test_binary_url_by_extension():
+    """测试按扩展名识别附件，忽略查询参数和大小写"""
+    assert is_binary_url('http://edu.zaozhuang.gov.cn/files/通知.PDF?v=1')
+    assert is_binary_url('http://x.gov.cn/a/b.docx')
+    assert not is_binary_url('http://x.gov.cn/art/2025/6/1/art_1.html')
+    assert not is_binary_url('http://x.gov.cn/col/')
+
+
+def test_binary_content_type():
+    """测试按Content-Type识别二进制内容"""
+    assert is_binary_content_type('application/pdf')
+    assert is_binary_content_type('application/octet-stream')
+    assert not is_binary_content_type('text/html; charset=utf-8')
+    assert not is_binary_content_type('application/xml')
+    assert not is_binary_content_type(None)
+
+
+def test_byte_cap():
+    """测试按内容类型获取字节上限"""
+    assert byte_cap('text/html; charset=gbk') == DEFAULT_BYTE_CAPS['text/html']
+    assert byte_cap('application/json') == DEFAULT_BYTE_CAPS['default']
+    assert byte_cap('text/html', {'default': 10}) == 10
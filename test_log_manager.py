@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+日志管理模块测试
+"""
+
+import logging
+import queue
+
+import pytest
+
+import log_manager
+from log_manager import _DeferredQueueHandler, set_level, setup_logging, stop_logging
+
+
+@pytest.fixture
+def restore_root_level():
+    root = logging.getLogger()
+    level = root.level
+    yield root
+    root.setLevel(level)
+
+
+class CountingArg:
+    def __init__(self):
+        self.calls = 0
+
+    def __str__(self):
+        self.calls += 1
+        return '思政'
+
+
+def test_deferred_handler_merges_args_without_formatting():
+    """测试队列处理器只在入队时合并消息参数，不做格式化，也不修改原记录"""
+    log_queue = queue.SimpleQueue()
+    handler = _DeferredQueueHandler(log_queue)
+    handler.setFormatter(logging.Formatter(log_manager.LOG_FORMAT))
+    arg = CountingArg()
+    record = logging.LogRecord('test', logging.INFO, __file__, 1, '找到 %s 新闻', (arg,), None)
+
+    handler.emit(record)
+    queued = log_queue.get_nowait()
+    assert queued is not record
+    assert queued.msg == '找到 思政 新闻'
+    assert queued.args is None
+    assert not hasattr(queued, 'asctime')
+    assert record.args == (arg,)
+    assert arg.calls == 1
+
+    formatted = logging.Formatter(log_manager.LOG_FORMAT).format(queued)
+    assert formatted.endswith('INFO - 找到 思政 新闻')
+    assert arg.calls == 1
+
+
+def test_set_level_parses_names(restore_root_level):
+    """测试日志级别名称（不区分大小写）和数值"""
+    set_level('debug')
+    assert restore_root_level.level == logging.DEBUG
+    set_level(logging.WARNING)
+    assert restore_root_level.level == logging.WARNING
+    with pytest.raises(ValueError):
+        set_level('verbose')
+
+
+def test_stop_logging_flushes_and_keeps_foreign_handlers(tmp_path, restore_root_level):
+    """测试停止日志时写出剩余日志、停止后台线程，且只移除本模块安装的处理器"""
+    root = restore_root_level
+    foreign = logging.NullHandler()
+    root.addHandler(foreign)
+    log_file = tmp_path / 'crawler.log'
+    try:
+        listener = setup_logging('INFO', log_file=str(log_file))
+        handler = log_manager._queue_handler
+        assert handler in root.handlers and foreign in root.handlers
+        # 重复配置时替换而不是叠加队列处理器
+        listener = setup_logging('INFO', log_file=str(log_file))
+        assert sum(isinstance(h, _DeferredQueueHandler) for h in root.handlers) == 1
+
+        logging.getLogger('test').info('开始爬取 %s', '济南市教育局')
+        stop_logging()
+        assert listener._thread is None
+        assert log_manager._listener is None
+        assert not any(isinstance(h, _DeferredQueueHandler) for h in root.handlers)
+        assert foreign in root.handlers
+        assert '开始爬取 济南市教育局' in log_file.read_text(encoding='utf-8')
+        stop_logging()
+    finally:
+        stop_logging()
+        root.removeHandler(foreign)
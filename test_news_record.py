@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+新闻结果记录模块测试
+"""
+
+import pytest
+
+from news_record import NewsLink, group_by_source, parse_timestamp
+
+
+def test_roundtrip_and_interning():
+    """测试与字典互转，来源名称驻留"""
+    ts = parse_timestamp('2026-01-02 09:30:00')
+    link = NewsLink(''.join(['济南', '市教育局']), '思政课', 'http://a.cn/1', ts, '2026-01-01')
+    assert link.crawl_time == '2026-01-02 09:30:00'
+    data = link.to_dict()
+    assert data == {'source': '济南市教育局', 'title': '思政课', 'url': 'http://a.cn/1',
+                    'crawl_time': '2026-01-02 09:30:00', 'publish_date': '2026-01-01'}
+    restored = NewsLink.from_dict(data)
+    assert restored == link
+    assert restored.source is link.source
+    assert 'publish_date' not in NewsLink('A', 't', 'u', ts).to_dict()
+
+
+def test_slots():
+    """测试记录不带实例字典"""
+    link = NewsLink('A', 't', 'u', 0)
+    assert not hasattr(link, '__dict__')
+    with pytest.raises(AttributeError):
+        link.extra = 1
+
+
+def test_group_by_source_keeps_first_seen_order():
+    """测试分组保持来源首次出现的顺序和组内顺序"""
+    links = [NewsLink(source, f'{source}{i}', f'http://x/{source}{i}', 0)
+             for i, source in enumerate(['B', 'A', 'B', 'C', 'A'])]
+    groups = [(source, count, [link.title for link in items])
+              for source, count, items in group_by_source(links)]
+    assert groups == [('B', 2, ['B0', 'B2']), ('A', 2, ['A1', 'A4']), ('C', 1, ['C3'])]
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+列表页区域指纹模块测试
+"""
+
+from news_record import NewsLink
+from page_fingerprint import region_fingerprint, slice_region, FingerprintStore
+
+PAGE = """<html><body>
+<div class="header">访问量：{visits}</div>
+<script>var now = "{clock}";</script>
+<div class="news-list"><ul>
+<li><a href="/art/1.html">思政课建设推进会召开</a></li>
+<li><a href='/art/2.html'><span>教育</span>工作简报</a></li>
+</ul></div>
+</body></html>"""
+
+
+def test_fingerprint_ignores_volatile_content():
+    """测试访问计数、时钟等非链接内容的变化不影响指纹"""
+    first = region_fingerprint(PAGE.format(visits=100, clock='10:00'))
+    second = region_fingerprint(PAGE.format(visits=101, clock='10:05'))
+    assert first == second
+
+
+def test_fingerprint_detects_list_changes():
+    """测试链接文字、链接地址变化，或链接移出新闻容器时指纹改变"""
+    page = PAGE.format(visits=1, clock='')
+    base = region_fingerprint(page)
+    assert region_fingerprint(page.replace('推进会', '座谈会')) != base
+    assert region_fingerprint(page.replace('/art/2.html', '/art/3.html')) != base
+
+    in_containers = region_fingerprint(page, containers=True)
+    assert region_fingerprint(page.replace('news-list', 'news-box'), containers=True) == in_containers
+    assert region_fingerprint(page.replace('news-list', 'sidebar'), containers=True) != in_containers
+
+
+def test_container_fingerprint_ignores_links_outside_containers():
+    """测试按容器解析时，容器外的链接变化不影响指纹，容器内的变化仍然生效"""
+    page = PAGE.format(visits=1, clock='').replace(
+        '<div class="header">', '<div class="header"><a href="/ad?id=7">思政广告</a>')
+    base = region_fingerprint(page, containers=True)
+    assert region_fingerprint(page.replace('/ad?id=7', '/ad?id=8'), containers=True) == base
+    assert region_fingerprint(page.replace('</body>', '<ul class="nav"><li><a href="/x">思政</a></li></ul></body>'),
+                              containers=True) == base
+    assert region_fingerprint(page.replace('/ad?id=7', '/ad?id=8')) != region_fingerprint(page)
+
+    assert region_fingerprint(page.replace('推进会', '座谈会'), containers=True) != base
+    nested = page.replace('<li><a href="/art/1.html">',
+                          '<li><div class="box"><a href="/art/4.html">思政</a></div><a href="/art/1.html">')
+    assert region_fingerprint(nested, containers=True) != base
+
+
+def test_fingerprint_with_markers():
+    """测试配置起止标记后只对区域内容计算指纹"""
+    markers = ('<div class="news-list">', '</div>')
+    page = PAGE.format(visits=1, clock='')
+    with_ad = page.replace('<div class="header">', '<div class="header"><a href="/ad?id=7">广告</a>')
+    assert region_fingerprint(page, markers) == region_fingerprint(with_ad, markers)
+    assert region_fingerprint(page) != region_fingerprint(with_ad)
+
+
+def test_region_outside_changes_are_not_parsed():
+    """测试区域外新增的关键词链接既不改变指纹，也不在解析的区域内"""
+    markers = ('<div class="news-list">', '</div>')
+    page = PAGE.format(visits=1, clock='')
+    changed = page.replace('<div class="header">', '<div class="header"><a href="/art/9.html">思政要闻</a>')
+    region = slice_region(changed, markers)
+    assert '/art/9.html' not in region
+    assert region == slice_region(page, markers)
+    assert region_fingerprint(changed, markers) == region_fingerprint(region)
+    assert slice_region(changed, None) == changed
+
+
+def test_store_roundtrip(tmp_path):
+    """测试指纹存储的命中、失效和持久化"""
+    cache_file = str(tmp_path / 'fingerprints.json')
+    store = FingerprintStore(cache_file)
+    links = [NewsLink('济南市教育局', '思政课', 'http://a.cn/1', 1767225600)]
+    assert store.lookup('http://a.cn/', 'f1', '思政') is None
+
+    store.update('http://a.cn/', 'f1', '思政', links)
+    reloaded = FingerprintStore(cache_file)
+    assert reloaded.lookup('http://a.cn/', 'f1', '思政') == [{'title': '思政课', 'url': 'http://a.cn/1'}]
+    assert reloaded.lookup('http://a.cn/', 'f2', '思政') is None
+    assert reloaded.lookup('http://a.cn/', 'f1', '德育') is None
@@ -4,10 +4,11 @@ PATH优化器测试模块
 测试optimize_path()函数的性能和正确性
 """
 
-import time
 import os
 from typing import List
 from path_manager import PathOptimizer, optimize_path
+from benchmark import (measure, summarize, compare_to_baseline, missing_scenarios, format_ns,
+                       save_results, check_baseline)
 
 
 def create_test_path(size: int = 100) -> str:
@@ -57,18 +58,14 @@ def benchmark_optimize_path():
         # 创建测试数据
         test_path = create_test_path(size)
         
-        # 测试优化性能
-        start_time = time.time()
-        optimized_path = optimize_path(test_path)
-        end_time = time.time()
+        # 测试优化性能（预热后多轮采样，取中位数）
+        stats = measure(lambda: optimize_path(test_path), repeat=7, warmup=1)
         
         # 分析结果
         optimizer = PathOptimizer()
         analysis = optimizer.analyze_path(test_path)
         
-        execution_time = (end_time - start_time) * 1000  # 转换为毫秒
-        
-        print(f"  执行时间: {execution_time:.2f} ms")
+        print(f"  执行时间: {format_ns(stats['median_ns'])} (IQR {format_ns(stats['iqr_ns'])})")
         print(f"  原始条目: {analysis['original_count']}")
         print(f"  优化后条目: {analysis['valid_count']}")
         print(f"  去重数量: {analysis['duplicates_removed']}")
@@ -199,24 +196,50 @@ def performance_comparison():
     
     test_path = create_test_path(500)
     
-    # 测试优化版本
-    start_time = time.time()
-    for _ in range(10):
-        optimized_result = optimize_path(test_path)
-    optimized_time = time.time() - start_time
+    optimized_result = optimize_path(test_path)
+    naive_result = naive_optimize_path(test_path)
     
-    # 测试朴素版本
-    start_time = time.time()
-    for _ in range(10):
-        naive_result = naive_optimize_path(test_path)
-    naive_time = time.time() - start_time
+    optimized_stats = measure(lambda: optimize_path(test_path), repeat=10)
+    naive_stats = measure(lambda: naive_optimize_path(test_path), repeat=10)
+    optimized_time = optimized_stats['median_ns']
+    naive_time = naive_stats['median_ns']
     
-    print(f"优化版本平均时间: {(optimized_time/10)*1000:.2f} ms")
-    print(f"朴素版本平均时间: {(naive_time/10)*1000:.2f} ms")
+    print(f"优化版本中位时间: {format_ns(optimized_time)}")
+    print(f"朴素版本中位时间: {format_ns(naive_time)}")
     print(f"性能提升: {naive_time/optimized_time:.2f}x")
     print(f"结果一致性: {optimized_result == naive_result}")
 
 
+def test_benchmark_statistics():
+    """测试基准统计与基线对比逻辑"""
+    stats = summarize([10, 20, 30, 40, 50])
+    assert stats['median_ns'] == 30
+    assert stats['q1_ns'] == 20
+    assert stats['q3_ns'] == 40
+    assert stats['iqr_ns'] == 20
+    
+    baseline = {'a': summarize([100, 100, 100]), 'b': summarize([100, 100, 100])}
+    current = {'a': summarize([110, 110, 110]), 'b': summarize([150, 150, 150]),
+               'c': summarize([1, 1, 1])}
+    regressions = compare_to_baseline(current, baseline, threshold=0.2)
+    assert [item['scenario'] for item in regressions] == ['b']
+    assert regressions[0]['ratio'] == 1.5
+    assert missing_scenarios(current, baseline) == ['c']
+
+
+
+def test_check_baseline_exit_codes(tmp_path):
+    """测试基线文件不存在或缺少场景时返回非零状态码，而不是静默通过"""
+    baseline_file = str(tmp_path / 'baseline.json')
+    current = {'a': summarize([100, 100, 100])}
+    assert check_baseline(current, baseline_file) == 2
+
+    save_results({'a': summarize([100, 100, 100])}, baseline_file)
+    assert check_baseline(current, baseline_file) == 0
+    assert check_baseline({'a': summarize([200, 200, 200])}, baseline_file) == 1
+    assert check_baseline(dict(current, b=summarize([1, 1, 1])), baseline_file) == 2
+
+
 def main():
     """主测试函数"""
     print("开始PATH优化器完整测试")
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+爬虫性能分析模块测试
+"""
+
+import os
+import time
+from profiler import StageProfiler
+
+
+def test_stage_profiler_self_time_and_sites(tmp_path):
+    """测试嵌套阶段的自身耗时、站点归属和折叠栈输出"""
+    profiler = StageProfiler()
+    profiler.start()
+    with profiler.site('站点A'):
+        with profiler.stage('match'):
+            with profiler.stage('normalize'):
+                time.sleep(0.01)
+    with profiler.stage('save'):
+        pass
+    profiler.record_dns('edu.jinan.gov.cn', 0.5)
+    profiler.stop()
+
+    assert profiler.stage_counts['match'] == 1
+    assert profiler.stage_totals['match'] >= profiler.stage_totals['normalize']
+    assert profiler.stage_self['match'] < profiler.stage_self['normalize']
+    assert set(profiler.site_totals['站点A']) == {'match', 'normalize'}
+    assert 'save' in profiler.site_totals['(全局)']
+    assert '站点A' in profiler.report()
+    assert 'edu.jinan.gov.cn: 0.500 (1 次)' in profiler.report()
+
+    files = profiler.dump(str(tmp_path))
+    assert 'pstats' not in files
+    with open(files['collapsed'], encoding='utf-8') as f:
+        stacks = [line.rsplit(' ', 1)[0] for line in f]
+    assert '站点A;match;normalize' in stacks
+
+
+def test_stage_profiler_cprofile_output(tmp_path):
+    """测试启用cProfile时输出pstats和函数级折叠栈"""
+    profiler = StageProfiler(enable_cprofile=True)
+    profiler.start()
+    sorted(range(10000), key=lambda x: -x)
+    profiler.stop()
+
+    files = profiler.dump(str(tmp_path))
+    assert os.path.exists(files['pstats'])
+    assert os.path.exists(files['func_collapsed'])
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+进度事件流模块测试
+"""
+
+import threading
+import time
+
+from progress import (ProgressStream, RUN_STARTED, SITE_STARTED, SITE_FINISHED, PAGE_FETCHED,
+                      MATCH_FOUND)
+
+
+def test_statistics_and_eta():
+    """测试累计统计、吞吐量和预计剩余时间"""
+    stream = ProgressStream()
+    subscription = stream.subscribe()
+    stream.start_run(sites_total=4)
+    stream.emit(SITE_STARTED, 'A', 'http://a.cn/')
+    stream.emit(PAGE_FETCHED, url='http://a.cn/')
+    stream.emit(MATCH_FOUND, 'A', 'http://a.cn/1', title='思政课')
+    time.sleep(0.01)
+    stream.emit(SITE_FINISHED, 'A', 'http://a.cn/', matches=1)
+
+    events = subscription.drain()
+    assert [event.kind for event in events] == [RUN_STARTED, SITE_STARTED, PAGE_FETCHED,
+                                                MATCH_FOUND, SITE_FINISHED]
+    last = events[-1]
+    assert (last.sites_done, last.sites_total, last.pages, last.matches) == (1, 4, 1, 1)
+    assert last.detail == {'matches': 1}
+    assert last.pages_per_second > 0
+    assert last.eta_seconds is not None and last.eta_seconds > 0
+    assert events[0].eta_seconds is None
+
+
+def test_bounded_buffer_never_blocks_publisher():
+    """测试订阅者不消费时发布方不阻塞，缓冲区丢弃最旧的事件"""
+    stream = ProgressStream(maxsize=10)
+    subscription = stream.subscribe()
+    start = time.perf_counter()
+    for i in range(10000):
+        stream.emit(PAGE_FETCHED, url=f'http://a.cn/{i}')
+    assert time.perf_counter() - start < 5
+    events = subscription.drain()
+    assert len(events) == 10
+    assert subscription.dropped == 9990
+    assert events[-1].url == 'http://a.cn/9999'
+
+
+def test_blocking_consumer_and_close():
+    """测试订阅者阻塞等待新事件，事件流关闭后迭代结束"""
+    stream = ProgressStream()
+    subscription = stream.subscribe()
+    received = []
+    consumer = threading.Thread(target=lambda: received.extend(subscription))
+    consumer.start()
+    stream.emit(SITE_STARTED, 'A')
+    stream.emit(SITE_FINISHED, 'A')
+    stream.close()
+    consumer.join(timeout=5)
+    assert not consumer.is_alive()
+    assert [event.kind for event in received] == [SITE_STARTED, SITE_FINISHED]
+    assert subscription.get(timeout=0.01) is None
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Parquet结果归档测试
+"""
+
+from datetime import date
+
+import pytest
+
+pytest.importorskip('pyarrow')
+
+import pandas as pd
+
+from result_archive import ResultArchive
+
+LINKS = [
+    {'source': '济南市教育局', 'title': '思政课程', 'url': 'http://a.gov.cn/1',
+     'crawl_time': '2026-01-01 10:00:00'},
+    {'source': '青岛市教育局', 'title': '思政活动', 'url': 'http://b.gov.cn/1',
+     'crawl_time': '2026-01-02 09:00:00', 'publish_date': '2026-01-01'},
+]
+
+
+def test_append_and_query_partitions(tmp_path):
+    """测试多次追加写入，以及按日期、来源和列读取"""
+    archive = ResultArchive(str(tmp_path / 'archive'))
+    assert archive.append(LINKS, '思政') == 2
+    assert archive.append(LINKS[:1], '思政') == 1
+    assert archive.append([], '思政') == 0
+
+    assert len(archive.query()) == 3
+
+    frame = archive.query(columns=['title', 'url'], start_date='2026-01-02')
+    assert list(frame.columns) == ['title', 'url']
+    assert frame['url'].tolist() == ['http://b.gov.cn/1']
+
+    frame = archive.query(columns=['url', 'keywords'], sources=['济南市教育局'])
+    assert frame['url'].tolist() == ['http://a.gov.cn/1', 'http://a.gov.cn/1']
+    assert set(frame['keywords']) == {'思政'}
+
+
+def test_query_missing_archive(tmp_path):
+    """测试归档目录不存在时返回空结果"""
+    archive = ResultArchive(str(tmp_path / 'missing'))
+    assert archive.query(columns=['url']).empty
+
+
+def test_append_parses_mixed_date_formats(tmp_path):
+    """测试站点地图和RSS的日期格式、时区混在同一批次时逐个解析"""
+    links = [
+        {'source': '济南市教育局', 'title': '站点地图', 'url': 'http://a.gov.cn/1',
+         'crawl_time': '2026-01-03 10:00:00', 'publish_date': '2026-01-01T08:00:00+08:00'},
+        {'source': '济南市教育局', 'title': 'RSS', 'url': 'http://a.gov.cn/2',
+         'crawl_time': '2026-01-03 10:00:00', 'publish_date': 'Fri, 02 Jan 2026 08:00:00 +0000'},
+        {'source': '济南市教育局', 'title': '无日期', 'url': 'http://a.gov.cn/3',
+         'crawl_time': '2026-01-03 10:00:00'},
+    ]
+    archive = ResultArchive(str(tmp_path / 'archive'))
+    assert archive.append(links, '思政') == 3
+
+    frame = archive.query(columns=['url', 'publish_date']).sort_values('url')
+    assert list(frame['publish_date'])[:2] == [date(2026, 1, 1), date(2026, 1, 2)]
+    assert pd.isna(list(frame['publish_date'])[2])
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+robots.txt处理模块测试
+"""
+
+import requests
+
+from robots_policy import RobotsCache, HostThrottle
+from test_feed_discovery import FakeResponse, FakeSession
+
+ROBOTS = b"""User-agent: Baiduspider
+Disallow:
+
+User-agent: *
+Disallow: /admin/
+Crawl-delay: 5
+
+Sitemap: http://slow.gov.cn/sitemap.xml
+"""
+
+
+def _headers(url):
+    return {}
+
+
+def test_rules_and_crawl_delay():
+    """测试禁止规则、Crawl-delay和Sitemap声明，同一主机只请求一次"""
+    session = FakeSession({'http://slow.gov.cn/robots.txt': ROBOTS})
+    robots = RobotsCache(session, _headers)
+    assert robots.allowed('http://slow.gov.cn/art/1.html')
+    assert not robots.allowed('http://slow.gov.cn/admin/login')
+    assert robots.crawl_delay('http://slow.gov.cn/') == 5
+    assert robots.sitemaps('http://slow.gov.cn/') == ['http://slow.gov.cn/sitemap.xml']
+    assert robots.filter_allowed(['http://slow.gov.cn/a', 'http://slow.gov.cn/admin/b']) == [
+        'http://slow.gov.cn/a']
+    assert session.requested == ['http://slow.gov.cn/robots.txt']
+
+    # 未声明的主机没有限制
+    assert robots.allowed('http://fast.gov.cn/admin/')
+    assert robots.crawl_delay('http://fast.gov.cn/') is None
+
+
+def test_cache_ttl_and_persistence(tmp_path):
+    """测试缓存持久化与过期后重新获取"""
+    cache_file = str(tmp_path / 'robots.json')
+    session = FakeSession({'http://slow.gov.cn/robots.txt': ROBOTS})
+    RobotsCache(session, _headers, cache_file=cache_file).allowed('http://slow.gov.cn/')
+
+    reloaded = RobotsCache(session, _headers, cache_file=cache_file)
+    assert not reloaded.allowed('http://slow.gov.cn/admin/')
+    assert len(session.requested) == 1
+
+    expired = RobotsCache(session, _headers, cache_file=cache_file, ttl_hours=0)
+    expired.allowed('http://slow.gov.cn/')
+    assert len(session.requested) == 2
+
+
+def test_unreachable_uses_stale_copy():
+    """测试服务器错误时沿用过期缓存，没有缓存时暂不限制"""
+    robots = RobotsCache(FakeSession({'http://slow.gov.cn/robots.txt': ROBOTS}), _headers, ttl_hours=0)
+    assert not robots.allowed('http://slow.gov.cn/admin/')
+
+    class BrokenSession:
+        def get(self, url, **kwargs):
+            if 'slow' in url:
+                return FakeResponse(b'', status_code=503)
+            raise requests.exceptions.ConnectionError('down')
+
+    robots.session = BrokenSession()
+    assert not robots.allowed('http://slow.gov.cn/admin/')
+    assert robots.allowed('http://down.gov.cn/admin/')
+
+
+def test_host_throttle():
+    """测试请求间隔按主机分别计算"""
+    waits = []
+    throttle = HostThrottle(lambda url: 5 if 'slow' in url else 0, sleep=waits.append)
+    assert throttle.wait('http://slow.gov.cn/1') == 0
+    assert throttle.wait('http://fast.gov.cn/1') == 0
+    assert throttle.wait('http://fast.gov.cn/2') == 0
+    assert throttle.wait('http://slow.gov.cn/2') > 4
+    assert len(waits) == 1
+
+
+def test_robots_download_is_throttled():
+    """测试robots.txt的获取按主机排队，之后的请求按Crawl-delay间隔"""
+    waits = []
+    session = FakeSession({'http://slow.gov.cn/robots.txt': ROBOTS})
+    robots = None
+    throttle = HostThrottle(lambda url: robots.crawl_delay(url) or 0, sleep=waits.append)
+    robots = RobotsCache(session, _headers, throttle=throttle, fetch_delay=2)
+
+    assert throttle.wait('http://slow.gov.cn/') > 1
+    assert throttle.wait('http://slow.gov.cn/art/1.html') > 4
+    assert session.requested == ['http://slow.gov.cn/robots.txt']
+    assert len(waits) == 2
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+自适应重爬调度模块测试
+"""
+
+from scheduler import AdaptiveScheduler
+
+HOUR = 3600
+
+
+def make_scheduler(**kwargs):
+    options = dict(min_interval=HOUR / 2, max_interval=24 * HOUR, initial_interval=HOUR)
+    options.update(kwargs)
+    return AdaptiveScheduler({'快站': 'http://a.gov.cn/', '慢站': 'http://b.gov.cn/'}, **options)
+
+
+def test_first_visit_builds_baseline():
+    """测试首次访问返回全部键，但不参与速率估计"""
+    scheduler = make_scheduler()
+    assert len(scheduler.due_sites(now=0)) == 2
+    assert scheduler.record_visit('快站', ['a', 'b'], now=0) == ['a', 'b']
+    state = scheduler.states['快站']
+    assert state.rate is None
+    assert state.next_visit == HOUR
+    assert [s.name for s in scheduler.due_sites(now=10)] == ['慢站']
+
+
+def test_interval_follows_change_rate():
+    """测试频繁更新的站点间隔缩短，无更新的站点间隔按退避增长且受上下限约束"""
+    scheduler = make_scheduler()
+    scheduler.record_visit('快站', ['a'], now=0)
+    scheduler.record_visit('慢站', ['x'], now=0)
+
+    # 快站每小时新增4条 -> 间隔缩短到最小值30分钟
+    assert scheduler.record_visit('快站', ['a', 'b', 'c', 'd', 'e'], now=HOUR) == ['b', 'c', 'd', 'e']
+    assert scheduler.states['快站'].interval == HOUR / 2
+
+    # 慢站没有新增 -> 1.5倍退避，最终不超过24小时
+    now = 0
+    for _ in range(20):
+        now += scheduler.states['慢站'].interval
+        assert scheduler.record_visit('慢站', ['x'], now=now) == []
+    assert scheduler.states['慢站'].interval == 24 * HOUR
+
+
+def test_failure_backoff_and_state_persistence(tmp_path):
+    """测试失败退避和调度状态持久化"""
+    state_file = str(tmp_path / 'state.json')
+    scheduler = make_scheduler(state_file=state_file)
+    scheduler.record_visit('快站', ['a'], now=0)
+    scheduler.record_failure('慢站', now=100)
+    assert scheduler.states['慢站'].next_visit == 100 + HOUR * 0.75
+    scheduler.save_state()
+
+    restored = make_scheduler(state_file=state_file)
+    assert restored.states['快站'].seen == ['a']
+    assert restored.states['快站'].next_visit == HOUR
+    assert restored.record_visit('快站', ['a', 'b'], now=2 * HOUR) == ['b']
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+传输层测试
+"""
+
+import pytest
+import requests
+
+from transport import RequestsTransport, create_transport
+
+
+class FakeResponse:
+    def __init__(self, headers, body=b''):
+        self.status_code = 200
+        self.headers = requests.structures.CaseInsensitiveDict(headers)
+        self.encoding = None
+        self.body = body
+        self.read = False
+
+    def iter_content(self, chunk_size):
+        self.read = True
+        for i in range(0, len(self.body), 4):
+            yield self.body[i:i + 4]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+
+class FakeSession:
+    def __init__(self, response):
+        self.response = response
+
+    def get(self, url, **kwargs):
+        assert kwargs['stream'] is True
+        return self.response
+
+
+def test_requests_transport_caps_and_skips_binary():
+    """测试requests传输层按上限截断正文，二进制响应不读取正文"""
+    html = FakeResponse({'Content-Type': 'text/html'}, b'0123456789')
+    result = RequestsTransport(FakeSession(html)).fetch('http://x.gov.cn/', {}, 10, {'default': 6})
+    assert result.body == b'012345'
+    assert result.truncated
+    assert result.headers['content-type'] == 'text/html'
+
+    pdf = FakeResponse({'Content-Type': 'application/pdf', 'Content-Length': '52428800'}, b'%PDF')
+    result = RequestsTransport(FakeSession(pdf)).fetch('http://x.gov.cn/a', {}, 10)
+    assert result.body is None
+    assert not pdf.read
+
+
+def test_httpx_transport_multiplexes_over_http2():
+    """测试httpx传输层在本地测试服务器上使用HTTP/2并按顺序返回批量结果"""
+    pytest.importorskip('httpx')
+    pytest.importorskip('h2')
+    from bench_transport import LocalTestServer
+
+    with LocalTestServer(latency=0.01, page_size=2048) as server:
+        transport = create_transport('httpx', None, http1=False, max_concurrency=4)
+        try:
+            urls = [(f'http://127.0.0.1:{server.port}/art/{i}.html', {}) for i in range(6)]
+            results = transport.fetch_many(urls, 10)
+            assert [result.url for result in results] == [url for url, _ in urls]
+            assert {result.http_version for result in results} == {'HTTP/2'}
+            assert results[0].body == server.body
+            assert results[0].encoding == 'utf-8'
+        finally:
+            transport.close()
+
+
+def test_create_transport_rejects_unknown():
+    """测试未知传输层名称"""
+    with pytest.raises(ValueError):
+        create_transport('curl', None)
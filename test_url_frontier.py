@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+URL抓取队列模块测试
+"""
+
+import os
+
+from url_frontier import (ScalableBloomFilter, SeenURLs, URLFrontier,
+                          PRIORITY_ARTICLE)
+
+
+def test_scalable_bloom_filter():
+    """测试布隆过滤器扩容后无漏判，误判率在上限附近"""
+    bloom = ScalableBloomFilter(initial_capacity=1000, error_rate=0.01)
+    added = sum(bloom.add(f'//x.gov.cn/art/{i}.html') for i in range(5000))
+    assert added > 4900
+    assert len(bloom.filters) > 1
+    assert all(f'//x.gov.cn/art/{i}.html' in bloom for i in range(5000))
+    false_positives = sum(f'//y.gov.cn/art/{i}.html' in bloom for i in range(10000))
+    assert false_positives < 200
+
+
+def test_seen_urls_exact_fallback(tmp_path):
+    """测试精确集合排除布隆过滤器的误判，并在关闭时删除临时文件"""
+    path = str(tmp_path / 'seen.db')
+    # 容量极小、误判率极高，迫使布隆过滤器频繁误判
+    seen = SeenURLs(path, initial_capacity=8, error_rate=0.5, delete_on_close=True)
+    keys = [f'//x.gov.cn/{i}' for i in range(500)]
+    assert all(seen.add(key) for key in keys)
+    assert seen.false_positives > 0
+    assert not any(seen.add(key) for key in keys)
+    assert keys[0] in seen and '//x.gov.cn/other' not in seen
+    seen.close()
+    assert not os.path.exists(path)
+
+
+def test_frontier_priority_and_dedup():
+    """测试列表页先于文章页出队，重复URL（含跟踪参数差异）只入队一次"""
+    frontier = URLFrontier()
+    assert frontier.add('http://a.gov.cn/art/1.html', 'article')
+    assert frontier.add('http://a.gov.cn/col/list.html', 'list', source='A')
+    assert not frontier.add('http://a.gov.cn/art/1.html?utm_source=wx', 'article')
+    assert len(frontier) == 2
+    assert frontier.pop().kind == 'list'
+    assert frontier.pop().url == 'http://a.gov.cn/art/1.html'
+    assert frontier.pop() is None
+
+
+def test_frontier_round_robin_hosts():
+    """测试同一优先级内按主机轮流出队"""
+    frontier = URLFrontier(delay_for=lambda url: 10)
+    for i in range(3):
+        frontier.add(f'http://a.gov.cn/art/{i}.html', 'article')
+    for i in range(3):
+        frontier.add(f'http://b.gov.cn/art/{i}.html', 'article')
+    hosts = [item.url.split('/')[2] for item in frontier.pop_batch(6, PRIORITY_ARTICLE)]
+    assert hosts == ['a.gov.cn', 'b.gov.cn'] * 3
+
+
+def test_frontier_deferred_seen():
+    """测试defer_seen入队的URL抓取成功后才记为已见，失败后可再次入队"""
+    frontier = URLFrontier()
+    assert frontier.add('http://a.gov.cn/art/1.html', defer_seen=True)
+    assert frontier.add('http://a.gov.cn/art/2.html', defer_seen=True)
+    assert not frontier.add('http://a.gov.cn/art/1.html', defer_seen=True)
+    first, second = frontier.pop_batch(2, PRIORITY_ARTICLE)
+    frontier.done(first, success=True)
+    frontier.done(second, success=False)
+    assert not frontier.add('http://a.gov.cn/art/1.html', defer_seen=True)
+    assert frontier.add('http://a.gov.cn/art/2.html', defer_seen=True)
+
+
+def test_frontier_pop_by_host():
+    """测试只从指定主机出队，其他主机的URL留在队列中"""
+    frontier = URLFrontier()
+    frontier.add('http://a.gov.cn/art/1.html')
+    frontier.add('http://b.gov.cn/art/1.html')
+    frontier.add('http://b.gov.cn/art/2.html')
+    batch = frontier.pop_batch(5, PRIORITY_ARTICLE, hosts={'b.gov.cn'})
+    assert [item.url for item in batch] == ['http://b.gov.cn/art/1.html', 'http://b.gov.cn/art/2.html']
+    assert len(frontier) == 1
+    assert frontier.pop().url == 'http://a.gov.cn/art/1.html'
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+URL标准化模块测试
+"""
+
+from url_normalizer import normalize_link, canonical_key, cache_info, clear_cache
+
+
+def test_relative_link_and_fragment():
+    """测试相对路径绝对化与锚点移除"""
+    result = normalize_link('../c.html#top', 'http://x.gov.cn/a/b/')
+    assert result.url == 'http://x.gov.cn/a/c.html'
+    assert result.key == '//x.gov.cn/a/c.html'
+
+
+def test_invalid_links():
+    """测试无效链接返回None"""
+    assert normalize_link('', 'http://x.gov.cn/') is None
+    assert normalize_link('javascript:void(0)', 'http://x.gov.cn/') is None
+    assert normalize_link('mailto:a@x.gov.cn', 'http://x.gov.cn/') is None
+    assert normalize_link('http://x.gov.cn:abc/', 'http://x.gov.cn/') is None
+
+
+def test_canonical_key_merges_variants():
+    """测试协议、默认端口、主机大小写、跟踪参数和参数顺序差异得到相同的规范键"""
+    variants = [
+        'http://Edu.Zibo.gov.cn/art/1.html?id=3&page=2',
+        'https://edu.zibo.gov.cn:443/art/1.html?page=2&id=3',
+        'http://edu.zibo.gov.cn:80/art/1.html?utm_source=wx&id=3&page=2#top',
+        'http://edu.zibo.gov.cn/art/1.html?id=3&spm=1.2&page=2',
+    ]
+    keys = {canonical_key(url) for url in variants}
+    assert keys == {'//edu.zibo.gov.cn/art/1.html?id=3&page=2'}
+    assert canonical_key('http://edu.zibo.gov.cn:8080/art/1.html') != canonical_key(variants[0])
+
+
+def test_cache_hits():
+    """测试相同(base, href)命中缓存"""
+    clear_cache()
+    normalize_link('/a.html', 'http://x.gov.cn/')
+    normalize_link('/a.html', 'http://x.gov.cn/')
+    assert cache_info().hits == 1
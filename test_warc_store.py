@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+WARC记录与回放模块测试
+"""
+
+import gzip
+
+import pytest
+import requests
+
+from transport import FetchResult
+from warc_store import (WarcWriter, ReplayTransport, RecordingSession, ReplaySession, iter_records,
+                        load_responses, find_warc_files)
+
+HTML = '<html><body><a href="/art/1.html">思政课建设</a></body></html>'.encode('gbk')
+
+
+def _write(tmp_path, results):
+    writer = WarcWriter(str(tmp_path))
+    for result in results:
+        writer.write_response(result)
+    writer.close()
+    return writer.path
+
+
+def test_record_and_replay(tmp_path):
+    """测试记录的响应可原样回放，正文已解压时去掉Content-Encoding"""
+    page = FetchResult('http://edu.jinan.gov.cn/', 200,
+                       {'content-type': 'text/html; charset=gbk', 'content-encoding': 'gzip',
+                        'content-length': '10'}, 'gbk', HTML)
+    path = _write(tmp_path, [page])
+
+    types = [headers['WARC-Type'] for headers, _ in iter_records(path)]
+    assert types == ['warcinfo', 'response']
+
+    replayed = ReplayTransport.from_file(path).fetch('http://edu.jinan.gov.cn/', {}, 10)
+    assert replayed.status_code == 200
+    assert replayed.body == HTML
+    assert replayed.encoding == 'gbk'
+    assert 'content-encoding' not in replayed.headers
+    assert replayed.headers['content-length'] == str(len(HTML))
+    assert not replayed.truncated
+
+
+def test_truncated_and_binary(tmp_path):
+    """测试截断正文和未下载的二进制附件"""
+    truncated = FetchResult('http://a.cn/big', 200, {'content-type': 'text/html'}, None,
+                            b'<html>', truncated=True)
+    attachment = FetchResult('http://a.cn/file', 200, {'content-type': 'application/pdf'}, None, None)
+    path = _write(tmp_path, [truncated, attachment])
+
+    responses = load_responses(path)
+    assert responses['http://a.cn/big'].truncated
+    assert responses['http://a.cn/big'].body == b'<html>'
+    assert responses['http://a.cn/file'].body is None
+
+
+def test_per_record_gzip_and_latest_capture(tmp_path):
+    """测试每条记录单独压缩，同一URL回放最后一次抓取"""
+    first = FetchResult('http://a.cn/', 200, {'content-type': 'text/html'}, None, b'old')
+    second = FetchResult('http://a.cn/', 200, {'content-type': 'text/html'}, None, b'new')
+    path = _write(tmp_path, [first, second])
+
+    with open(path, 'rb') as f:
+        assert f.read().count(b'\x1f\x8b\x08') >= 3
+    assert load_responses(path)['http://a.cn/'].body == b'new'
+    assert gzip.decompress(open(path, 'rb').read()).startswith(b'WARC/1.1\r\n')
+
+
+def test_replay_missing_url(tmp_path):
+    """测试回放存档中不存在的URL时抛出连接错误且不重试"""
+    transport = ReplayTransport({})
+    assert not transport.retryable
+    with pytest.raises(requests.exceptions.ConnectionError):
+        transport.fetch('http://a.cn/', {}, 10)
+    assert find_warc_files(str(tmp_path)) == []
+
+
+class _StreamResponse:
+    def __init__(self, body, status_code=200):
+        self.body = body
+        self.status_code = status_code
+        self.headers = {'Content-Type': 'text/plain; charset=utf-8'}
+        self.encoding = 'utf-8'
+
+    def iter_content(self, chunk_size=1):
+        for i in range(0, len(self.body), 4):
+            yield self.body[i:i + 4]
+
+    def close(self):
+        pass
+
+
+class _StreamSession:
+    def __init__(self, pages):
+        self.pages = pages
+
+    def get(self, url, **kwargs):
+        return _StreamResponse(self.pages[url])
+
+
+def test_recording_session_roundtrip(tmp_path):
+    """测试经会话直接读取的流式响应被记录，未读完的正文标记为截断，回放会话按行读取"""
+    writer = WarcWriter(str(tmp_path))
+    session = RecordingSession(_StreamSession({'http://a.cn/robots.txt': b'User-agent: *\nSitemap: /s.xml\n',
+                                               'http://a.cn/big': b'0123456789'}), writer)
+    with session.get('http://a.cn/robots.txt', stream=True) as response:
+        lines = list(response.iter_lines(decode_unicode=True))
+    with session.get('http://a.cn/big', stream=True) as response:
+        next(response.iter_content(4))
+    writer.close()
+
+    responses = load_responses(writer.path)
+    assert not responses['http://a.cn/robots.txt'].truncated
+    assert responses['http://a.cn/big'].truncated
+    assert responses['http://a.cn/big'].body == b'0123'
+
+    replay = ReplaySession(responses)
+    with replay.get('http://a.cn/robots.txt', stream=True) as response:
+        assert response.headers['Content-Type'] == 'text/plain; charset=utf-8'
+        assert list(response.iter_lines(decode_unicode=True)) == lines == ['User-agent: *', 'Sitemap: /s.xml']
+    with pytest.raises(requests.exceptions.ConnectionError):
+        replay.get('http://a.cn/missing')
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+分布式工作队列测试
+SQLite队列与LocalRedis队列遵循相同的行为约定
+"""
+
+import time
+import pytest
+from work_queue import SQLiteWorkQueue, RedisWorkQueue, LocalRedis, LeaseKeeper, make_task, open_queue
+
+
+@pytest.fixture(params=['sqlite', 'redis'])
+def queue(request, tmp_path):
+    if request.param == 'sqlite':
+        return SQLiteWorkQueue(str(tmp_path / 'queue.db'))
+    return RedisWorkQueue(LocalRedis())
+
+
+def test_tasks_are_deduplicated_and_leased_once(queue):
+    """测试重复任务被忽略，且每个任务只被一个节点领取"""
+    tasks = [make_task('r1', 'site', f'站点{i}', f'http://s{i}.gov.cn/') for i in range(3)]
+    assert queue.add_tasks(tasks) == 3
+    assert queue.add_tasks(tasks) == 0
+
+    leased = [queue.lease('r1', f'w{i}', 60) for i in range(4)]
+    assert [task.name for task in leased[:3]] == ['站点0', '站点1', '站点2']
+    assert leased[3] is None
+    assert queue.status('r1') == {'pending': 0, 'leased': 3, 'done': 0, 'failed': 0}
+
+
+def test_expired_lease_is_reassigned(queue):
+    """测试租约过期后任务被重新分配，且结果只记录一次"""
+    queue.add_tasks([make_task('r1', 'site', '站点', 'http://s.gov.cn/')])
+    first = queue.lease('r1', 'w1', 0.01)
+    time.sleep(0.05)
+    second = queue.lease('r1', 'w2', 60)
+    assert second.id == first.id
+    assert second.attempts == 2
+
+    assert queue.complete(second, 'w2', [{'url': 'http://s.gov.cn/a'}])
+    assert not queue.complete(first, 'w1', [{'url': 'http://s.gov.cn/b'}])
+    assert queue.is_finished('r1')
+    assert queue.results('r1') == [{'url': 'http://s.gov.cn/a'}]
+
+
+def test_fail_requeues_until_max_attempts(queue):
+    """测试失败任务重新入队，超过最大次数后标记为失败"""
+    queue.add_tasks([make_task('r1', 'site', '站点', 'http://s.gov.cn/')])
+    task = queue.lease('r1', 'w1', 60)
+    queue.fail(task, 'w1', '连接错误', max_attempts=2)
+    task = queue.lease('r1', 'w1', 60)
+    queue.fail(task, 'w1', '连接错误', max_attempts=2)
+    assert queue.lease('r1', 'w1', 60) is None
+    assert queue.status('r1')['failed'] == 1
+    assert queue.is_finished('r1')
+
+
+def test_results_merge_in_task_order(queue):
+    """测试结果按任务添加顺序合并，且不同运行ID互不影响"""
+    queue.add_tasks([make_task('r1', 'site', n, f'http://{n}.gov.cn/') for n in ('a', 'b')])
+    queue.add_tasks([make_task('r2', 'site', 'c', 'http://c.gov.cn/')])
+    task_a = queue.lease('r1', 'w1', 60)
+    task_b = queue.lease('r1', 'w2', 60)
+    queue.complete(task_b, 'w2', [{'source': 'b'}])
+    queue.complete(task_a, 'w1', [{'source': 'a'}])
+    assert queue.results('r1') == [{'source': 'a'}, {'source': 'b'}]
+    assert queue.status('r2')['pending'] == 1
+
+
+def test_open_queue(tmp_path):
+    """测试队列地址解析"""
+    assert isinstance(open_queue(f'sqlite:///{tmp_path}/q.db'), SQLiteWorkQueue)
+    assert isinstance(open_queue('local'), RedisWorkQueue)
+    with pytest.raises(ValueError):
+        open_queue('ftp://example.com/q')
+
+
+def test_expired_leases_count_as_attempts(queue):
+    """测试租约过期计为一次尝试，达到最大次数后标记为失败而不是无限重新分配"""
+    queue.add_tasks([make_task('r1', 'site', '站点', 'http://s.gov.cn/')])
+    assert queue.lease('r1', 'w1', 0.01, max_attempts=2).attempts == 1
+    time.sleep(0.05)
+    assert queue.lease('r1', 'w2', 0.01, max_attempts=2).attempts == 2
+    time.sleep(0.05)
+    assert queue.lease('r1', 'w3', 60, max_attempts=2) is None
+    assert queue.status('r1') == {'pending': 0, 'leased': 0, 'done': 0, 'failed': 1}
+    assert queue.is_finished('r1')
+
+
+def test_stale_worker_cannot_touch_reassigned_lease(queue):
+    """测试租约被其他节点接手后，原节点的失败和提交都不影响新租约"""
+    queue.add_tasks([make_task('r1', 'site', '站点', 'http://s.gov.cn/')])
+    stale = queue.lease('r1', 'w1', 0.01)
+    time.sleep(0.05)
+    current = queue.lease('r1', 'w2', 60)
+
+    queue.fail(stale, 'w1', '连接错误')
+    assert not queue.complete(stale, 'w1', [{'url': 'http://s.gov.cn/b'}])
+    assert queue.status('r1') == {'pending': 0, 'leased': 1, 'done': 0, 'failed': 0}
+    assert queue.lease('r1', 'w3', 60) is None
+
+    assert queue.complete(current, 'w2', [{'url': 'http://s.gov.cn/a'}])
+    assert queue.results('r1') == [{'url': 'http://s.gov.cn/a'}]
+
+
+def test_extend_keeps_lease_until_reclaimed(queue):
+    """测试续租后任务不会被重新分配，租约被其他节点接手后续租失败"""
+    queue.add_tasks([make_task('r1', 'site', '站点', 'http://s.gov.cn/')])
+    task = queue.lease('r1', 'w1', 0.05)
+    assert queue.extend(task, 'w1', 60)
+    time.sleep(0.1)
+    assert queue.lease('r1', 'w2', 60) is None
+    assert not queue.extend(task, 'w2', 60)
+
+    assert queue.extend(task, 'w1', 0.01)
+    time.sleep(0.05)
+    assert queue.lease('r1', 'w2', 60).attempts == 2
+    assert not queue.extend(task, 'w1', 60)
+    assert not queue.complete(task, 'w1', [])
+
+
+def test_lease_keeper_renews_at_a_third_of_the_lease(queue):
+    """测试续租器只在超过租约时长三分之一后续租，租约丢失后不再续租"""
+    now = [0.0]
+    calls = []
+
+    class CountingQueue:
+        def extend(self, task, worker_id, lease_seconds):
+            calls.append(now[0])
+            return queue.extend(task, worker_id, lease_seconds)
+
+    queue.add_tasks([make_task('r1', 'site', '站点', 'http://s.gov.cn/')])
+    task = queue.lease('r1', 'w1', 60)
+    keeper = LeaseKeeper(CountingQueue(), task, 'w1', 60, clock=lambda: now[0])
+    now[0] = 10
+    assert keeper.renew()
+    now[0] = 25
+    assert keeper.renew()
+    assert calls == [25]
+
+    queue.fail(task, 'w1', '连接错误')
+    now[0] = 50
+    assert not keeper.renew()
+    now[0] = 100
+    assert not keeper.renew()
+    assert calls == [25, 50]
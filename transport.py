@@ -0,0 +1,247 @@
+"""
+HTTP传输层模块
+为SZCrawler._fetch_page提供可替换的传输实现：
+    RequestsTransport  基于requests.Session（HTTP/1.1，默认）
+    HTTPXTransport     基于httpx.AsyncClient（支持HTTP/2多路复用，需安装httpx[http2]）
+两种实现都以流式读取响应体，按内容类型限制大小，二进制附件只读取响应头
+"""
+
+import asyncio
+import logging
+import threading
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+import requests
+
+from dns_cache import CachedDNSBackend
+from fetch_policy import is_binary_content_type, byte_cap
+
+try:
+    import httpx
+except ImportError:  # httpx为可选依赖
+    httpx = None
+
+CHUNK_SIZE = 64 * 1024
+
+logger = logging.getLogger(__name__)
+
+
+def install_dns_backend(transport, dns_cache) -> bool:
+    """让httpx传输层的连接池使用DNS缓存建立连接
+
+    httpx未公开network_backend参数，只能替换连接池（httpcore）的内部属性；
+    该属性不存在时（httpx/httpcore版本变化）记录警告并保留系统解析，不影响请求
+
+    Args:
+        transport: httpx.AsyncHTTPTransport
+        dns_cache: DNSCache
+
+    Returns:
+        bool: 是否已替换
+    """
+    pool = getattr(transport, '_pool', None)
+    if CachedDNSBackend is None or not hasattr(pool, '_network_backend'):
+        logger.warning("当前httpx/httpcore版本不支持替换网络后端，HTTP/2传输层不使用DNS缓存")
+        return False
+    pool._network_backend = CachedDNSBackend(dns_cache)
+    return True
+
+
+class FetchResult(NamedTuple):
+    """一次请求的结果
+
+    headers的键统一为小写；body为None表示响应为二进制附件，未下载正文；
+    truncated表示正文超过字节上限被截断
+    """
+    url: str
+    status_code: int
+    headers: Dict[str, str]
+    encoding: Optional[str]
+    body: Optional[bytes]
+    truncated: bool = False
+    http_version: str = 'HTTP/1.1'
+
+
+def _lower_headers(headers) -> Dict[str, str]:
+    """将响应头转换为键为小写的普通字典"""
+    return {key.lower(): value for key, value in headers.items()}
+
+
+def _read_capped(chunks, cap: int) -> Tuple[bytes, bool]:
+    """从字节块迭代器中读取至多cap字节，返回(内容, 是否截断)"""
+    buffer = []
+    received = 0
+    for chunk in chunks:
+        buffer.append(chunk)
+        received += len(chunk)
+        if received > cap:
+            return b''.join(buffer)[:cap], True
+    return b''.join(buffer), False
+
+
+class Transport:
+    """传输层接口"""
+
+    name = 'base'
+    retryable = True  # 请求失败时是否值得重试
+
+    def fetch(self, url: str, headers: Dict[str, str], timeout: float,
+              caps: Optional[Dict[str, int]] = None) -> FetchResult:
+        """请求单个URL
+
+        网络错误以requests.exceptions中的异常抛出，便于调用方统一处理
+        """
+        raise NotImplementedError
+
+    def fetch_many(self, requests_: Sequence[Tuple[str, Dict[str, str]]], timeout: float,
+                   caps: Optional[Dict[str, int]] = None) -> List[Union[FetchResult, Exception]]:
+        """批量请求，结果顺序与输入一致，失败的请求以异常对象返回
+
+        默认实现逐个顺序请求
+        """
+        results = []
+        for url, headers in requests_:
+            try:
+                results.append(self.fetch(url, headers, timeout, caps))
+            except Exception as e:
+                results.append(e)
+        return results
+
+    def close(self):
+        """释放连接等资源"""
+
+
+class RequestsTransport(Transport):
+    """基于requests.Session的传输实现（HTTP/1.1）"""
+
+    name = 'requests'
+
+    def __init__(self, session: requests.Session):
+        self.session = session
+
+    def fetch(self, url, headers, timeout, caps=None):
+        with self.session.get(url, headers=headers, timeout=timeout, stream=True) as response:
+            content_type = response.headers.get('Content-Type')
+            body, truncated = None, False
+            if response.status_code < 400 and not is_binary_content_type(content_type):
+                body, truncated = _read_capped(response.iter_content(CHUNK_SIZE),
+                                               byte_cap(content_type, caps))
+            return FetchResult(url, response.status_code, _lower_headers(response.headers),
+                               response.encoding, body, truncated, 'HTTP/1.1')
+
+    def close(self):
+        self.session.close()
+
+
+class HTTPXTransport(Transport):
+    """基于httpx.AsyncClient的传输实现
+
+    事件循环运行在后台线程中，对外提供同步接口；fetch_many并发发出请求，
+    对同一主机的请求在HTTP/2下复用同一连接（多路复用）。
+    """
+
+    name = 'httpx'
+
+    def __init__(self, http2: bool = True, verify: bool = False, max_concurrency: int = 6,
+                 http1: bool = True, dns_cache=None):
+        """初始化传输层
+
+        Args:
+            http2: 是否启用HTTP/2（HTTPS下通过ALPN协商）
+            verify: 是否校验证书，与现有Session设置保持一致默认不校验
+            max_concurrency: fetch_many的最大并发请求数
+            http1: 是否允许HTTP/1.1；设为False时对明文HTTP直接使用HTTP/2（h2c先验知识）
+            dns_cache: 建立连接时使用的DNS缓存（见dns_cache模块），None表示每次由系统解析
+        """
+        if httpx is None:
+            raise ImportError("使用HTTP/2传输需要安装httpx: pip install 'httpx[http2]'")
+        self.max_concurrency = max_concurrency
+        # httpx默认以INFO级别记录每个请求，与爬虫自身日志重复
+        logging.getLogger('httpx').setLevel(logging.WARNING)
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name='httpx-transport',
+                                        daemon=True)
+        self._thread.start()
+        self._client = self._run(self._create_client(http1, http2, verify, max_concurrency, dns_cache))
+
+    async def _create_client(self, http1, http2, verify, max_concurrency, dns_cache):
+        limits = httpx.Limits(max_connections=max_concurrency * 4,
+                              max_keepalive_connections=max_concurrency * 4)
+        transport = httpx.AsyncHTTPTransport(http1=http1, http2=http2, verify=verify, limits=limits)
+        if dns_cache is not None:
+            install_dns_backend(transport, dns_cache)
+        return httpx.AsyncClient(http1=http1, http2=http2, verify=verify, limits=limits,
+                                 follow_redirects=True, transport=transport)
+
+    def _run(self, coroutine):
+        """在后台事件循环中执行协程并等待结果"""
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result()
+
+    async def _fetch(self, url, headers, timeout, caps):
+        try:
+            async with self._client.stream('GET', url, headers=headers, timeout=timeout) as response:
+                content_type = response.headers.get('Content-Type')
+                body, truncated = None, False
+                if response.status_code < 400 and not is_binary_content_type(content_type):
+                    cap = byte_cap(content_type, caps)
+                    buffer = bytearray()
+                    async for chunk in response.aiter_bytes(CHUNK_SIZE):
+                        buffer.extend(chunk)
+                        if len(buffer) > cap:
+                            truncated = True
+                            del buffer[cap:]
+                            break
+                    body = bytes(buffer)
+                return FetchResult(url, response.status_code, _lower_headers(response.headers),
+                                   response.charset_encoding, body, truncated,
+                                   response.http_version)
+        except httpx.TimeoutException as e:
+            raise requests.exceptions.Timeout(str(e)) from e
+        except httpx.ConnectError as e:
+            if 'SSL' in str(e) or 'CERTIFICATE' in str(e).upper():
+                raise requests.exceptions.SSLError(str(e)) from e
+            raise requests.exceptions.ConnectionError(str(e)) from e
+        except (httpx.NetworkError, httpx.RemoteProtocolError) as e:
+            raise requests.exceptions.ConnectionError(str(e)) from e
+        except httpx.HTTPError as e:
+            raise requests.exceptions.RequestException(str(e)) from e
+
+    async def _fetch_many(self, requests_, timeout, caps):
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def bounded(url, headers):
+            async with semaphore:
+                return await self._fetch(url, headers, timeout, caps)
+
+        return await asyncio.gather(*(bounded(url, headers) for url, headers in requests_),
+                                    return_exceptions=True)
+
+    def fetch(self, url, headers, timeout, caps=None):
+        return self._run(self._fetch(url, headers, timeout, caps))
+
+    def fetch_many(self, requests_, timeout, caps=None):
+        return list(self._run(self._fetch_many(list(requests_), timeout, caps)))
+
+    def close(self):
+        if self._loop.is_running():
+            self._run(self._client.aclose())
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout=5)
+
+
+def create_transport(name: str, session: requests.Session, **options) -> Transport:
+    """按名称创建传输层
+
+    Args:
+        name: 'requests' 或 'httpx'
+        session: requests会话（requests传输使用）
+        **options: 传给HTTPXTransport的参数
+
+    Returns:
+        Transport: 传输层实例
+    """
+    if name == 'requests':
+        return RequestsTransport(session)
+    if name == 'httpx':
+        return HTTPXTransport(**options)
+    raise ValueError(f"不支持的传输层: {name}")
@@ -0,0 +1,334 @@
+"""
+URL抓取队列（frontier）模块
+    ScalableBloomFilter  可扩容的布隆过滤器，内存占用与URL数量近似线性、每条约2字节
+    SeenURLs             已见URL集合：布隆过滤器在内存中快速判断，命中时查询磁盘上的精确集合排除误判
+    URLFrontier          按优先级（列表页先于文章页）出队，同一优先级内按主机轮流，避免集中请求同一主机
+"""
+
+import hashlib
+import heapq
+import itertools
+import math
+import os
+import sqlite3
+import time
+from collections import deque
+from typing import Any, Callable, Collection, Dict, List, NamedTuple, Optional
+from urllib.parse import urlsplit
+
+from url_normalizer import normalize_link
+
+PRIORITY_LIST = 0
+PRIORITY_ARTICLE = 1
+KIND_PRIORITY = {'list': PRIORITY_LIST, 'article': PRIORITY_ARTICLE}
+
+
+def _hashes(key: str):
+    # 两个32位哈希值做双重哈希；保持小整数运算以免Python大整数拖慢每次查询
+    digest = hashlib.blake2b(key.encode('utf-8', 'surrogatepass'), digest_size=8).digest()
+    return int.from_bytes(digest[:4], 'little'), int.from_bytes(digest[4:], 'little') | 1
+
+
+class BloomFilter:
+    """固定容量的布隆过滤器"""
+
+    __slots__ = ('capacity', 'num_bits', 'num_hashes', 'bits', 'count')
+
+    def __init__(self, capacity: int, error_rate: float):
+        self.capacity = capacity
+        self.num_bits = max(8, int(math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)))
+        self.num_hashes = max(1, int(round(self.num_bits / capacity * math.log(2))))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    def positions(self, h1, h2) -> List[int]:
+        num_bits = self.num_bits
+        pos, step = h1 % num_bits, h2 % num_bits
+        result = [pos]
+        for _ in range(self.num_hashes - 1):
+            pos = (pos + step) % num_bits
+            result.append(pos)
+        return result
+
+    def contains(self, positions) -> bool:
+        bits = self.bits
+        for pos in positions:
+            if not bits[pos >> 3] & (1 << (pos & 7)):
+                return False
+        return True
+
+    def add(self, positions):
+        bits = self.bits
+        for pos in positions:
+            bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+
+class ScalableBloomFilter:
+    """可扩容的布隆过滤器
+
+    当前过滤器写满后新建一个容量为growth倍、误判率为tightening倍的过滤器，
+    总误判率收敛于error_rate以内。
+    """
+
+    def __init__(self, initial_capacity: int = 100000, error_rate: float = 0.001,
+                 growth: int = 2, tightening: float = 0.5):
+        """初始化过滤器
+
+        Args:
+            initial_capacity: 第一个过滤器的容量
+            error_rate: 总体误判率上限
+            growth: 扩容倍数
+            tightening: 每次扩容时误判率的缩小倍数
+        """
+        self.initial_capacity = initial_capacity
+        self.error_rate = error_rate
+        self.growth = growth
+        self.tightening = tightening
+        self.filters: List[BloomFilter] = []
+
+    def _new_filter(self):
+        level = len(self.filters)
+        capacity = self.initial_capacity * self.growth ** level
+        error_rate = self.error_rate * (1 - self.tightening) * self.tightening ** level
+        self.filters.append(BloomFilter(capacity, error_rate))
+
+    def __contains__(self, key: str) -> bool:
+        h1, h2 = _hashes(key)
+        return any(bloom.contains(bloom.positions(h1, h2)) for bloom in self.filters)
+
+    def add(self, key: str) -> bool:
+        """加入key，返回是否一定是新key（False表示可能已存在，未重复加入）"""
+        h1, h2 = _hashes(key)
+        positions = None
+        for bloom in self.filters:
+            positions = bloom.positions(h1, h2)
+            if bloom.contains(positions):
+                return False
+        current = self.filters[-1] if self.filters else None
+        if current is None or current.count >= current.capacity:
+            self._new_filter()
+            current = self.filters[-1]
+            positions = current.positions(h1, h2)
+        current.add(positions)
+        return True
+
+    def __len__(self) -> int:
+        return sum(bloom.count for bloom in self.filters)
+
+    @property
+    def nbytes(self) -> int:
+        """位数组占用的字节数"""
+        return sum(len(bloom.bits) for bloom in self.filters)
+
+
+class SeenURLs:
+    """已见URL规范键集合
+
+    布隆过滤器判定为新的key一定是新的；判定为可能已存在时，再查询磁盘上的SQLite精确集合，
+    因此不会因误判漏抓URL。未提供path时只使用布隆过滤器，约有error_rate比例的新URL被误判为已见。
+    """
+
+    COMMIT_EVERY = 10000
+
+    def __init__(self, path: Optional[str] = None, initial_capacity: int = 100000,
+                 error_rate: float = 0.001, delete_on_close: bool = False):
+        """初始化集合
+
+        Args:
+            path: 精确集合的SQLite文件路径，None表示只使用布隆过滤器
+            initial_capacity: 布隆过滤器初始容量
+            error_rate: 布隆过滤器误判率上限
+            delete_on_close: 关闭时删除SQLite文件（临时集合）
+        """
+        self.bloom = ScalableBloomFilter(initial_capacity, error_rate)
+        self.path = path
+        self.delete_on_close = delete_on_close
+        self.false_positives = 0
+        self._pending = 0
+        self._db = None
+        if path:
+            self._db = sqlite3.connect(path)
+            # 临时去重数据，不需要崩溃恢复
+            self._db.execute('PRAGMA journal_mode=OFF')
+            self._db.execute('PRAGMA synchronous=OFF')
+            self._db.execute('CREATE TABLE IF NOT EXISTS seen (key TEXT PRIMARY KEY) WITHOUT ROWID')
+            for (key,) in self._db.execute('SELECT key FROM seen'):
+                self.bloom.add(key)
+
+    def _insert(self, key: str):
+        self._db.execute('INSERT OR IGNORE INTO seen (key) VALUES (?)', (key,))
+        self._pending += 1
+        if self._pending >= self.COMMIT_EVERY:
+            self._db.commit()
+            self._pending = 0
+
+    def add(self, key: str) -> bool:
+        """加入key，返回是否为新key"""
+        if self.bloom.add(key):
+            if self._db is not None:
+                self._insert(key)
+            return True
+        if self._db is None:
+            return False
+        if self._db.execute('SELECT 1 FROM seen WHERE key = ?', (key,)).fetchone():
+            return False
+        self.false_positives += 1
+        self._insert(key)
+        return True
+
+    def __contains__(self, key: str) -> bool:
+        if key not in self.bloom:
+            return False
+        if self._db is None:
+            return True
+        return self._db.execute('SELECT 1 FROM seen WHERE key = ?', (key,)).fetchone() is not None
+
+    def __len__(self) -> int:
+        return len(self.bloom)
+
+    def close(self):
+        """提交并关闭精确集合"""
+        if self._db is None:
+            return
+        self._db.commit()
+        self._db.close()
+        self._db = None
+        if self.delete_on_close and os.path.exists(self.path):
+            os.remove(self.path)
+
+
+class FrontierItem(NamedTuple):
+    """队列中的一个URL"""
+    url: str
+    key: str
+    kind: str
+    source: Optional[str] = None
+    depth: int = 0
+    data: Any = None
+
+
+class URLFrontier:
+    """抓取队列
+
+    每个主机按优先级各有一个子队列；出队时取最高优先级中最早可以请求的主机，
+    主机出队后按delay_for推迟其下次可请求时间，从而在主机之间轮流。
+    入队前以规范键去重，同一URL在队列生命周期内只入队一次；
+    以defer_seen入队的URL在done()确认抓取成功后才记为已见，失败后可再次入队。
+    """
+
+    def __init__(self, seen: Optional[SeenURLs] = None,
+                 delay_for: Optional[Callable[[str], float]] = None):
+        """初始化队列
+
+        Args:
+            seen: 已见URL集合，默认只使用布隆过滤器
+            delay_for: 返回URL所在主机请求间隔（秒）的函数，默认不间隔
+        """
+        self.seen = seen if seen is not None else SeenURLs()
+        self.delay_for = delay_for or (lambda url: 0)
+        self._queues: Dict[str, List[deque]] = {}
+        self._ready_at: Dict[str, float] = {}
+        self._deferred = set()
+        self._heaps: List[list] = [[] for _ in KIND_PRIORITY]
+        self._counter = itertools.count()
+        self._size = 0
+
+    def add(self, url: str, kind: str = 'article', source: Optional[str] = None,
+            depth: int = 0, data: Any = None, defer_seen: bool = False) -> bool:
+        """URL入队
+
+        Args:
+            url: 绝对URL
+            kind: 'list'（列表页）或 'article'（文章页）
+            source: 来源站点名称
+            depth: 从站点首页起的深度
+            data: 随URL保存的附加数据
+            defer_seen: 暂不记为已见，由done()根据抓取结果决定
+
+        Returns:
+            bool: 是否入队（无效、已见过或正在等待抓取的URL返回False）
+        """
+        normalized = normalize_link(url, url)
+        if normalized is None or normalized.key in self._deferred:
+            return False
+        if defer_seen:
+            if normalized.key in self.seen:
+                return False
+            self._deferred.add(normalized.key)
+        elif not self.seen.add(normalized.key):
+            return False
+        priority = KIND_PRIORITY[kind]
+        host = urlsplit(normalized.url).netloc
+        queues = self._queues.get(host)
+        if queues is None:
+            queues = self._queues[host] = [deque() for _ in KIND_PRIORITY]
+        queues[priority].append(FrontierItem(url, normalized.key, kind, source, depth, data))
+        heapq.heappush(self._heaps[priority],
+                       (self._ready_at.get(host, 0.0), next(self._counter), host))
+        self._size += 1
+        return True
+
+    def pop(self, priority: Optional[int] = None,
+            hosts: Optional[Collection[str]] = None) -> Optional[FrontierItem]:
+        """取出下一个URL，队列为空时返回None
+
+        Args:
+            priority: 只从该优先级取出，默认取最高优先级
+            hosts: 只从这些主机取出，默认不限
+        """
+        priorities = range(len(self._heaps)) if priority is None else (priority,)
+        for level in priorities:
+            heap = self._heaps[level]
+            skipped = []
+            try:
+                while heap:
+                    entry = heapq.heappop(heap)
+                    ready_at, _, host = entry
+                    queue = self._queues[host][level]
+                    if not queue:
+                        continue
+                    if hosts is not None and host not in hosts:
+                        skipped.append(entry)
+                        continue
+                    current = self._ready_at.get(host, 0.0)
+                    if ready_at < current:
+                        # 该主机在入队后已被请求过，按新的可请求时间重新排序
+                        heapq.heappush(heap, (current, next(self._counter), host))
+                        continue
+                    item = queue.popleft()
+                    self._size -= 1
+                    self._ready_at[host] = max(time.monotonic(), current) + self.delay_for(item.url)
+                    return item
+            finally:
+                for entry in skipped:
+                    heapq.heappush(heap, entry)
+        return None
+
+    def pop_batch(self, limit: int, priority: Optional[int] = None,
+                  hosts: Optional[Collection[str]] = None) -> List[FrontierItem]:
+        """取出至多limit个同一优先级的URL，hosts含义同pop"""
+        first = self.pop(priority, hosts)
+        if first is None:
+            return []
+        batch = [first]
+        level = KIND_PRIORITY[first.kind]
+        while len(batch) < limit:
+            item = self.pop(level, hosts)
+            if item is None:
+                break
+            batch.append(item)
+        return batch
+
+    def done(self, item: FrontierItem, success: bool = True):
+        """结束以defer_seen入队的URL：成功时记为已见，失败时允许之后再次入队"""
+        self._deferred.discard(item.key)
+        if success:
+            self.seen.add(item.key)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def close(self):
+        """关闭已见URL集合"""
+        self.seen.close()
@@ -0,0 +1,112 @@
+"""
+URL标准化模块
+对页面链接进行一次解析完成绝对化、校验与规范化，并按(base, href)做LRU缓存
+"""
+
+from functools import lru_cache
+from typing import NamedTuple, Optional
+from urllib.parse import urljoin, urlsplit, urlunsplit
+
+# 需要移除的跟踪参数
+TRACKING_PARAMS = frozenset({
+    'spm', 'share_token', 'isappinstalled', 'scene', 'clicktime',
+    'enterid', 'fbclid', 'gclid', 'tt_from',
+})
+TRACKING_PREFIXES = ('utm_',)
+
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+# (base, href)缓存容量
+CACHE_SIZE = 65536
+
+
+class NormalizedURL(NamedTuple):
+    """标准化结果
+
+    url: 用于请求和输出的规范URL（保留原协议）
+    key: 用于去重和缓存的规范键（忽略http/https差异）
+    """
+    url: str
+    key: str
+
+
+def _is_tracking_param(name: str) -> bool:
+    """判断查询参数是否为跟踪参数"""
+    lowered = name.lower()
+    return lowered in TRACKING_PARAMS or lowered.startswith(TRACKING_PREFIXES)
+
+
+def _clean_query(query: str):
+    """移除跟踪参数，返回(保留原顺序的查询串, 排序后的查询串)"""
+    if not query:
+        return '', ''
+    kept = [pair for pair in query.split('&')
+            if pair and not _is_tracking_param(pair.split('=', 1)[0])]
+    return '&'.join(kept), '&'.join(sorted(kept))
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def normalize_link(href: str, base_url: str) -> Optional[NormalizedURL]:
+    """将页面中的链接标准化
+
+    处理步骤：绝对化相对路径、去除锚点、协议和主机名小写、去除默认端口、
+    移除跟踪参数；绝对化后的URL只解析一次，同时用于校验和规范化。
+
+    Args:
+        href: 链接原始href
+        base_url: 所在页面URL
+
+    Returns:
+        Optional[NormalizedURL]: 标准化结果，无效链接返回None
+    """
+    if not href:
+        return None
+
+    href = href.strip()
+    if not href or href.lower().startswith('javascript:'):
+        return None
+
+    # 处理相对路径
+    if not href.lower().startswith(('http://', 'https://')):
+        href = urljoin(base_url, href)
+
+    try:
+        parts = urlsplit(href)
+        port = parts.port
+    except ValueError:
+        return None
+
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or '').rstrip('.')
+    if scheme not in DEFAULT_PORTS or not host:
+        return None
+
+    netloc = f'[{host}]' if ':' in host else host
+    if port is not None and port != DEFAULT_PORTS[scheme]:
+        netloc = f'{netloc}:{port}'
+
+    path = parts.path or '/'
+    query, sorted_query = _clean_query(parts.query)
+
+    url = urlunsplit((scheme, netloc, path, query, ''))
+    key = f'//{netloc}{path}'
+    if sorted_query:
+        key = f'{key}?{sorted_query}'
+
+    return NormalizedURL(url, key)
+
+
+def canonical_key(url: str) -> Optional[str]:
+    """获取绝对URL的规范去重键，无效URL返回None"""
+    result = normalize_link(url, url)
+    return result.key if result else None
+
+
+def cache_info():
+    """返回标准化缓存的命中统计"""
+    return normalize_link.cache_info()
+
+
+def clear_cache():
+    """清空标准化缓存"""
+    normalize_link.cache_clear()
@@ -0,0 +1,281 @@
+"""
+WARC记录与回放模块
+记录模式下把传输层返回的原始响应写入WARC文件（每条记录单独gzip压缩，即.warc.gz），
+回放模式下由ReplayTransport从这些文件提供响应，离线重新运行解析和关键词匹配。
+订阅源探测、robots.txt等直接使用requests会话的请求经RecordingSession记录，
+回放时由ReplaySession提供。
+
+说明：传输层返回的正文已按Content-Encoding解压，因此记录中去掉了Content-Encoding和
+Transfer-Encoding，并按实际正文长度重写Content-Length；超过字节上限被截断的正文和
+未下载正文的二进制附件以WARC-Truncated标记。
+"""
+
+import base64
+import glob
+import gzip
+import hashlib
+import logging
+import os
+import threading
+import uuid
+from datetime import datetime, timezone
+from http import HTTPStatus
+from typing import Dict, Iterator, List, Tuple
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers, stream_decode_response_unicode
+
+from fetch_policy import is_binary_content_type
+from transport import FetchResult, Transport
+
+logger = logging.getLogger(__name__)
+
+WARC_VERSION = 'WARC/1.1'
+_DROPPED_HEADERS = ('content-encoding', 'transfer-encoding', 'content-length')
+
+
+def _warc_date() -> str:
+    return datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+def _build_record(headers: List[Tuple[str, str]], block: bytes) -> bytes:
+    """组装一条WARC记录（未压缩）"""
+    lines = [WARC_VERSION]
+    lines.extend(f'{name}: {value}' for name, value in headers)
+    lines.append(f'Content-Length: {len(block)}')
+    return ('\r\n'.join(lines) + '\r\n\r\n').encode('utf-8') + block + b'\r\n\r\n'
+
+
+def _http_block(result: FetchResult) -> bytes:
+    """将FetchResult还原为HTTP响应报文"""
+    try:
+        reason = HTTPStatus(result.status_code).phrase
+    except ValueError:
+        reason = ''
+    body = result.body or b''
+    lines = [f'{result.http_version} {result.status_code} {reason}'.rstrip()]
+    lines.extend(f'{name}: {value}' for name, value in result.headers.items()
+                 if name not in _DROPPED_HEADERS)
+    lines.append(f'content-length: {len(body)}')
+    return ('\r\n'.join(lines) + '\r\n\r\n').encode('utf-8', 'surrogateescape') + body
+
+
+class WarcWriter:
+    """按次运行写入一个WARC文件，首次写入时创建"""
+
+    def __init__(self, directory: str, prefix: str = 'crawl'):
+        """初始化写入器
+
+        Args:
+            directory: WARC文件目录
+            prefix: 文件名前缀
+        """
+        self.directory = directory
+        stamp = datetime.now().strftime('%Y%m%d%H%M%S')
+        self.path = os.path.join(directory, f'{prefix}-{stamp}-{os.getpid()}.warc.gz')
+        self.records = 0
+        self._file = None
+        self._lock = threading.Lock()
+
+    def _open(self):
+        if not os.path.exists(self.directory):
+            os.makedirs(self.directory)
+        self._file = open(self.path, 'ab')
+        info = 'software: sz-crawler\r\nformat: WARC File Format 1.1\r\n'.encode('utf-8')
+        self._write([('WARC-Type', 'warcinfo'),
+                     ('WARC-Date', _warc_date()),
+                     ('WARC-Filename', os.path.basename(self.path)),
+                     ('WARC-Record-ID', f'<urn:uuid:{uuid.uuid4()}>'),
+                     ('Content-Type', 'application/warc-fields')], info)
+
+    def _write(self, headers, block):
+        # 每条记录一个gzip成员，便于其他WARC工具逐条读取
+        self._file.write(gzip.compress(_build_record(headers, block)))
+
+    def write_response(self, result: FetchResult):
+        """写入一条response记录"""
+        block = _http_block(result)
+        payload = result.body or b''
+        digest = base64.b32encode(hashlib.sha1(payload).digest()).decode('ascii')
+        headers = [('WARC-Type', 'response'),
+                   ('WARC-Target-URI', result.url),
+                   ('WARC-Date', _warc_date()),
+                   ('WARC-Record-ID', f'<urn:uuid:{uuid.uuid4()}>'),
+                   ('WARC-Payload-Digest', f'sha1:{digest}'),
+                   ('Content-Type', 'application/http; msgtype=response')]
+        if result.body is None or result.truncated:
+            headers.append(('WARC-Truncated', 'length'))
+        with self._lock:
+            if self._file is None:
+                self._open()
+            self._write(headers, block)
+            self._file.flush()
+            self.records += 1
+
+    def close(self):
+        """关闭文件"""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+def iter_records(path: str) -> Iterator[Tuple[Dict[str, str], bytes]]:
+    """逐条读取WARC文件，返回(记录头, 记录内容)；支持.warc.gz和未压缩的.warc"""
+    opener = gzip.open if path.endswith('.gz') else open
+    with opener(path, 'rb') as f:
+        while True:
+            line = f.readline()
+            if not line:
+                return
+            if not line.strip():
+                continue
+            if not line.startswith(b'WARC/'):
+                raise ValueError(f"无效的WARC记录: {path}")
+            headers = {}
+            for line in iter(f.readline, b'\r\n'):
+                if not line:
+                    raise ValueError(f"WARC记录不完整: {path}")
+                name, _, value = line.decode('utf-8').partition(':')
+                headers[name.strip()] = value.strip()
+            length = int(headers['Content-Length'])
+            block = f.read(length)
+            if len(block) < length:
+                raise ValueError(f"WARC记录不完整: {path}")
+            yield headers, block
+
+
+def _parse_http_block(url: str, block: bytes, truncated: bool) -> FetchResult:
+    head, _, body = block.partition(b'\r\n\r\n')
+    lines = head.decode('utf-8', 'surrogateescape').split('\r\n')
+    version, status = lines[0].split(' ', 2)[:2]
+    headers = {}
+    for line in lines[1:]:
+        name, _, value = line.partition(':')
+        headers[name.strip().lower()] = value.strip()
+    content_type = headers.get('content-type')
+    if truncated and not body and is_binary_content_type(content_type):
+        body = None
+    return FetchResult(url, int(status), headers, get_encoding_from_headers(headers),
+                       body, truncated and body is not None, version)
+
+
+def load_responses(path: str) -> Dict[str, FetchResult]:
+    """读取WARC文件中的全部response记录，同一URL保留最后一次抓取"""
+    responses = {}
+    for headers, block in iter_records(path):
+        if headers.get('WARC-Type') != 'response':
+            continue
+        url = headers['WARC-Target-URI']
+        responses[url] = _parse_http_block(url, block, 'WARC-Truncated' in headers)
+    return responses
+
+
+def find_warc_files(path: str) -> List[str]:
+    """返回路径对应的WARC文件列表：目录下的全部WARC文件按文件名排序，或单个文件"""
+    if os.path.isdir(path):
+        return sorted(glob.glob(os.path.join(path, '*.warc.gz')) +
+                      glob.glob(os.path.join(path, '*.warc')))
+    return [path]
+
+
+class ReplayTransport(Transport):
+    """从WARC记录提供响应的传输层，不访问网络"""
+
+    name = 'replay'
+    retryable = False
+
+    def __init__(self, responses: Dict[str, FetchResult]):
+        self.responses = responses
+
+    @classmethod
+    def from_file(cls, path: str) -> 'ReplayTransport':
+        return cls(load_responses(path))
+
+    def fetch(self, url, headers, timeout, caps=None):
+        result = self.responses.get(url)
+        if result is None:
+            raise requests.exceptions.ConnectionError(f"回放存档中没有该URL: {url}")
+        return result
+
+
+class _RecordingResponse:
+    """代理流式响应，关闭时将已读取的正文写入WARC；未读完的正文以WARC-Truncated标记"""
+
+    def __init__(self, url: str, response, writer: WarcWriter):
+        self._url = url
+        self._response = response
+        self._writer = writer
+        self._chunks = []
+        self._complete = False
+        self._recorded = False
+
+    def __getattr__(self, name):
+        return getattr(self._response, name)
+
+    def _iter_raw(self, chunk_size):
+        for chunk in self._response.iter_content(chunk_size):
+            self._chunks.append(chunk)
+            yield chunk
+        self._complete = True
+
+    def iter_content(self, chunk_size=1, decode_unicode=False):
+        chunks = self._iter_raw(chunk_size)
+        return stream_decode_response_unicode(chunks, self) if decode_unicode else chunks
+
+    def iter_lines(self, chunk_size=512, decode_unicode=False, delimiter=None):
+        # requests的iter_lines只依赖iter_content，经由本对象读取才能记录正文
+        return requests.Response.iter_lines(self, chunk_size, decode_unicode, delimiter)
+
+    def close(self):
+        if not self._recorded:
+            self._recorded = True
+            headers = {name.lower(): value for name, value in self._response.headers.items()}
+            self._writer.write_response(FetchResult(
+                self._url, self._response.status_code, headers,
+                get_encoding_from_headers(headers), b''.join(self._chunks),
+                not self._complete))
+        self._response.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+        return False
+
+
+class RecordingSession:
+    """包装requests会话，get请求的响应在关闭时写入WARC，其余属性直接使用原会话"""
+
+    def __init__(self, session, writer: WarcWriter):
+        self.session = session
+        self.writer = writer
+
+    def __getattr__(self, name):
+        return getattr(self.session, name)
+
+    def get(self, url, **kwargs):
+        return _RecordingResponse(url, self.session.get(url, **kwargs), self.writer)
+
+
+class ReplaySession:
+    """从WARC记录提供get响应的会话替身，存档中没有的URL抛出连接错误"""
+
+    def __init__(self, responses: Dict[str, FetchResult]):
+        self.responses = responses
+
+    def get(self, url, **kwargs):
+        result = self.responses.get(url)
+        if result is None:
+            raise requests.exceptions.ConnectionError(f"回放存档中没有该URL: {url}")
+        response = requests.Response()
+        response.url = url
+        response.status_code = result.status_code
+        response.headers = CaseInsensitiveDict(result.headers)
+        response.encoding = result.encoding
+        # 正文已在内存中，iter_content直接按块切分
+        response._content = result.body or b''
+        response._content_consumed = True
+        return response
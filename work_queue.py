@@ -0,0 +1,487 @@
+"""
+分布式爬取工作队列模块
+提供基于SQLite（文件锁）的队列和兼容Redis命令的队列，多台机器共享同一队列，
+以租约方式领取站点任务，超时未完成的任务会被重新分配
+"""
+
+import json
+import sqlite3
+from abc import ABC, abstractmethod
+import threading
+import time
+from typing import Dict, Iterable, List, NamedTuple, Optional
+from urllib.parse import urlparse
+
+try:
+    import redis
+except ImportError:  # redis为可选依赖
+    redis = None
+
+
+class Task(NamedTuple):
+    """爬取任务
+
+    kind: 任务类型，目前只有'site'（站点首页，包括其订阅源和文章页）
+    """
+    id: str
+    run_id: str
+    kind: str
+    name: str
+    url: str
+    attempts: int = 0
+
+
+LEASE_EXPIRED_ERROR = '租约多次过期未完成'
+
+
+def make_task(run_id: str, kind: str, name: str, url: str) -> Task:
+    """创建任务，任务ID由类型和URL决定，重复添加会被忽略"""
+    return Task(f'{kind}:{url}', run_id, kind, name, url)
+
+
+class WorkQueue(ABC):
+    """工作队列接口"""
+
+    @abstractmethod
+    def add_tasks(self, tasks: Iterable[Task]) -> int:
+        """添加任务，返回新增数量（已存在的任务不重复添加）"""
+
+    @abstractmethod
+    def lease(self, run_id: str, worker_id: str, lease_seconds: float,
+              max_attempts: int = 3) -> Optional[Task]:
+        """领取一个任务并持有租约，无可领取任务时返回None
+
+        租约过期的任务计为一次尝试，已达到max_attempts次的过期任务标记为失败，不再分配
+        """
+
+    @abstractmethod
+    def extend(self, task: Task, worker_id: str, lease_seconds: float) -> bool:
+        """续租：将租约延长到lease_seconds秒之后；租约已被回收或由其他节点接手时返回False"""
+
+    @abstractmethod
+    def complete(self, task: Task, worker_id: str, result: List[dict]) -> bool:
+        """提交任务结果；只有租约持有者可以提交，租约已被其他节点接手或任务已完成时返回False"""
+
+    @abstractmethod
+    def fail(self, task: Task, worker_id: str, error: str, max_attempts: int = 3) -> None:
+        """标记任务失败，未达到最大尝试次数时重新入队；租约已不属于该节点时忽略"""
+
+    @abstractmethod
+    def status(self, run_id: str) -> Dict[str, int]:
+        """返回各状态任务数：pending/leased/done/failed"""
+
+    @abstractmethod
+    def results(self, run_id: str) -> List[dict]:
+        """按任务添加顺序合并所有已完成任务的结果"""
+
+    def is_finished(self, run_id: str) -> bool:
+        """所有任务均已完成或失败"""
+        status = self.status(run_id)
+        return status['pending'] == 0 and status['leased'] == 0
+
+
+class LeaseKeeper:
+    """任务执行期间的续租
+
+    抓取循环在每个请求前调用renew()，距离上次续租超过租约时长的三分之一时续租一次，
+    按请求间隔慢速抓取大量文章的任务因此不会在执行中途被其他节点重新领取
+    """
+
+    def __init__(self, queue: WorkQueue, task: Task, worker_id: str, lease_seconds: float,
+                 clock=time.time):
+        self.queue = queue
+        self.task = task
+        self.worker_id = worker_id
+        self.lease_seconds = lease_seconds
+        self.clock = clock
+        self.renewed_at = clock()
+        self.lost = False
+
+    def renew(self) -> bool:
+        """按需续租，租约已丢失时返回False"""
+        if self.lost:
+            return False
+        now = self.clock()
+        if now - self.renewed_at < self.lease_seconds / 3:
+            return True
+        if not self.queue.extend(self.task, self.worker_id, self.lease_seconds):
+            self.lost = True
+            return False
+        self.renewed_at = now
+        return True
+
+
+class SQLiteWorkQueue(WorkQueue):
+    """基于SQLite的工作队列
+
+    领取任务时使用BEGIN IMMEDIATE获取数据库写锁，保证同一任务只被一个节点领取。
+    多台机器使用时数据库文件需位于共享存储上。
+    """
+
+    def __init__(self, path: str, timeout: float = 30):
+        """初始化SQLite队列
+
+        Args:
+            path: 数据库文件路径
+            timeout: 等待数据库锁的超时时间（秒）
+        """
+        self.path = path
+        self.timeout = timeout
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS tasks (
+                    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                    id TEXT NOT NULL,
+                    run_id TEXT NOT NULL,
+                    kind TEXT NOT NULL,
+                    name TEXT NOT NULL,
+                    url TEXT NOT NULL,
+                    status TEXT NOT NULL DEFAULT 'pending',
+                    worker TEXT,
+                    lease_until REAL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    result TEXT,
+                    error TEXT,
+                    UNIQUE (run_id, id)
+                )
+            """)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return _Closing(conn)
+
+    def add_tasks(self, tasks: Iterable[Task]) -> int:
+        added = 0
+        with self._connect() as conn:
+            conn.execute('BEGIN IMMEDIATE')
+            for task in tasks:
+                cursor = conn.execute(
+                    'INSERT OR IGNORE INTO tasks (id, run_id, kind, name, url) VALUES (?, ?, ?, ?, ?)',
+                    (task.id, task.run_id, task.kind, task.name, task.url))
+                added += cursor.rowcount
+            conn.execute('COMMIT')
+        return added
+
+    def lease(self, run_id, worker_id, lease_seconds, max_attempts=3):
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute('BEGIN IMMEDIATE')
+            while True:
+                row = conn.execute("""
+                    SELECT * FROM tasks
+                    WHERE run_id = ? AND (status = 'pending' OR (status = 'leased' AND lease_until < ?))
+                    ORDER BY seq LIMIT 1
+                """, (run_id, now)).fetchone()
+                if row is None:
+                    conn.execute('COMMIT')
+                    return None
+                if row['status'] == 'pending' or row['attempts'] < max_attempts:
+                    break
+                conn.execute("""
+                    UPDATE tasks SET status = 'failed', error = ?, lease_until = NULL WHERE seq = ?
+                """, (LEASE_EXPIRED_ERROR, row['seq']))
+            conn.execute("""
+                UPDATE tasks SET status = 'leased', worker = ?, lease_until = ?, attempts = attempts + 1
+                WHERE seq = ?
+            """, (worker_id, now + lease_seconds, row['seq']))
+            conn.execute('COMMIT')
+        return Task(row['id'], row['run_id'], row['kind'], row['name'], row['url'],
+                    row['attempts'] + 1)
+
+    def extend(self, task, worker_id, lease_seconds):
+        with self._connect() as conn:
+            cursor = conn.execute("""
+                UPDATE tasks SET lease_until = ?
+                WHERE run_id = ? AND id = ? AND status = 'leased' AND worker = ?
+            """, (time.time() + lease_seconds, task.run_id, task.id, worker_id))
+        return cursor.rowcount == 1
+
+    def complete(self, task, worker_id, result):
+        with self._connect() as conn:
+            cursor = conn.execute("""
+                UPDATE tasks SET status = 'done', result = ?, lease_until = NULL
+                WHERE run_id = ? AND id = ? AND status = 'leased' AND worker = ?
+            """, (json.dumps(result, ensure_ascii=False), task.run_id, task.id, worker_id))
+        return cursor.rowcount == 1
+
+    def fail(self, task, worker_id, error, max_attempts=3):
+        status = 'failed' if task.attempts >= max_attempts else 'pending'
+        with self._connect() as conn:
+            conn.execute("""
+                UPDATE tasks SET status = ?, error = ?, lease_until = NULL
+                WHERE run_id = ? AND id = ? AND worker = ? AND status = 'leased'
+            """, (status, error, task.run_id, task.id, worker_id))
+
+    def status(self, run_id):
+        now = time.time()
+        counts = {'pending': 0, 'leased': 0, 'done': 0, 'failed': 0}
+        with self._connect() as conn:
+            rows = conn.execute("""
+                SELECT CASE WHEN status = 'leased' AND lease_until < ? THEN 'pending' ELSE status END AS state,
+                       COUNT(*) AS total
+                FROM tasks WHERE run_id = ? GROUP BY state
+            """, (now, run_id)).fetchall()
+        for row in rows:
+            counts[row['state']] = row['total']
+        return counts
+
+    def results(self, run_id):
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT result FROM tasks WHERE run_id = ? AND status = 'done' ORDER BY seq",
+                (run_id,)).fetchall()
+        merged = []
+        for row in rows:
+            merged.extend(json.loads(row['result']))
+        return merged
+
+
+class _Closing:
+    """with语句结束时关闭SQLite连接（sqlite3.Connection自身的上下文只管理事务）"""
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        return self.conn
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None and self.conn.in_transaction:
+            self.conn.execute('ROLLBACK')
+        self.conn.close()
+        return False
+
+
+class RedisWorkQueue(WorkQueue):
+    """基于Redis命令的工作队列
+
+    只使用常见的Redis命令（列表、哈希、有序集合），可使用redis-py客户端
+    （需decode_responses=True），也可使用进程内的LocalRedis替身。
+    """
+
+    def __init__(self, client, namespace: str = 'sz-crawler'):
+        """初始化Redis队列
+
+        Args:
+            client: Redis兼容客户端
+            namespace: 键名前缀
+        """
+        self.client = client
+        self.namespace = namespace
+
+    @classmethod
+    def from_url(cls, url: str, namespace: str = 'sz-crawler') -> 'RedisWorkQueue':
+        """通过redis://地址创建队列"""
+        if redis is None:
+            raise ImportError("使用Redis队列需要安装redis: pip install redis")
+        return cls(redis.Redis.from_url(url, decode_responses=True), namespace)
+
+    def _key(self, run_id, name):
+        return f'{self.namespace}:{run_id}:{name}'
+
+    def _requeue_expired(self, run_id, now, max_attempts):
+        """将租约过期的任务放回待领取队列，已达到最大尝试次数的标记为失败；ZREM保证只有一个节点能完成回收"""
+        leases = self._key(run_id, 'leases')
+        for task_id in self.client.zrangebyscore(leases, 0, now):
+            if not self.client.zrem(leases, task_id):
+                continue
+            attempts = int(self.client.hget(self._key(run_id, 'attempts'), task_id) or 0)
+            if attempts >= max_attempts:
+                self.client.hset(self._key(run_id, 'failed'), task_id, LEASE_EXPIRED_ERROR)
+            else:
+                self.client.rpush(self._key(run_id, 'pending'), task_id)
+
+    def _holds_lease(self, task, worker_id):
+        return (self.client.hget(self._key(task.run_id, 'workers'), task.id) == worker_id
+                and self.client.zrem(self._key(task.run_id, 'leases'), task.id))
+
+    def add_tasks(self, tasks):
+        added = 0
+        for task in tasks:
+            seq = self.client.incr(self._key(task.run_id, 'seq'))
+            payload = json.dumps({'seq': seq, 'kind': task.kind, 'name': task.name, 'url': task.url},
+                                 ensure_ascii=False)
+            if self.client.hsetnx(self._key(task.run_id, 'tasks'), task.id, payload):
+                self.client.rpush(self._key(task.run_id, 'pending'), task.id)
+                added += 1
+        return added
+
+    def lease(self, run_id, worker_id, lease_seconds, max_attempts=3):
+        now = time.time()
+        self._requeue_expired(run_id, now, max_attempts)
+        while True:
+            task_id = self.client.lpop(self._key(run_id, 'pending'))
+            if task_id is None:
+                return None
+            if self.client.hexists(self._key(run_id, 'results'), task_id):
+                continue
+            self.client.zadd(self._key(run_id, 'leases'), {task_id: now + lease_seconds})
+            attempts = self.client.hincrby(self._key(run_id, 'attempts'), task_id, 1)
+            self.client.hset(self._key(run_id, 'workers'), task_id, worker_id)
+            info = json.loads(self.client.hget(self._key(run_id, 'tasks'), task_id))
+            return Task(task_id, run_id, info['kind'], info['name'], info['url'], attempts)
+
+    def extend(self, task, worker_id, lease_seconds):
+        if self.client.hget(self._key(task.run_id, 'workers'), task.id) != worker_id:
+            return False
+        # XX只更新仍在租约集合中的任务，已被回收的任务不会重新加入
+        return bool(self.client.zadd(self._key(task.run_id, 'leases'),
+                                     {task.id: time.time() + lease_seconds}, xx=True, ch=True))
+
+    def complete(self, task, worker_id, result):
+        if not self._holds_lease(task, worker_id):
+            return False
+        return bool(self.client.hsetnx(self._key(task.run_id, 'results'), task.id,
+                                       json.dumps(result, ensure_ascii=False)))
+
+    def fail(self, task, worker_id, error, max_attempts=3):
+        if not self._holds_lease(task, worker_id):
+            return  # 租约已过期并被回收，或已由其他节点接手
+        if task.attempts >= max_attempts:
+            self.client.hset(self._key(task.run_id, 'failed'), task.id, error)
+        else:
+            self.client.rpush(self._key(task.run_id, 'pending'), task.id)
+
+    def status(self, run_id):
+        now = time.time()
+        leases = self._key(run_id, 'leases')
+        expired = len(self.client.zrangebyscore(leases, 0, now))
+        return {
+            'pending': self.client.llen(self._key(run_id, 'pending')) + expired,
+            'leased': self.client.zcard(leases) - expired,
+            'done': self.client.hlen(self._key(run_id, 'results')),
+            'failed': self.client.hlen(self._key(run_id, 'failed')),
+        }
+
+    def results(self, run_id):
+        tasks = self.client.hgetall(self._key(run_id, 'tasks'))
+        done = self.client.hgetall(self._key(run_id, 'results'))
+        order = sorted(done, key=lambda task_id: json.loads(tasks[task_id])['seq'])
+        merged = []
+        for task_id in order:
+            merged.extend(json.loads(done[task_id]))
+        return merged
+
+
+class LocalRedis:
+    """进程内的Redis替身，实现RedisWorkQueue用到的命令子集（线程安全）"""
+
+    def __init__(self):
+        self._data = {}
+        self._lock = threading.Lock()
+
+    def _get(self, key, factory):
+        value = self._data.get(key)
+        if value is None:
+            value = self._data[key] = factory()
+        return value
+
+    def incr(self, key):
+        with self._lock:
+            self._data[key] = self._data.get(key, 0) + 1
+            return self._data[key]
+
+    def rpush(self, key, *values):
+        with self._lock:
+            items = self._get(key, list)
+            items.extend(values)
+            return len(items)
+
+    def lpop(self, key):
+        with self._lock:
+            items = self._data.get(key)
+            return items.pop(0) if items else None
+
+    def llen(self, key):
+        with self._lock:
+            return len(self._data.get(key) or [])
+
+    def hset(self, key, field, value):
+        with self._lock:
+            table = self._get(key, dict)
+            is_new = field not in table
+            table[field] = value
+            return int(is_new)
+
+    def hsetnx(self, key, field, value):
+        with self._lock:
+            table = self._get(key, dict)
+            if field in table:
+                return 0
+            table[field] = value
+            return 1
+
+    def hget(self, key, field):
+        with self._lock:
+            return (self._data.get(key) or {}).get(field)
+
+    def hexists(self, key, field):
+        with self._lock:
+            return field in (self._data.get(key) or {})
+
+    def hgetall(self, key):
+        with self._lock:
+            return dict(self._data.get(key) or {})
+
+    def hlen(self, key):
+        with self._lock:
+            return len(self._data.get(key) or {})
+
+    def hincrby(self, key, field, amount=1):
+        with self._lock:
+            table = self._get(key, dict)
+            table[field] = int(table.get(field, 0)) + amount
+            return table[field]
+
+    def zadd(self, key, mapping, xx=False, ch=False):
+        with self._lock:
+            zset = self._get(key, dict)
+            if xx:
+                mapping = {member: score for member, score in mapping.items() if member in zset}
+            added = sum(1 for member in mapping if member not in zset)
+            changed = sum(1 for member, score in mapping.items() if zset.get(member) != score)
+            zset.update(mapping)
+            return changed if ch else added
+
+    def zrem(self, key, *members):
+        with self._lock:
+            zset = self._data.get(key) or {}
+            return sum(1 for member in members if zset.pop(member, None) is not None)
+
+    def zrangebyscore(self, key, min_score, max_score):
+        with self._lock:
+            zset = self._data.get(key) or {}
+            return [member for member, score in sorted(zset.items(), key=lambda item: item[1])
+                    if min_score <= score <= max_score]
+
+    def zcard(self, key):
+        with self._lock:
+            return len(self._data.get(key) or {})
+
+
+def open_queue(spec: str) -> WorkQueue:
+    """根据地址创建工作队列
+
+    支持：
+        sqlite:///path/to/queue.db 或 *.db 文件路径 -> SQLiteWorkQueue
+        redis://host:port/db                       -> RedisWorkQueue（需安装redis）
+        local                                      -> 使用LocalRedis的进程内队列
+
+    Args:
+        spec: 队列地址
+
+    Returns:
+        WorkQueue: 工作队列
+    """
+    if spec == 'local':
+        return RedisWorkQueue(LocalRedis())
+    scheme = urlparse(spec).scheme
+    if scheme in ('redis', 'rediss', 'unix'):
+        return RedisWorkQueue.from_url(spec)
+    if scheme == 'sqlite':
+        return SQLiteWorkQueue(spec[len('sqlite:///'):] if spec.startswith('sqlite:///')
+                               else spec[len('sqlite://'):])
+    if spec.endswith(('.db', '.sqlite', '.sqlite3')):
+        return SQLiteWorkQueue(spec)
+    raise ValueError(f"不支持的队列地址: {spec}")